@@ -0,0 +1,222 @@
+﻿#!/usr/bin/env python3
+"""SQLite-backed artifact store for per-paper extraction outputs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from research_common import ensure_dir, json_dump, repo_root_from_file, utc_now_iso
+from summary_source import JSONL_SUFFIX, is_jsonl_text
+
+# Artifact type -> file name used by the on-disk JSON layout (papers/<paper_id>/<file>).
+ARTIFACT_FILES: Dict[str, str] = {
+    "metadata": "metadata.json",
+    "equation_candidates": "equation_candidates.json",
+    "figures_index": "figures_index.json",
+    "pages_meta": "pages_meta.json",
+    "keyword_signals": "keyword_signals.json",
+    "summary_record": "summary_record.json",
+}
+
+# Corpus-level documents (e.g. paper_summaries) -> file name in the artifacts root.
+DOCUMENT_FILES: Dict[str, str] = {
+    "paper_summaries": "paper_summaries.json",
+}
+
+
+class ArtifactStore:
+    """One SQLite database holding every paper's JSON artifacts, one table per artifact type."""
+
+    def __init__(self, path: Path) -> None:
+        ensure_dir(path.parent)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for kind in ARTIFACT_FILES:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {kind} ("
+                "paper_id TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at_utc TEXT NOT NULL)"
+            )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "name TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at_utc TEXT NOT NULL)"
+        )
+        # Large line-oriented documents (JSON Lines) are stored one row per line so they can be
+        # written from and read back to a stream without holding the whole text.
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS document_lines ("
+            "name TEXT NOT NULL, line_no INTEGER NOT NULL, line TEXT NOT NULL, PRIMARY KEY (name, line_no))"
+        )
+        self.conn.commit()
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @staticmethod
+    def _check_kind(kind: str) -> None:
+        if kind not in ARTIFACT_FILES:
+            raise ValueError(f"unknown artifact type: {kind}")
+
+    def put_paper(self, paper_id: str, artifacts: Dict[str, object]) -> None:
+        """Write several artifacts for one paper in a single transaction."""
+        stamp = utc_now_iso()
+        with self.conn:
+            for kind, payload in artifacts.items():
+                self._check_kind(kind)
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO {kind} (paper_id, payload, updated_at_utc) VALUES (?, ?, ?)",
+                    (paper_id, json.dumps(payload, ensure_ascii=False), stamp),
+                )
+
+    def put(self, kind: str, paper_id: str, payload: object) -> None:
+        self.put_paper(paper_id, {kind: payload})
+
+    def get(self, kind: str, paper_id: str) -> Optional[object]:
+        self._check_kind(kind)
+        row = self.conn.execute(f"SELECT payload FROM {kind} WHERE paper_id = ?", (paper_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has(self, kind: str, paper_id: str) -> bool:
+        self._check_kind(kind)
+        row = self.conn.execute(f"SELECT 1 FROM {kind} WHERE paper_id = ?", (paper_id,)).fetchone()
+        return row is not None
+
+    def load_all(self, kind: str, paper_ids: Optional[Iterable[str]] = None) -> Dict[str, object]:
+        """Load one artifact type for many papers with a single query."""
+        self._check_kind(kind)
+        wanted = set(paper_ids) if paper_ids is not None else None
+        out: Dict[str, object] = {}
+        for paper_id, payload in self.conn.execute(f"SELECT paper_id, payload FROM {kind}"):
+            if wanted is not None and paper_id not in wanted:
+                continue
+            out[paper_id] = json.loads(payload)
+        return out
+
+    def paper_ids(self, kind: str = "metadata") -> List[str]:
+        self._check_kind(kind)
+        return [row[0] for row in self.conn.execute(f"SELECT paper_id FROM {kind} ORDER BY paper_id")]
+
+    def put_document(self, name: str, payload: object) -> None:
+        self.put_document_text(name, json.dumps(payload, ensure_ascii=False))
+
+    def put_document_text(self, name: str, payload_text: str) -> None:
+        """Store an already-serialized JSON document without re-parsing it."""
+        with self.conn:
+            self.conn.execute("DELETE FROM document_lines WHERE name = ?", (name,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents (name, payload, updated_at_utc) VALUES (?, ?, ?)",
+                (name, payload_text, utc_now_iso()),
+            )
+
+    def put_document_lines(self, name: str, lines: Iterable[str]) -> int:
+        """Store a document line by line (e.g. straight from an open file); returns the line count."""
+        with self.conn:
+            self.conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+            self.conn.execute("DELETE FROM document_lines WHERE name = ?", (name,))
+            cursor = self.conn.executemany(
+                "INSERT INTO document_lines (name, line_no, line) VALUES (?, ?, ?)",
+                ((name, line_no, line) for line_no, line in enumerate(lines)),
+            )
+        return cursor.rowcount
+
+    def iter_document_lines(self, name: str) -> Iterator[str]:
+        """Lines of a stored document, fetched from a cursor as they are consumed.
+
+        Documents stored whole with put_document_text are split into lines instead.
+        """
+        if not self.has_document_lines(name):
+            row = self.conn.execute("SELECT payload FROM documents WHERE name = ?", (name,)).fetchone()
+            if row:
+                yield from row[0].splitlines(keepends=True)
+            return
+        cursor = self.conn.execute("SELECT line FROM document_lines WHERE name = ? ORDER BY line_no", (name,))
+        try:
+            for (line,) in cursor:
+                yield line
+        finally:
+            cursor.close()
+
+    def last_document_line(self, name: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT line FROM document_lines WHERE name = ? AND TRIM(line, char(32, 9, 10, 13)) != '' ORDER BY line_no DESC LIMIT 1",
+            (name,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def has_document_lines(self, name: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM document_lines WHERE name = ? LIMIT 1", (name,)).fetchone()
+        return row is not None
+
+    def get_document_text(self, name: str) -> Optional[str]:
+        row = self.conn.execute("SELECT payload FROM documents WHERE name = ?", (name,)).fetchone()
+        if row:
+            return row[0]
+        if self.has_document_lines(name):
+            return "".join(self.iter_document_lines(name))
+        return None
+
+    def get_document(self, name: str) -> Optional[object]:
+        text = self.get_document_text(name)
+        return json.loads(text) if text is not None else None
+
+
+def export_json_layout(store: ArtifactStore, out_dir: Path) -> Dict[str, int]:
+    """Write the store back out as the classic papers/<paper_id>/*.json layout."""
+    counts: Dict[str, int] = {}
+    papers_root = ensure_dir(out_dir / "papers")
+    for kind, file_name in ARTIFACT_FILES.items():
+        rows = store.load_all(kind)
+        for paper_id, payload in rows.items():
+            json_dump(papers_root / paper_id / file_name, payload)
+        counts[kind] = len(rows)
+    for name, file_name in DOCUMENT_FILES.items():
+        lines = store.iter_document_lines(name)
+        first_line = next(lines, None)
+        if first_line is None:
+            continue
+        if is_jsonl_text(first_line):
+            with (out_dir / file_name).with_suffix(JSONL_SUFFIX).open("w", encoding="utf-8") as handle:
+                handle.write(first_line)
+                handle.writelines(lines)
+        else:
+            json_dump(out_dir / file_name, json.loads(first_line + "".join(lines)))
+        counts[name] = 1
+    return counts
+
+
+def parse_args() -> argparse.Namespace:
+    repo_root = repo_root_from_file(Path(__file__))
+    default_out = repo_root / "Artifacts" / "research_report_2026-02-11"
+
+    parser = argparse.ArgumentParser(description="Export the SQLite artifact store to the on-disk JSON layout.")
+    parser.add_argument("--store", type=Path, default=default_out / "artifacts.sqlite")
+    parser.add_argument("--out-dir", type=Path, default=default_out)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    store_path = args.store.resolve()
+    if not store_path.exists():
+        raise SystemExit(f"artifact store not found: {store_path}")
+
+    out_dir = ensure_dir(args.out_dir.resolve())
+    with ArtifactStore(store_path) as store:
+        counts = export_json_layout(store, out_dir)
+
+    print(json.dumps({"store": str(store_path), "out_dir": str(out_dir), "exported": counts}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
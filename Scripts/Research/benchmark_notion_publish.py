@@ -0,0 +1,135 @@
+﻿#!/usr/bin/env python3
+"""Benchmark publish_notion.py against the local notion_mock stand-in."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import publish_notion
+from notion_mock import NotionMockServer, add_config_args, config_from_args
+from research_common import repo_root_from_file
+
+BENCH_TOKEN_ENV = "NOTION_BENCHMARK_TOKEN"
+
+
+def parse_int_list(text: str) -> List[int]:
+    return [int(item) for item in text.split(",") if item.strip()]
+
+
+def run_once(
+    server: NotionMockServer,
+    markdown_path: Path,
+    toggle_level: int,
+    upload_concurrency: int,
+    client_rate_limit: float,
+) -> Dict[str, object]:
+    server.reset_stats()
+    with tempfile.TemporaryDirectory(prefix="notion_bench_") as tmp:
+        artifacts_dir = Path(tmp)
+        started = time.perf_counter()
+        # publish_markdown reports progress on stdout; keep the benchmark output clean.
+        with contextlib.redirect_stdout(io.StringIO()):
+            publish_notion.publish_markdown(
+                markdown_path=markdown_path,
+                parent_page_id="benchmark-parent",
+                token_env=BENCH_TOKEN_ENV,
+                notion_version=publish_notion.DEFAULT_NOTION_VERSION,
+                title="Publish benchmark",
+                artifacts_dir=artifacts_dir,
+                upload_concurrency=upload_concurrency,
+                upload_cache_ttl_hours=None,
+                rate_limit=client_rate_limit,
+                toggle_level=toggle_level,
+                api_base=server.api_base,
+            )
+        wall_s = time.perf_counter() - started
+        meta = json.loads((artifacts_dir / "notion_page_meta.json").read_text(encoding="utf-8"))
+    stats = server.stats()
+    blocks = int(meta.get("block_count", 0))
+    return {
+        "wall_s": round(wall_s, 3),
+        "blocks": blocks,
+        "api_requests": int(stats.get("requests", 0)),
+        "append_requests": int(stats.get("append_children", 0)),
+        "upload_requests": int(stats.get("create_upload", 0)) + int(stats.get("send_upload", 0)),
+        "upload_bytes": int(stats.get("upload_bytes", 0)),
+        "request_bytes": int(stats.get("request_bytes", 0)),
+        "rate_limited": int(stats.get("rate_limited", 0)),
+        "injected_errors": int(stats.get("injected_errors", 0)),
+        "rejected": int(stats.get("rejected", 0)),
+        "blocks_per_s": round(blocks / wall_s, 1) if wall_s else 0.0,
+        "requests_per_s": round(int(stats.get("requests", 0)) / wall_s, 2) if wall_s else 0.0,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    repo_root = repo_root_from_file(Path(__file__))
+    parser = argparse.ArgumentParser(description="Measure Notion publish throughput against a local mock API.")
+    parser.add_argument(
+        "--markdown-path",
+        type=Path,
+        default=repo_root / "Markdowns" / "deep-research-report-2026-02-11.md",
+    )
+    parser.add_argument("--toggle-levels", type=parse_int_list, default=[0, 3], help="Comma-separated, e.g. 0,3.")
+    parser.add_argument("--upload-concurrency", type=parse_int_list, default=[1, 4], help="Comma-separated, e.g. 1,4.")
+    parser.add_argument(
+        "--client-rate-limit",
+        type=float,
+        default=0.0,
+        help="publish_notion --rate-limit for the runs (0 = unthrottled, to measure raw throughput).",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the median wall time is reported.")
+    parser.add_argument("--out-json", type=Path, default=None)
+    add_config_args(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    markdown_path = args.markdown_path.resolve()
+    if not markdown_path.exists():
+        raise SystemExit(f"markdown not found: {markdown_path}")
+    os.environ[BENCH_TOKEN_ENV] = "benchmark"
+
+    config = config_from_args(args)
+    results: List[Dict[str, object]] = []
+    with NotionMockServer(config) as server:
+        for toggle_level in args.toggle_levels:
+            for concurrency in args.upload_concurrency:
+                runs = [
+                    run_once(server, markdown_path, toggle_level, concurrency, args.client_rate_limit)
+                    for _ in range(max(1, args.repeat))
+                ]
+                median = sorted(runs, key=lambda run: float(run["wall_s"]))[len(runs) // 2]
+                results.append(
+                    {
+                        "toggle_level": toggle_level,
+                        "upload_concurrency": concurrency,
+                        **median,
+                        "wall_s_runs": [run["wall_s"] for run in runs],
+                        "wall_s_stdev": round(statistics.pstdev(float(run["wall_s"]) for run in runs), 3),
+                    }
+                )
+
+    payload = {
+        "markdown_path": str(markdown_path),
+        "mock": {key: getattr(config, key) for key in config.__dataclass_fields__},
+        "client_rate_limit": args.client_rate_limit,
+        "results": results,
+    }
+    if args.out_json:
+        args.out_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(json.dumps(payload, indent=2))
+
+
+if __name__ == "__main__":
+    main()
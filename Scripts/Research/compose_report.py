@@ -4,16 +4,30 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import io
 import json
+import os
 import re
 from pathlib import Path
-from typing import Dict, List
-
-from research_common import ensure_dir, repo_root_from_file, utc_now_iso
-
-
-def load_json(path: Path) -> Dict[str, object]:
-    return json.loads(path.read_text(encoding="utf-8", errors="ignore"))
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+from artifact_store import ArtifactStore
+from image_derivatives import DERIVATIVE_VARIANTS, DERIVATIVES_INDEX, load_derivative_map
+from research_common import ensure_dir, json_dump, repo_root_from_file, summary_method_tags, utc_now_iso
+from summary_source import SummarySource
+
+REPORT_WRITE_BUFFER = 1024 * 1024
+SHARD_INDEX = "index.md"
+SHARD_PAPERS_DIR = "papers"
+SHARD_MANIFEST = "shard_manifest.json"
+METHOD_TAG_LABELS = {
+    "fd": "Finite difference / Arakawa / RK4",
+    "spectral": "Spectral / FFT",
+    "fv": "Finite volume / flux form",
+    "lbm": "LBM / MRT",
+    "shallow_water": "Shallow-water / tsunami propagation",
+}
 
 
 def anchor_slug(text: str) -> str:
@@ -31,34 +45,298 @@ def repo_relative(path_str: str, repo_root: Path) -> str:
     return path.as_posix()
 
 
-def method_tags(text: str) -> List[str]:
-    lower = text.lower()
-    tags: List[str] = []
-    if "finite difference" in lower or "arakawa" in lower or "rk4" in lower:
-        tags.append("fd")
-    if "spectral" in lower or "fft" in lower:
-        tags.append("spectral")
-    if "finite volume" in lower or "fvm" in lower or "flux" in lower:
-        tags.append("fv")
-    if "lattice boltzmann" in lower or "lbm" in lower or "mrt" in lower:
-        tags.append("lbm")
-    if "shallow water" in lower or "tsunami" in lower:
-        tags.append("shallow_water")
-    return tags
+def method_tag_counts(papers: Iterable[Dict[str, object]]) -> Dict[str, int]:
+    """Method signal aggregation: number of papers carrying each method tag."""
+    tag_counts = {tag: 0 for tag in METHOD_TAG_LABELS}
+    for paper in papers:
+        tags = paper.get("method_tags")
+        if not isinstance(tags, list):
+            tags = summary_method_tags(paper)
+        for tag in set(tags):
+            if tag in tag_counts:
+                tag_counts[tag] += 1
+    return tag_counts
+
+
+def paper_heading(paper: Dict[str, object]) -> str:
+    return f"Paper {int(paper.get('citation_number', 0)):02d}: {paper.get('title', 'Untitled')}"
+
+
+def shard_path(paper: Dict[str, object]) -> str:
+    """Shard file of one paper, relative to the shard directory."""
+    return f"{SHARD_PAPERS_DIR}/{paper.get('paper_id', '')}.md"
 
 
-def compose_markdown(summary_json: Path, output_md: Path, images_root: str) -> None:
+class MarkdownLineWriter:
+    """List-like line sink that streams report lines to a buffered file.
+
+    Output equals "\n".join(lines) of the same appends, without keeping the lines in memory.
+    """
+
+    def __init__(self, handle: TextIO) -> None:
+        self.handle = handle
+        self.count = 0
+
+    def append(self, line: str) -> None:
+        if self.count:
+            self.handle.write("\n")
+        self.handle.write(line)
+        self.count += 1
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+
+def compose_markdown(
+    summary_json: Path,
+    output_md: Path,
+    images_root: str,
+    store: Optional[ArtifactStore] = None,
+    derivatives: Optional[Dict[str, str]] = None,
+) -> None:
     repo_root = repo_root_from_file(Path(__file__))
-    data = load_json(summary_json)
-    papers = data.get("papers", [])
-    bibliography = data.get("bibliography", [])
-    corpus = data.get("corpus_summary", {})
-    validation = data.get("validation", {})
+    # Papers are re-read from the source on each pass instead of being held in memory.
+    source = (
+        SummarySource.from_line_reader(
+            lambda: store.iter_document_lines("paper_summaries"),
+            last_line=store.last_document_line("paper_summaries"),
+        )
+        if store
+        else SummarySource.from_path(summary_json)
+    )
+
+    # Sections are streamed to a temporary file that replaces the report only once complete.
+    ensure_dir(output_md.parent)
+    tmp_md = output_md.with_name(output_md.name + ".tmp")
+    with tmp_md.open("w", encoding="utf-8", buffering=REPORT_WRITE_BUFFER) as handle:
+        paper_sections = write_report(
+            MarkdownLineWriter(handle), source, repo_root, images_root, derivatives=derivatives
+        )
+    os.replace(tmp_md, output_md)
+    print(json.dumps({"output_markdown": str(output_md.resolve()), "paper_sections": paper_sections}, indent=2))
+
+
+def render_markdown(write: Callable[[MarkdownLineWriter], object]) -> str:
+    buffer = io.StringIO()
+    write(MarkdownLineWriter(buffer))
+    return buffer.getvalue()
+
+
+def compose_shards(
+    summary_json: Path,
+    shard_dir: Path,
+    images_root: str,
+    store: Optional[ArtifactStore] = None,
+    derivatives: Optional[Dict[str, str]] = None,
+) -> None:
+    """Write index.md plus one markdown file per paper, rewriting only shards whose content changed.
+
+    shard_manifest.json records each shard's content hash and lists the shards changed by this run,
+    so downstream publishing can skip everything else.
+    """
+    repo_root = repo_root_from_file(Path(__file__))
+    source = (
+        SummarySource.from_line_reader(
+            lambda: store.iter_document_lines("paper_summaries"),
+            last_line=store.last_document_line("paper_summaries"),
+        )
+        if store
+        else SummarySource.from_path(summary_json)
+    )
+    ensure_dir(shard_dir / SHARD_PAPERS_DIR)
+    manifest_path = shard_dir / SHARD_MANIFEST
+    previous = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    previous_shards = previous.get("shards", {}) if isinstance(previous, dict) else {}
+
+    shards: Dict[str, Dict[str, object]] = {}
+    changed: List[str] = []
+
+    def put_shard(name: str, text: str, hash_text: str, paper_id: str = "") -> None:
+        digest = hashlib.sha256(hash_text.encode("utf-8")).hexdigest()
+        shards[name] = {"sha256": digest, "paper_id": paper_id} if paper_id else {"sha256": digest}
+        known = previous_shards.get(name)
+        path = shard_dir / name
+        if isinstance(known, dict) and known.get("sha256") == digest and path.exists():
+            return
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+        changed.append(name)
+
+    paper_sections = 0
+    for paper in source.papers():
+        paper_sections += 1
+        text = render_markdown(
+            lambda lines: write_paper_section(
+                lines, paper, repo_root, images_root, heading_prefix="#", derivatives=derivatives
+            )
+        )
+        put_shard(shard_path(paper), text, text, str(paper.get("paper_id", "")))
+
+    # The index embeds a generation timestamp; it is left out of the hash so an otherwise
+    # unchanged index is not rewritten.
+    index_text = render_markdown(
+        lambda lines: write_report(
+            lines, source, repo_root, images_root, shard_links=True, derivatives=derivatives
+        )
+    )
+    index_lines = index_text.split("\n")
+    put_shard(SHARD_INDEX, index_text, "\n".join(line for line in index_lines if not line.startswith("Generated: ")))
+
+    removed = sorted(name for name in previous_shards if name not in shards)
+    for name in removed:
+        (shard_dir / name).unlink(missing_ok=True)
+
+    json_dump(
+        manifest_path,
+        {"generated_at_utc": utc_now_iso(), "shards": shards, "changed": changed, "removed": removed},
+    )
+    print(
+        json.dumps(
+            {
+                "shard_dir": str(shard_dir.resolve()),
+                "paper_sections": paper_sections,
+                "changed": len(changed),
+                "unchanged": len(shards) - len(changed),
+                "removed": len(removed),
+            },
+            indent=2,
+        )
+    )
+
+
+def write_paper_section(
+    lines: MarkdownLineWriter,
+    paper: Dict[str, object],
+    repo_root: Path,
+    images_root: str,
+    heading_prefix: str = "###",
+    derivatives: Optional[Dict[str, str]] = None,
+) -> None:
+    citation_no = int(paper.get("citation_number", 0))
+    lines.append(f"{heading_prefix} {paper_heading(paper)}")
+    lines.append("")
+    lines.append(f"**Citation [{citation_no}]:** {paper.get('citation', '')}")
+    lines.append("")
+
+    doi = str(paper.get("doi", "")).strip()
+    url = str(paper.get("url", "")).strip()
+    canonical_name = str(paper.get("canonical_file_name", ""))
+    aliases = paper.get("alias_file_names", [])
+    if canonical_name:
+        lines.append(f"**Canonical PDF:** `{canonical_name}`")
+    if aliases:
+        alias_text = ", ".join(f"`{alias}`" for alias in aliases)
+        lines.append(f"**File aliases:** {alias_text}")
+    if doi:
+        lines.append(f"**DOI:** `{doi}`")
+    if url:
+        lines.append(f"**URL:** {url}")
+    lines.append("")
+
+    lines.append("**Research objective and scope**")
+    lines.append("")
+    lines.append(str(paper.get("objective", "")))
+    lines.append("")
+
+    lines.append("**Methods and numerical approach**")
+    lines.append("")
+    lines.append(str(paper.get("methods", "")))
+    lines.append("")
+
+    lines.append("**Key findings**")
+    lines.append("")
+    lines.append(str(paper.get("findings", "")))
+    lines.append("")
+
+    lines.append("**Limitations**")
+    lines.append("")
+    lines.append(str(paper.get("limitations", "")))
+    lines.append("")
+
+    lines.append("**Key governing equations**")
+    lines.append("")
+    equations = paper.get("key_equations", [])
+    if isinstance(equations, list) and equations:
+        for eq in equations:
+            if not isinstance(eq, dict):
+                continue
+            eq_text = str(eq.get("equation", "")).strip()
+            page = eq.get("page", "?")
+            if eq_text:
+                lines.append(f"- `{eq_text}` (p.{page})")
+    else:
+        lines.append("- No extractable governing equation found in machine-readable text.")
+    lines.append("")
+
+    lines.append("**Detailed observations linked to repository modules**")
+    lines.append("")
+    observations = paper.get("repo_observations", [])
+    if isinstance(observations, list) and observations:
+        for obs in observations:
+            lines.append(f"- {obs}")
+    else:
+        lines.append("- No additional module-specific observations were generated.")
+    lines.append("")
+
+    lines.append("**Evidence anchors**")
+    lines.append("")
+    evidence = paper.get("evidence_anchors", [])
+    if isinstance(evidence, list) and evidence:
+        for anchor in evidence:
+            if not isinstance(anchor, dict):
+                continue
+            tag = anchor.get("tag", "evidence")
+            page = anchor.get("page", "?")
+            quote = str(anchor.get("quote", "")).strip()
+            lines.append(f"- [{tag}, p.{page}] {quote}")
+    else:
+        lines.append("- [fallback, p.1] No machine-readable evidence anchor extracted.")
+    lines.append("")
+
+    lines.append("**Figure gallery (scientific images)**")
+    lines.append("")
+    figures = paper.get("figures", [])
+    if isinstance(figures, list) and figures:
+        for fig in figures:
+            if not isinstance(fig, dict):
+                continue
+            figure_id = str(fig.get("figure_id", "figure"))
+            raw_path = str(fig.get("relative_path", ""))
+            if raw_path:
+                relative_path = repo_relative(raw_path, repo_root)
+            else:
+                relative_path = f"{images_root}/{paper.get('paper_id', '')}/figures/{figure_id}"
+            caption_hint = str(fig.get("caption_hint", "Scientific figure"))
+            derived_path = derivatives.get(relative_path) if derivatives else None
+            if derived_path:
+                # Embed the downscaled derivative and link it to the full-resolution original.
+                lines.append(f"[![{figure_id}]({derived_path})]({relative_path})")
+            else:
+                lines.append(f"![{figure_id}]({relative_path})")
+            lines.append(f"*{caption_hint}*")
+            lines.append("")
+    else:
+        lines.append("No scientific images were retained after filtering.")
+        lines.append("")
+
+
+def write_report(
+    lines: MarkdownLineWriter,
+    source: SummarySource,
+    repo_root: Path,
+    images_root: str,
+    shard_links: bool = False,
+    derivatives: Optional[Dict[str, str]] = None,
+) -> int:
+    """Write the report section by section; returns the number of per-paper sections.
 
-    if not isinstance(papers, list):
-        raise SystemExit("invalid summary: papers is not a list")
+    With shard_links, per-paper sections are replaced by links to the per-paper shard files.
+    """
+    corpus = source.corpus_summary
+    validation = source.validation
 
-    lines: List[str] = []
     lines.append("# Deep Research Report - Tsunami Vorticity Corpus (2026-02-11)")
     lines.append("")
     lines.append(f"Generated: {utc_now_iso()}")
@@ -89,11 +367,10 @@ def compose_markdown(summary_json: Path, output_md: Path, images_root: str) -> N
     ]
     lines.extend(toc_entries)
     lines.append("")
-    for paper in papers:
-        if not isinstance(paper, dict):
-            continue
-        heading = f"Paper {int(paper.get('citation_number', 0)):02d}: {paper.get('title', 'Untitled')}"
-        lines.append(f"- [{heading}](#{anchor_slug(heading)})")
+    for paper in source.papers():
+        heading = paper_heading(paper)
+        target = shard_path(paper) if shard_links else f"#{anchor_slug(heading)}"
+        lines.append(f"- [{heading}]({target})")
     lines.append("")
 
     lines.append("## Corpus Manifest Summary")
@@ -106,21 +383,7 @@ def compose_markdown(summary_json: Path, output_md: Path, images_root: str) -> N
     lines.append(f"| Duplicate groups | {corpus.get('duplicate_groups', 'n/a')} |")
     lines.append("")
 
-    # Method signal aggregation.
-    tag_counts = {"fd": 0, "spectral": 0, "fv": 0, "lbm": 0, "shallow_water": 0}
-    for paper in papers:
-        if not isinstance(paper, dict):
-            continue
-        blob = " ".join(
-            [
-                str(paper.get("methods", "")),
-                str(paper.get("objective", "")),
-                str(paper.get("findings", "")),
-                str(paper.get("title", "")),
-            ]
-        )
-        for tag in set(method_tags(blob)):
-            tag_counts[tag] += 1
+    tag_counts = method_tag_counts(source.papers())
 
     lines.append("## Cross-Paper Tsunami-Vorticity Synthesis")
     lines.append("")
@@ -128,11 +391,8 @@ def compose_markdown(summary_json: Path, output_md: Path, images_root: str) -> N
     lines.append("")
     lines.append("| Method signal | Papers |")
     lines.append("|---|---|")
-    lines.append(f"| Finite difference / Arakawa / RK4 | {tag_counts['fd']} |")
-    lines.append(f"| Spectral / FFT | {tag_counts['spectral']} |")
-    lines.append(f"| Finite volume / flux form | {tag_counts['fv']} |")
-    lines.append(f"| LBM / MRT | {tag_counts['lbm']} |")
-    lines.append(f"| Shallow-water / tsunami propagation | {tag_counts['shallow_water']} |")
+    for tag, label in METHOD_TAG_LABELS.items():
+        lines.append(f"| {label} | {tag_counts[tag]} |")
     lines.append("")
 
     lines.append("### Literature-to-Solver Component Map")
@@ -189,119 +449,19 @@ def compose_markdown(summary_json: Path, output_md: Path, images_root: str) -> N
     lines.append("## Per-Paper Summaries")
     lines.append("")
 
-    for paper in papers:
-        if not isinstance(paper, dict):
-            continue
-
-        citation_no = int(paper.get("citation_number", 0))
-        title = str(paper.get("title", "Untitled"))
-        heading = f"Paper {citation_no:02d}: {title}"
-        lines.append(f"### {heading}")
-        lines.append("")
-        lines.append(f"**Citation [{citation_no}]:** {paper.get('citation', '')}")
-        lines.append("")
-
-        doi = str(paper.get("doi", "")).strip()
-        url = str(paper.get("url", "")).strip()
-        canonical_name = str(paper.get("canonical_file_name", ""))
-        aliases = paper.get("alias_file_names", [])
-        if canonical_name:
-            lines.append(f"**Canonical PDF:** `{canonical_name}`")
-        if aliases:
-            alias_text = ", ".join(f"`{alias}`" for alias in aliases)
-            lines.append(f"**File aliases:** {alias_text}")
-        if doi:
-            lines.append(f"**DOI:** `{doi}`")
-        if url:
-            lines.append(f"**URL:** {url}")
-        lines.append("")
-
-        lines.append("**Research objective and scope**")
-        lines.append("")
-        lines.append(str(paper.get("objective", "")))
-        lines.append("")
-
-        lines.append("**Methods and numerical approach**")
-        lines.append("")
-        lines.append(str(paper.get("methods", "")))
-        lines.append("")
-
-        lines.append("**Key findings**")
-        lines.append("")
-        lines.append(str(paper.get("findings", "")))
-        lines.append("")
-
-        lines.append("**Limitations**")
-        lines.append("")
-        lines.append(str(paper.get("limitations", "")))
-        lines.append("")
-
-        lines.append("**Key governing equations**")
-        lines.append("")
-        equations = paper.get("key_equations", [])
-        if isinstance(equations, list) and equations:
-            for eq in equations:
-                if not isinstance(eq, dict):
-                    continue
-                eq_text = str(eq.get("equation", "")).strip()
-                page = eq.get("page", "?")
-                if eq_text:
-                    lines.append(f"- `{eq_text}` (p.{page})")
-        else:
-            lines.append("- No extractable governing equation found in machine-readable text.")
-        lines.append("")
-
-        lines.append("**Detailed observations linked to repository modules**")
-        lines.append("")
-        observations = paper.get("repo_observations", [])
-        if isinstance(observations, list) and observations:
-            for obs in observations:
-                lines.append(f"- {obs}")
-        else:
-            lines.append("- No additional module-specific observations were generated.")
-        lines.append("")
-
-        lines.append("**Evidence anchors**")
-        lines.append("")
-        evidence = paper.get("evidence_anchors", [])
-        if isinstance(evidence, list) and evidence:
-            for anchor in evidence:
-                if not isinstance(anchor, dict):
-                    continue
-                tag = anchor.get("tag", "evidence")
-                page = anchor.get("page", "?")
-                quote = str(anchor.get("quote", "")).strip()
-                lines.append(f"- [{tag}, p.{page}] {quote}")
+    paper_sections = 0
+    for paper in source.papers():
+        paper_sections += 1
+        if shard_links:
+            lines.append(f"- [{paper_heading(paper)}]({shard_path(paper)})")
         else:
-            lines.append("- [fallback, p.1] No machine-readable evidence anchor extracted.")
+            write_paper_section(lines, paper, repo_root, images_root, derivatives=derivatives)
+    if shard_links:
         lines.append("")
 
-        lines.append("**Figure gallery (scientific images)**")
-        lines.append("")
-        figures = paper.get("figures", [])
-        if isinstance(figures, list) and figures:
-            for fig in figures:
-                if not isinstance(fig, dict):
-                    continue
-                figure_id = str(fig.get("figure_id", "figure"))
-                raw_path = str(fig.get("relative_path", ""))
-                if raw_path:
-                    relative_path = repo_relative(raw_path, repo_root)
-                else:
-                    relative_path = f"{images_root}/{paper.get('paper_id', '')}/figures/{figure_id}"
-                caption_hint = str(fig.get("caption_hint", "Scientific figure"))
-                lines.append(f"![{figure_id}]({relative_path})")
-                lines.append(f"*{caption_hint}*")
-                lines.append("")
-        else:
-            lines.append("No scientific images were retained after filtering.")
-            lines.append("")
-
     lines.append("## Bibliography")
     lines.append("")
-    for item in bibliography:
-        if not isinstance(item, dict):
-            continue
+    for item in source.bibliography():
         idx = item.get("id", "?")
         citation = str(item.get("citation", "")).strip()
         lines.append(f"{idx}. {citation}")
@@ -316,10 +476,7 @@ def compose_markdown(summary_json: Path, output_md: Path, images_root: str) -> N
     )
     lines.append("- Placeholder scan target: no unresolved placeholder markers remain in this report.")
     lines.append("")
-
-    ensure_dir(output_md.parent)
-    output_md.write_text("\n".join(lines), encoding="utf-8")
-    print(json.dumps({"output_markdown": str(output_md.resolve()), "paper_sections": len(papers)}, indent=2))
+    return paper_sections
 
 
 def parse_args() -> argparse.Namespace:
@@ -327,7 +484,12 @@ def parse_args() -> argparse.Namespace:
     default_out_dir = repo_root / "Artifacts" / "research_report_2026-02-11"
 
     parser = argparse.ArgumentParser(description="Compose consolidated markdown research report.")
-    parser.add_argument("--summary-json", type=Path, default=default_out_dir / "paper_summaries.json")
+    parser.add_argument(
+        "--summary-json",
+        type=Path,
+        default=default_out_dir / "paper_summaries.json",
+        help="Summary document from summarize_papers.py (.json or streaming .jsonl).",
+    )
     parser.add_argument(
         "--output-md",
         type=Path,
@@ -339,16 +501,57 @@ def parse_args() -> argparse.Namespace:
         default="Artifacts/research_report_2026-02-11/papers",
         help="Repo-relative root used for generated image links.",
     )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Read paper summaries from this SQLite artifact store instead of --summary-json.",
+    )
+    parser.add_argument(
+        "--shard-dir",
+        type=Path,
+        default=None,
+        help="Write index.md plus papers/<paper_id>.md here instead of --output-md; unchanged shards are not rewritten.",
+    )
+    parser.add_argument(
+        "--derivatives-index",
+        type=Path,
+        default=default_out_dir / DERIVATIVES_INDEX,
+        help="Index written by image_derivatives.py; figures without a derivative link the original.",
+    )
+    parser.add_argument(
+        "--figure-variant",
+        choices=(*DERIVATIVE_VARIANTS, "original"),
+        default="web",
+        help="Figure derivative embedded in the report (linked to the original).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    compose_markdown(
-        summary_json=args.summary_json.resolve(),
-        output_md=args.output_md.resolve(),
-        images_root=args.images_root,
-    )
+    derivatives = load_derivative_map(args.derivatives_index.resolve(), args.figure_variant)
+    store = ArtifactStore(args.store.resolve()) if args.store else None
+    try:
+        if args.shard_dir:
+            compose_shards(
+                summary_json=args.summary_json.resolve(),
+                shard_dir=args.shard_dir.resolve(),
+                images_root=args.images_root,
+                store=store,
+                derivatives=derivatives,
+            )
+        else:
+            compose_markdown(
+                summary_json=args.summary_json.resolve(),
+                output_md=args.output_md.resolve(),
+                images_root=args.images_root,
+                store=store,
+                derivatives=derivatives,
+            )
+    finally:
+        if store:
+            store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,349 @@
+﻿#!/usr/bin/env python3
+"""Compose an offline static HTML site (index, per-paper pages, search index) from summary records."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from artifact_store import ArtifactStore
+from compose_report import METHOD_TAG_LABELS, method_tag_counts, paper_heading, repo_relative
+from image_derivatives import DERIVATIVE_VARIANTS, DERIVATIVES_INDEX, load_derivative_map
+from research_common import TERM_SUFFIXES, ensure_dir, repo_root_from_file, tokenize_terms, utc_now_iso
+from summary_source import SummarySource
+
+SITE_PAPERS_DIR = "papers"
+SEARCH_INDEX_JSON = "search_index.json"
+SEARCH_INDEX_JS = "search_index.js"
+# Summary fields indexed for the client-side search.
+SEARCH_FIELDS = ("title", "objective", "methods", "findings", "citation")
+
+SITE_CSS = """body{font-family:system-ui,sans-serif;max-width:60rem;margin:0 auto;padding:1rem 1.5rem;line-height:1.5;color:#1d1d1f}
+a{color:#0b57d0}table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:.25rem .6rem;text-align:left}
+code{background:#f3f3f3;padding:0 .2rem}ul.papers{columns:2;padding-left:1.2rem}
+.gallery{display:grid;grid-template-columns:repeat(auto-fill,minmax(16rem,1fr));gap:1rem}
+.gallery figure{margin:0}.gallery img{width:100%;height:auto;background:#eee}
+#search{width:100%;font-size:1rem;padding:.4rem}#results li{margin:.2rem 0}
+"""
+
+# Loads the precomputed index on first use and mirrors research_common.tokenize_terms for queries.
+SEARCH_JS = """(function () {
+  var input = document.getElementById("search");
+  var out = document.getElementById("results");
+  if (!input || !out) { return; }
+  var index = null;
+  var loading = false;
+  function load(ready) {
+    if (index) { ready(); return; }
+    if (window.SEARCH_INDEX) { index = window.SEARCH_INDEX; ready(); return; }
+    if (loading) { return; }
+    loading = true;
+    var script = document.createElement("script");
+    script.src = input.getAttribute("data-index");
+    script.onload = function () { index = window.SEARCH_INDEX; ready(); };
+    document.head.appendChild(script);
+  }
+  function stem(term) {
+    for (var i = 0; i < index.suffixes.length; i++) {
+      var suffix = index.suffixes[i];
+      if (term.length - suffix.length >= 3 && term.slice(-suffix.length) === suffix) {
+        return term.slice(0, -suffix.length);
+      }
+    }
+    return term;
+  }
+  function search() {
+    var terms = (input.value.toLowerCase().match(/[a-z0-9]+/g) || []).map(stem);
+    out.innerHTML = "";
+    if (!terms.length) { return; }
+    var hits = null;
+    terms.forEach(function (term) {
+      var docs = index.postings[term] || [];
+      var wanted = new Set(docs);
+      hits = hits === null ? docs.slice() : hits.filter(function (doc) { return wanted.has(doc); });
+    });
+    hits.slice(0, 50).forEach(function (doc) {
+      var item = document.createElement("li");
+      var link = document.createElement("a");
+      link.href = index.docs[doc].href;
+      link.textContent = index.docs[doc].heading;
+      item.appendChild(link);
+      out.appendChild(item);
+    });
+    if (!hits.length) { out.innerHTML = "<li>No matching papers.</li>"; }
+  }
+  input.addEventListener("input", function () { load(search); });
+})();
+"""
+
+
+def page_html(title: str, body: str, asset_prefix: str, scripts: Optional[List[str]] = None) -> str:
+    script_tags = "".join(f'<script src="{escape(src)}" defer></script>' for src in scripts or [])
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{escape(title)}</title>\n"
+        f'<link rel="stylesheet" href="{asset_prefix}site.css">\n'
+        f"{script_tags}\n</head>\n<body>\n{body}\n</body>\n</html>\n"
+    )
+
+
+def site_link(target: str, repo_root: Path, page_dir: Path) -> str:
+    """Relative URL from a site page to a repo-relative or absolute file path."""
+    path = Path(target)
+    absolute = path if path.is_absolute() else repo_root / path
+    try:
+        return Path(os.path.relpath(absolute, page_dir)).as_posix()
+    except ValueError:
+        # Different drive on Windows: fall back to an absolute file URL.
+        return absolute.resolve().as_uri()
+
+
+def paper_page(
+    paper: Dict[str, object],
+    repo_root: Path,
+    images_root: str,
+    page_dir: Path,
+    derivatives: Dict[str, str],
+) -> str:
+    citation_no = int(paper.get("citation_number", 0))
+    heading = paper_heading(paper)
+    parts: List[str] = ['<p><a href="../index.html">&larr; Report index</a></p>', f"<h1>{escape(heading)}</h1>"]
+    parts.append(f"<p><strong>Citation [{citation_no}]:</strong> {escape(str(paper.get('citation', '')))}</p>")
+
+    facts: List[str] = []
+    if paper.get("canonical_file_name"):
+        facts.append(f"<li>Canonical PDF: <code>{escape(str(paper['canonical_file_name']))}</code></li>")
+    doi = str(paper.get("doi", "")).strip()
+    url = str(paper.get("url", "")).strip()
+    if doi:
+        facts.append(f'<li>DOI: <a href="https://doi.org/{escape(doi)}">{escape(doi)}</a></li>')
+    if url:
+        facts.append(f'<li>URL: <a href="{escape(url)}">{escape(url)}</a></li>')
+    if facts:
+        parts.append("<ul>" + "".join(facts) + "</ul>")
+
+    for label, key in (
+        ("Research objective and scope", "objective"),
+        ("Methods and numerical approach", "methods"),
+        ("Key findings", "findings"),
+        ("Limitations", "limitations"),
+    ):
+        parts.append(f"<h2>{label}</h2><p>{escape(str(paper.get(key, '')))}</p>")
+
+    parts.append("<h2>Key governing equations</h2>")
+    equations = [eq for eq in paper.get("key_equations", []) or [] if isinstance(eq, dict) and eq.get("equation")]
+    if equations:
+        items = "".join(
+            f"<li><code>{escape(str(eq['equation']).strip())}</code> (p.{escape(str(eq.get('page', '?')))})</li>"
+            for eq in equations
+        )
+        parts.append(f"<ul>{items}</ul>")
+    else:
+        parts.append("<p>No extractable governing equation found in machine-readable text.</p>")
+
+    observations = paper.get("repo_observations", []) or []
+    if observations:
+        parts.append("<h2>Detailed observations linked to repository modules</h2>")
+        parts.append("<ul>" + "".join(f"<li>{escape(str(obs))}</li>" for obs in observations) + "</ul>")
+
+    evidence = [anchor for anchor in paper.get("evidence_anchors", []) or [] if isinstance(anchor, dict)]
+    if evidence:
+        parts.append("<h2>Evidence anchors</h2><ul>")
+        for anchor in evidence:
+            tag = escape(str(anchor.get("tag", "evidence")))
+            page = escape(str(anchor.get("page", "?")))
+            parts.append(f"<li>[{tag}, p.{page}] {escape(str(anchor.get('quote', '')).strip())}</li>")
+        parts.append("</ul>")
+
+    parts.append("<h2>Figure gallery</h2>")
+    figures = [fig for fig in paper.get("figures", []) or [] if isinstance(fig, dict)]
+    if figures:
+        parts.append('<div class="gallery">')
+        for fig in figures:
+            figure_id = str(fig.get("figure_id", "figure"))
+            raw_path = str(fig.get("relative_path", ""))
+            if raw_path:
+                relative_path = repo_relative(raw_path, repo_root)
+            else:
+                relative_path = f"{images_root}/{paper.get('paper_id', '')}/figures/{figure_id}"
+            original = site_link(relative_path, repo_root, page_dir)
+            shown = site_link(derivatives.get(relative_path, relative_path), repo_root, page_dir)
+            caption = escape(str(fig.get("caption_hint", "Scientific figure")))
+            parts.append(
+                f'<figure><a href="{escape(original)}"><img src="{escape(shown)}" alt="{escape(figure_id)}" '
+                f'loading="lazy" decoding="async"></a><figcaption>{caption}</figcaption></figure>'
+            )
+        parts.append("</div>")
+    else:
+        parts.append("<p>No scientific images were retained after filtering.</p>")
+
+    return page_html(heading, "\n".join(parts), "../")
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write only when the content differs, so unchanged pages keep their mtime."""
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def compose_site(
+    summary_json: Path,
+    site_dir: Path,
+    images_root: str,
+    store: Optional[ArtifactStore] = None,
+    derivatives: Optional[Dict[str, str]] = None,
+) -> Dict[str, object]:
+    repo_root = repo_root_from_file(Path(__file__))
+    source = (
+        SummarySource.from_line_reader(
+            lambda: store.iter_document_lines("paper_summaries"),
+            last_line=store.last_document_line("paper_summaries"),
+        )
+        if store
+        else SummarySource.from_path(summary_json)
+    )
+    papers_dir = ensure_dir(site_dir / SITE_PAPERS_DIR)
+    derivatives = derivatives or {}
+
+    docs: List[Dict[str, object]] = []
+    postings: Dict[str, List[int]] = {}
+    list_items: List[str] = []
+    written_pages: Set[str] = set()
+    changed = 0
+    for paper in source.papers():
+        paper_id = str(paper.get("paper_id", ""))
+        href = f"{SITE_PAPERS_DIR}/{paper_id}.html"
+        heading = paper_heading(paper)
+        changed += write_if_changed(
+            site_dir / href, paper_page(paper, repo_root, images_root, papers_dir, derivatives)
+        )
+        written_pages.add(f"{paper_id}.html")
+
+        doc_id = len(docs)
+        docs.append({"heading": heading, "href": href, "year": paper.get("year", "")})
+        text = " ".join(str(paper.get(field, "")) for field in SEARCH_FIELDS)
+        for term in sorted(set(tokenize_terms(text))):
+            postings.setdefault(term, []).append(doc_id)
+        list_items.append(f'<li><a href="{escape(href)}">{escape(heading)}</a></li>')
+
+    # Pages of papers that left the corpus.
+    for stale in papers_dir.glob("*.html"):
+        if stale.name not in written_pages:
+            stale.unlink()
+
+    corpus = source.corpus_summary
+    validation = source.validation
+    tag_counts = method_tag_counts(source.papers())
+    body: List[str] = [
+        "<h1>Deep Research Report - Tsunami Vorticity Corpus (2026-02-11)</h1>",
+        f"<p>Generated: {escape(utc_now_iso())}</p>",
+        "<h2>Executive Synopsis</h2>",
+        "<p>This report consolidates the local <code>Research Papers/</code> corpus into a single NotebookLM-style "
+        "synthesis focused on numerical simulation of tsunami-related vorticity dynamics over ocean surfaces.</p>",
+        "<h2>Search</h2>",
+        f'<input id="search" type="search" placeholder="Search titles, objectives, methods, findings" '
+        f'data-index="{SEARCH_INDEX_JS}" autocomplete="off">',
+        '<ul id="results"></ul>',
+        "<h2>Corpus Manifest Summary</h2>",
+        "<table><tr><th>Metric</th><th>Value</th></tr>",
+    ]
+    for label, key in (
+        ("Source files", "source_total_files"),
+        ("Unique papers", "source_unique_files"),
+        ("Summarized sections", "summarized_records"),
+        ("Duplicate groups", "duplicate_groups"),
+    ):
+        body.append(f"<tr><td>{label}</td><td>{escape(str(corpus.get(key, 'n/a')))}</td></tr>")
+    body.append("</table>")
+    body.append("<h2>Numerical Method Distribution (keyword-based signal)</h2>")
+    body.append("<table><tr><th>Method signal</th><th>Papers</th></tr>")
+    for tag, label in METHOD_TAG_LABELS.items():
+        body.append(f"<tr><td>{escape(label)}</td><td>{tag_counts[tag]}</td></tr>")
+    body.append("</table>")
+    body.append("<h2>Per-Paper Summaries</h2>")
+    body.append('<ul class="papers">' + "".join(list_items) + "</ul>")
+    body.append("<h2>Bibliography</h2><ol>")
+    for item in source.bibliography():
+        body.append(f'<li value="{escape(str(item.get("id", "")))}">{escape(str(item.get("citation", "")).strip())}</li>')
+    body.append("</ol>")
+    body.append("<h2>Validation Checklist</h2><ul>")
+    for label, key in (
+        ("All summaries have citations", "all_have_citations"),
+        ("All summaries have evidence anchors", "all_have_evidence"),
+        ("All summaries have equation section or fallback", "all_have_equation_or_fallback"),
+    ):
+        body.append(f"<li>{label}: <code>{escape(str(validation.get(key)))}</code></li>")
+    body.append("</ul>")
+
+    (site_dir / "index.html").write_text(
+        page_html("Deep Research Report", "\n".join(body), "", scripts=["search.js"]), encoding="utf-8"
+    )
+    write_if_changed(site_dir / "site.css", SITE_CSS)
+    write_if_changed(site_dir / "search.js", SEARCH_JS)
+
+    # The JSON index is for tooling; the .js copy lets the search run from file:// without a server.
+    search_index = {"suffixes": list(TERM_SUFFIXES), "docs": docs, "postings": postings}
+    search_json = json.dumps(search_index, ensure_ascii=False, separators=(",", ":"))
+    write_if_changed(site_dir / SEARCH_INDEX_JSON, search_json)
+    write_if_changed(site_dir / SEARCH_INDEX_JS, f"window.SEARCH_INDEX = {search_json};\n")
+
+    return {"site_dir": str(site_dir.resolve()), "paper_pages": len(docs), "changed_pages": changed, "terms": len(postings)}
+
+
+def parse_args() -> argparse.Namespace:
+    repo_root = repo_root_from_file(Path(__file__))
+    default_out_dir = repo_root / "Artifacts" / "research_report_2026-02-11"
+
+    parser = argparse.ArgumentParser(description="Compose an offline static HTML site from paper summaries.")
+    parser.add_argument("--summary-json", type=Path, default=default_out_dir / "paper_summaries.json")
+    parser.add_argument("--site-dir", type=Path, default=default_out_dir / "site")
+    parser.add_argument(
+        "--images-root",
+        type=str,
+        default="Artifacts/research_report_2026-02-11/papers",
+        help="Repo-relative root used for generated image links.",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Read paper summaries from this SQLite artifact store instead of --summary-json.",
+    )
+    parser.add_argument("--derivatives-index", type=Path, default=default_out_dir / DERIVATIVES_INDEX)
+    parser.add_argument(
+        "--figure-variant",
+        choices=(*DERIVATIVE_VARIANTS, "original"),
+        default="thumb",
+        help="Figure derivative shown in galleries (linked to the original).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    derivatives = load_derivative_map(args.derivatives_index.resolve(), args.figure_variant)
+    store = ArtifactStore(args.store.resolve()) if args.store else None
+    try:
+        result = compose_site(
+            summary_json=args.summary_json.resolve(),
+            site_dir=ensure_dir(args.site_dir.resolve()),
+            images_root=args.images_root,
+            store=store,
+            derivatives=derivatives,
+        )
+    finally:
+        if store:
+            store.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
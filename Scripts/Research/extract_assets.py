@@ -13,7 +13,9 @@ import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from artifact_store import ArtifactStore
 from research_common import (
+    KEYWORD_SIGNAL_PAGES,
     build_ris_indexes,
     clean_whitespace,
     detect_doi,
@@ -21,6 +23,7 @@ from research_common import (
     extract_title_from_page,
     find_ris_match,
     json_dump,
+    keyword_signals,
     parse_ris_file,
     parse_size_token,
     relative_repo_path,
@@ -31,6 +34,7 @@ from research_common import (
     to_vancouver_citation,
     utc_now_iso,
 )
+from search_index import SearchIndex
 
 EQUATION_SYMBOLS = re.compile(r"[\u2202\u2207\u0394\u03c9\u03c8\u03bd\u03b7\u03a3]")
 YEAR_REGEX = re.compile(r"\b(19|20)\d{2}\b")
@@ -407,6 +411,8 @@ def extract_assets(
     out_dir: Path,
     ris_path: Path,
     force: bool,
+    store: Optional[ArtifactStore] = None,
+    search_index: Optional[SearchIndex] = None,
 ) -> None:
     repo_root = repo_root_from_file(Path(__file__))
     manifest = load_manifest(manifest_path)
@@ -436,13 +442,14 @@ def extract_assets(
         eq_path = paper_dir / "equation_candidates.json"
         fig_index_path = paper_dir / "figures_index.json"
 
-        if metadata_path.exists() and not force:
+        already_extracted = store.has("metadata", paper_id) if store else metadata_path.exists()
+        if already_extracted and not force:
             print(f"[skip] {paper_id}: metadata exists (use --force to regenerate)")
             extraction_rows.append(
                 {
                     "paper_id": paper_id,
                     "status": "skipped",
-                    "metadata_path": str(metadata_path.resolve()),
+                    "metadata_path": str(store.path) if store else str(metadata_path.resolve()),
                 }
             )
             continue
@@ -485,18 +492,35 @@ def extract_assets(
             "pdf_page_count_declared": paper.get("pages"),
         }
 
-        # Save files.
-        json_dump(metadata_path, metadata)
-        json_dump(eq_path, equation_candidates)
-        json_dump(fig_index_path, figure_summary)
-
         page_meta = {
             "page_count": len(pages),
             "nonempty_pages": sum(1 for p in pages if p.strip()),
             "first_page_preview": clean_whitespace(pages[0])[:400] if pages else "",
             "first_sentences": sentence_tokenize("\n".join(pages[:2]))[:5],
         }
-        json_dump(paper_dir / "pages_meta.json", page_meta)
+        signals = keyword_signals("\n".join(pages[:KEYWORD_SIGNAL_PAGES]))
+
+        # Save artifacts: one store transaction, or the classic per-paper JSON files.
+        if store:
+            store.put_paper(
+                paper_id,
+                {
+                    "metadata": metadata,
+                    "equation_candidates": equation_candidates,
+                    "figures_index": figure_summary,
+                    "pages_meta": page_meta,
+                    "keyword_signals": signals,
+                },
+            )
+        else:
+            json_dump(metadata_path, metadata)
+            json_dump(eq_path, equation_candidates)
+            json_dump(fig_index_path, figure_summary)
+            json_dump(paper_dir / "pages_meta.json", page_meta)
+            json_dump(paper_dir / "keyword_signals.json", signals)
+
+        if search_index:
+            search_index.update_paper(paper_id, str(metadata.get("title") or paper_id), pages)
 
         extraction_rows.append(
             {
@@ -506,7 +530,7 @@ def extract_assets(
                 "text_quality": text_quality.get("quality"),
                 "figure_count": figure_summary.get("kept_count", 0),
                 "equation_count": len(equation_candidates),
-                "metadata_path": str(metadata_path.resolve()),
+                "metadata_path": str(store.path) if store else str(metadata_path.resolve()),
                 "text_path": str(text_path.resolve()),
             }
         )
@@ -546,6 +570,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--out-dir", type=Path, default=default_out)
     parser.add_argument("--ris", type=Path, default=repo_root / "Research Papers" / "MECH0020.ris")
     parser.add_argument("--force", action="store_true", help="Regenerate all paper assets.")
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Optional SQLite artifact store; replaces the per-paper JSON files when set.",
+    )
+    parser.add_argument(
+        "--search-index",
+        type=Path,
+        default=None,
+        help="Optional search index (see search_index.py) updated with every newly extracted paper.",
+    )
     return parser.parse_args()
 
 
@@ -558,7 +594,15 @@ def main() -> None:
     if not manifest.exists():
         raise SystemExit(f"manifest not found: {manifest}")
 
-    extract_assets(manifest, out_dir, ris, force=args.force)
+    store = ArtifactStore(args.store.resolve()) if args.store else None
+    search_index = SearchIndex(args.search_index.resolve()) if args.search_index else None
+    try:
+        extract_assets(manifest, out_dir, ris, force=args.force, store=store, search_index=search_index)
+    finally:
+        if store:
+            store.close()
+        if search_index:
+            search_index.close()
 
 
 if __name__ == "__main__":
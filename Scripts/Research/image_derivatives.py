@@ -0,0 +1,260 @@
+﻿#!/usr/bin/env python3
+"""Build downscaled thumbnail and web variants of extracted figures, cached by source hash."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from artifact_store import ArtifactStore
+from research_common import json_dump, relative_repo_path, repo_root_from_file, sha256_file, utc_now_iso
+
+# Variant name -> (longest side in pixels, encoder quality). Images are only ever downscaled.
+DERIVATIVE_VARIANTS: Dict[str, Tuple[int, int]] = {
+    "thumb": (320, 70),
+    "web": (1600, 82),
+}
+DERIVATIVES_DIR = "derived"
+DERIVATIVES_INDEX = "derivatives_index.json"
+INDEX_VERSION = 1
+
+
+def load_pillow():
+    try:
+        from PIL import Image, features
+    except ImportError as exc:
+        raise SystemExit("Pillow is required for image derivatives: pip install pillow") from exc
+    return Image, features
+
+
+def output_format() -> Tuple[str, str]:
+    """WebP when the local Pillow build supports it, JPEG otherwise."""
+    _, features = load_pillow()
+    return ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+
+
+def figure_key(raw_path: str, repo_root: Path) -> str:
+    """Index key for a figure path; matches compose_report.repo_relative."""
+    path = Path(raw_path)
+    return relative_repo_path(path, repo_root) if path.is_absolute() else path.as_posix()
+
+
+def build_figure_derivatives(task: Tuple[str, str, str, str, str]) -> Dict[str, object]:
+    """Render every variant of one source image; runs in a worker process."""
+    source, key, digest, repo_root, image_format = task
+    Image, _ = load_pillow()
+    source_path = Path(source)
+    repo = Path(repo_root)
+    suffix = ".webp" if image_format == "WEBP" else ".jpg"
+    out_dir = source_path.parent / DERIVATIVES_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    variants: Dict[str, object] = {}
+    with Image.open(source_path) as image:
+        image.load()
+        width, height = image.size
+        if image_format == "JPEG":
+            target_mode = "RGB"
+        else:
+            target_mode = "RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB"
+        if image.mode != target_mode:
+            image = image.convert(target_mode)
+        for name, (max_side, quality) in DERIVATIVE_VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((max_side, max_side), Image.LANCZOS)
+            out_path = out_dir / f"{source_path.stem}_{digest[:12]}_{name}{suffix}"
+            if image_format == "WEBP":
+                variant.save(out_path, image_format, quality=quality, method=4)
+            else:
+                variant.save(out_path, image_format, quality=quality, optimize=True)
+            variants[name] = {
+                "path": figure_key(str(out_path), repo),
+                "width": variant.width,
+                "height": variant.height,
+                "size_bytes": out_path.stat().st_size,
+            }
+    return {"key": key, "sha256": digest, "width": width, "height": height, "variants": variants}
+
+
+def hash_and_build(task: Tuple[str, str, Optional[Dict[str, object]], str, str]) -> Dict[str, object]:
+    """Hash one source; reuse its cached entry if the hash still matches and the outputs exist.
+
+    An unreadable or corrupt image yields a "failed" result instead of raising, so one bad figure
+    keeps its original link rather than aborting the whole run.
+    """
+    source, key, cached, repo_root, image_format = task
+    try:
+        digest = sha256_file(Path(source))
+        if cached is not None and cached.get("sha256") == digest and derivatives_exist(cached, Path(repo_root)):
+            return {**cached, "reused": True}
+        return build_figure_derivatives((source, key, digest, repo_root, image_format))
+    except Exception as exc:
+        return {"key": key, "failed": True, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def derivatives_exist(entry: Dict[str, object], repo_root: Path) -> bool:
+    variants = entry.get("variants")
+    if not isinstance(variants, dict) or set(variants) != set(DERIVATIVE_VARIANTS):
+        return False
+    for variant in variants.values():
+        path = Path(str(variant.get("path", "")))
+        if not (path if path.is_absolute() else repo_root / path).exists():
+            return False
+    return True
+
+
+def iter_figure_sources(
+    assets_dir: Path,
+    repo_root: Path,
+    store: Optional[ArtifactStore] = None,
+) -> Iterator[Tuple[str, Path]]:
+    """(index key, absolute source path) for every figure listed in the figures indexes."""
+    if store:
+        indexes = store.load_all("figures_index")
+    else:
+        indexes = {
+            path.parent.name: json.loads(path.read_text(encoding="utf-8", errors="ignore"))
+            for path in sorted((assets_dir / "papers").glob("*/figures_index.json"))
+        }
+    for paper_id in sorted(indexes):
+        figures = indexes[paper_id].get("figures", []) if isinstance(indexes[paper_id], dict) else []
+        for fig in figures:
+            if not isinstance(fig, dict) or not fig.get("relative_path"):
+                continue
+            raw_path = str(fig["relative_path"])
+            path = Path(raw_path)
+            yield figure_key(raw_path, repo_root), path if path.is_absolute() else repo_root / path
+
+
+def build_derivatives(
+    assets_dir: Path,
+    index_path: Path,
+    repo_root: Path,
+    jobs: int = 1,
+    store: Optional[ArtifactStore] = None,
+) -> Dict[str, object]:
+    image_format, _ = output_format()
+    previous = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else {}
+    cached_sources = previous.get("sources", {}) if previous.get("format") == image_format else {}
+
+    sources: Dict[str, object] = {}
+    tasks: List[Tuple[str, str, Optional[Dict[str, object]], str, str]] = []
+    stats = {"figures": 0, "reused": 0, "rebuilt": 0, "missing": 0, "failed": 0}
+    failures: Dict[str, str] = {}
+    seen = set()
+    for key, source_path in iter_figure_sources(assets_dir, repo_root, store):
+        if key in seen:
+            continue
+        seen.add(key)
+        stats["figures"] += 1
+        if not source_path.exists():
+            stats["missing"] += 1
+            continue
+        stat = source_path.stat()
+        cached = cached_sources.get(key)
+        # Unchanged size and mtime: trust the cached hash and skip re-reading the image.
+        if (
+            isinstance(cached, dict)
+            and cached.get("size") == stat.st_size
+            and cached.get("mtime_ns") == stat.st_mtime_ns
+            and derivatives_exist(cached, repo_root)
+        ):
+            sources[key] = cached
+            stats["reused"] += 1
+            continue
+        tasks.append((str(source_path), key, cached if isinstance(cached, dict) else None, str(repo_root), image_format))
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(hash_and_build, tasks, chunksize=4))
+    else:
+        results = [hash_and_build(task) for task in tasks]
+
+    for task, result in zip(tasks, results):
+        if result.get("failed"):
+            # No index entry, so reports keep linking the original image.
+            stats["failed"] += 1
+            failures[task[1]] = str(result.get("error", ""))
+            continue
+        stat = Path(task[0]).stat()
+        stats["reused" if result.pop("reused", False) else "rebuilt"] += 1
+        key = str(result.pop("key", task[1]))
+        sources[key] = {**result, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    original_bytes = sum(int(entry.get("size", 0)) for entry in sources.values())
+    derived_bytes = {
+        name: sum(int(entry["variants"][name]["size_bytes"]) for entry in sources.values())
+        for name in DERIVATIVE_VARIANTS
+    }
+    json_dump(
+        index_path,
+        {
+            "version": INDEX_VERSION,
+            "generated_at_utc": utc_now_iso(),
+            "format": image_format,
+            "variants": {name: {"max_side": side, "quality": quality} for name, (side, quality) in DERIVATIVE_VARIANTS.items()},
+            "sources": dict(sorted(sources.items())),
+        },
+    )
+    return {
+        **stats,
+        "format": image_format,
+        "original_bytes": original_bytes,
+        "derived_bytes": derived_bytes,
+        "failures": dict(sorted(failures.items())),
+    }
+
+
+def load_derivative_map(index_path: Optional[Path], variant: str) -> Dict[str, str]:
+    """Original figure key -> derivative path for one variant; empty when no index was built."""
+    if index_path is None or variant not in DERIVATIVE_VARIANTS or not index_path.exists():
+        return {}
+    index = json.loads(index_path.read_text(encoding="utf-8", errors="ignore"))
+    out: Dict[str, str] = {}
+    for key, entry in index.get("sources", {}).items():
+        path = entry.get("variants", {}).get(variant, {}).get("path") if isinstance(entry, dict) else None
+        if path:
+            out[key] = str(path)
+    return out
+
+
+def parse_args() -> argparse.Namespace:
+    repo_root = repo_root_from_file(Path(__file__))
+    default_out_dir = repo_root / "Artifacts" / "research_report_2026-02-11"
+
+    parser = argparse.ArgumentParser(description="Build thumbnail and web-optimized variants of extracted figures.")
+    parser.add_argument("--assets-dir", type=Path, default=default_out_dir)
+    parser.add_argument("--index", type=Path, default=default_out_dir / DERIVATIVES_INDEX)
+    parser.add_argument("--jobs", type=int, default=4, help="Worker processes for resizing and encoding.")
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Read figure indexes from this SQLite artifact store instead of papers/<paper_id>/figures_index.json.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    repo_root = repo_root_from_file(Path(__file__))
+    store = ArtifactStore(args.store.resolve()) if args.store else None
+    try:
+        result = build_derivatives(
+            assets_dir=args.assets_dir.resolve(),
+            index_path=args.index.resolve(),
+            repo_root=repo_root,
+            jobs=max(1, args.jobs),
+            store=store,
+        )
+    finally:
+        if store:
+            store.close()
+    print(json.dumps({"index": str(args.index.resolve()), **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
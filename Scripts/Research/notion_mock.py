@@ -0,0 +1,529 @@
+﻿#!/usr/bin/env python3
+"""Local stand-in for the subset of the Notion API used by publish_notion.py.
+
+Implements pages, block children, block update/delete and single- or multi-part file uploads
+in memory, with configurable latency, server-side rate limiting, error injection and the
+per-request limits of the block children (including rich text arrays) and file upload
+endpoints. Use it for offline publishing, benchmarks and CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import email.policy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+API_PREFIX = "/v1"
+MAX_ARRAY_LENGTH = 100
+MAX_TEXT_CONTENT = 2000
+MAX_REQUEST_BLOCKS = 1000
+MAX_NESTING = 2
+MAX_PAYLOAD_BYTES = 500_000
+SINGLE_PART_MAX_BYTES = 20 * 1024 * 1024
+MIN_PART_BYTES = 5 * 1024 * 1024
+MAX_PARTS = 1000
+
+ROUTES: List[Tuple[str, "re.Pattern[str]", str]] = [
+    ("POST", re.compile(r"^/pages$"), "create_page"),
+    ("PATCH", re.compile(r"^/pages/(?P<id>[^/]+)$"), "update_page"),
+    ("GET", re.compile(r"^/blocks/(?P<id>[^/]+)/children$"), "list_children"),
+    ("PATCH", re.compile(r"^/blocks/(?P<id>[^/]+)/children$"), "append_children"),
+    ("PATCH", re.compile(r"^/blocks/(?P<id>[^/]+)$"), "update_block"),
+    ("DELETE", re.compile(r"^/blocks/(?P<id>[^/]+)$"), "delete_block"),
+    ("POST", re.compile(r"^/file_uploads$"), "create_upload"),
+    ("POST", re.compile(r"^/file_uploads/(?P<id>[^/]+)/send$"), "send_upload"),
+    ("POST", re.compile(r"^/file_uploads/(?P<id>[^/]+)/complete$"), "complete_upload"),
+    ("GET", re.compile(r"^/file_uploads/(?P<id>[^/]+)$"), "get_upload"),
+]
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Server-side token bucket; 0 disables rate limiting.
+    rate_limit: float = 0.0
+    rate_burst: float = 3.0
+    retry_after_s: float = 1.0
+    # Fraction of requests answered with `error_status` instead of being processed.
+    error_rate: float = 0.0
+    error_status: int = 503
+    enforce_limits: bool = True
+    seed: int = 0
+
+
+class MockApiError(Exception):
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def block_children(block: Dict[str, object]) -> List[Dict[str, object]]:
+    content = block.get(str(block.get("type", "")))
+    children = content.get("children") if isinstance(content, dict) else None
+    return children if isinstance(children, list) else []
+
+
+def check_rich_text_limits(block: Dict[str, object]) -> None:
+    """Validate the rich text arrays of one block (rich_text, caption and table cells)."""
+    content = block.get(str(block.get("type", "")))
+    if not isinstance(content, dict):
+        return
+    cells = content.get("cells")
+    arrays = [content.get("rich_text"), content.get("caption")] + (cells if isinstance(cells, list) else [])
+    for array in arrays:
+        if not isinstance(array, list):
+            continue
+        if len(array) > MAX_ARRAY_LENGTH:
+            raise MockApiError(400, "validation_error", f"rich_text length should be <= {MAX_ARRAY_LENGTH}")
+        for item in array:
+            text = item.get("text") if isinstance(item, dict) else None
+            if isinstance(text, dict) and len(str(text.get("content", ""))) > MAX_TEXT_CONTENT:
+                raise MockApiError(400, "validation_error", f"text.content length should be <= {MAX_TEXT_CONTENT}")
+
+
+def check_children_limits(children: List[Dict[str, object]], depth: int = 1) -> int:
+    """Validate one request's children array; returns its total block count."""
+    if len(children) > MAX_ARRAY_LENGTH:
+        raise MockApiError(400, "validation_error", f"children length should be <= {MAX_ARRAY_LENGTH}")
+    if children and depth > MAX_NESTING:
+        raise MockApiError(400, "validation_error", f"children nesting deeper than {MAX_NESTING} levels")
+    total = len(children)
+    for child in children:
+        if not isinstance(child, dict) or str(child.get("type", "")) not in child:
+            raise MockApiError(400, "validation_error", "block is missing its type content")
+        check_rich_text_limits(child)
+        total += check_children_limits(block_children(child), depth + 1)
+    return total
+
+
+class NotionMockState:
+    """In-memory pages, blocks and uploads. All methods run under the server lock."""
+
+    def __init__(self) -> None:
+        self.blocks: Dict[str, Dict[str, object]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.parents: Dict[str, str] = {}
+        self.pages: Dict[str, Dict[str, object]] = {}
+        self.uploads: Dict[str, Dict[str, object]] = {}
+        self.blocks_created = 0
+        self.upload_bytes = 0
+
+    def create_page(self, body: Dict[str, object]) -> Dict[str, object]:
+        page_id = str(uuid.uuid4())
+        self.pages[page_id] = {"properties": body.get("properties", {}), "in_trash": False}
+        self.children[page_id] = []
+        return {"object": "page", "id": page_id, "url": f"https://mock.notion.local/{page_id.replace('-', '')}"}
+
+    def update_page(self, page_id: str, body: Dict[str, object]) -> Dict[str, object]:
+        if page_id not in self.pages:
+            raise MockApiError(404, "object_not_found", f"page {page_id} not found")
+        self.pages[page_id]["in_trash"] = bool(body.get("in_trash", body.get("archived", False)))
+        return {"object": "page", "id": page_id, "in_trash": self.pages[page_id]["in_trash"]}
+
+    def _store(self, parent_id: str, blocks: List[Dict[str, object]]) -> List[str]:
+        ids: List[str] = []
+        for block in blocks:
+            block_id = str(uuid.uuid4())
+            block_type = str(block["type"])
+            content = {key: value for key, value in dict(block[block_type]).items() if key != "children"}
+            self.blocks[block_id] = {**block, block_type: content}
+            self.children[block_id] = []
+            self.parents[block_id] = parent_id
+            self.blocks_created += 1
+            self.children[block_id].extend(self._store(block_id, block_children(block)))
+            ids.append(block_id)
+        return ids
+
+    def check_file_uploads(self, blocks: List[Dict[str, object]]) -> None:
+        """File blocks (e.g. images) may only reference uploads of this mock that finished uploading."""
+        for block in blocks:
+            content = block.get(str(block.get("type", "")))
+            if not isinstance(content, dict):
+                continue
+            if content.get("type") == "file_upload":
+                reference = content.get("file_upload")
+                upload_id = str(reference.get("id", "")) if isinstance(reference, dict) else ""
+                upload = self.uploads.get(upload_id)
+                if upload is None:
+                    raise MockApiError(400, "validation_error", f"file upload {upload_id!r} not found")
+                if upload["status"] != "uploaded":
+                    raise MockApiError(
+                        400, "validation_error", f"file upload {upload_id} is {upload['status']}, expected uploaded"
+                    )
+            self.check_file_uploads(block_children(block))
+
+    def append_children(self, parent_id: str, body: Dict[str, object], enforce_limits: bool, size: int) -> Dict[str, object]:
+        if parent_id not in self.children:
+            raise MockApiError(404, "object_not_found", f"block {parent_id} not found")
+        children = body.get("children")
+        if not isinstance(children, list) or not children:
+            raise MockApiError(400, "validation_error", "body.children should be a non-empty array")
+        if enforce_limits:
+            if size > MAX_PAYLOAD_BYTES:
+                raise MockApiError(413, "payload_too_large", f"payload exceeds {MAX_PAYLOAD_BYTES} bytes")
+            if check_children_limits(children) > MAX_REQUEST_BLOCKS:
+                raise MockApiError(400, "validation_error", f"more than {MAX_REQUEST_BLOCKS} blocks in one request")
+        self.check_file_uploads(children)
+        siblings = self.children[parent_id]
+        after = body.get("after")
+        if after:
+            if after not in siblings:
+                raise MockApiError(400, "validation_error", f"after block {after} is not a child of {parent_id}")
+            position = siblings.index(str(after)) + 1
+        else:
+            position = len(siblings)
+        created = self._store(parent_id, children)
+        siblings[position:position] = created
+        return {"object": "list", "results": [{"object": "block", "id": block_id} for block_id in created]}
+
+    def list_children(self, parent_id: str) -> Dict[str, object]:
+        if parent_id not in self.children:
+            raise MockApiError(404, "object_not_found", f"block {parent_id} not found")
+        results = [
+            {"object": "block", "id": block_id, "has_children": bool(self.children[block_id]), **self.blocks[block_id]}
+            for block_id in self.children[parent_id]
+        ]
+        return {"object": "list", "results": results, "has_more": False, "next_cursor": None}
+
+    def update_block(self, block_id: str, body: Dict[str, object], enforce_limits: bool) -> Dict[str, object]:
+        block = self.blocks.get(block_id)
+        if block is None:
+            raise MockApiError(404, "object_not_found", f"block {block_id} not found")
+        block_type = str(block["type"])
+        if block_type not in body:
+            raise MockApiError(400, "validation_error", f"body.{block_type} should be defined")
+        if enforce_limits:
+            check_rich_text_limits({"type": block_type, block_type: body[block_type]})
+        self.check_file_uploads([{"type": block_type, block_type: body[block_type]}])
+        block[block_type] = dict(body[block_type])
+        return {"object": "block", "id": block_id, **block}
+
+    def delete_block(self, block_id: str) -> Dict[str, object]:
+        if block_id not in self.blocks:
+            raise MockApiError(404, "object_not_found", f"block {block_id} not found")
+        siblings = self.children.get(self.parents.get(block_id, ""), [])
+        if block_id in siblings:
+            siblings.remove(block_id)
+        return {"object": "block", "id": block_id, "in_trash": True}
+
+    def create_upload(self, body: Dict[str, object]) -> Dict[str, object]:
+        mode = str(body.get("mode", "single_part"))
+        upload: Dict[str, object] = {"status": "pending", "mode": mode, "size_bytes": 0}
+        if mode == "multi_part":
+            number_of_parts = body.get("number_of_parts")
+            if not isinstance(number_of_parts, int) or not 1 <= number_of_parts <= MAX_PARTS:
+                raise MockApiError(400, "validation_error", f"number_of_parts should be between 1 and {MAX_PARTS}")
+            upload["number_of_parts"] = number_of_parts
+            upload["parts"] = {}
+        elif mode != "single_part":
+            raise MockApiError(400, "validation_error", f"mode {mode} is not supported by the mock")
+        upload_id = str(uuid.uuid4())
+        self.uploads[upload_id] = upload
+        return {"object": "file_upload", "id": upload_id, "status": "pending"}
+
+    def send_upload(self, upload_id: str, fields: Dict[str, bytes], enforce_limits: bool) -> Dict[str, object]:
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise MockApiError(404, "object_not_found", f"file upload {upload_id} not found")
+        if "file" not in fields:
+            raise MockApiError(400, "validation_error", "form field `file` is required")
+        if upload["status"] != "pending":
+            raise MockApiError(400, "validation_error", f"file upload {upload_id} is already {upload['status']}")
+        size = len(fields["file"])
+        self.upload_bytes += size
+        if upload["mode"] == "single_part":
+            if enforce_limits and size > SINGLE_PART_MAX_BYTES:
+                raise MockApiError(400, "validation_error", "files larger than 20 MB need a multi_part upload")
+            upload["size_bytes"] = size
+            upload["status"] = "uploaded"
+            return {"object": "file_upload", "id": upload_id, "status": "uploaded"}
+
+        part_text = fields.get("part_number", b"").decode("ascii", errors="replace")
+        if not part_text.isdigit() or not 1 <= int(part_text) <= int(upload["number_of_parts"]):
+            raise MockApiError(400, "validation_error", f"part_number should be between 1 and {upload['number_of_parts']}")
+        # A re-sent part replaces the earlier copy.
+        upload["parts"][int(part_text)] = size
+        upload["size_bytes"] = sum(upload["parts"].values())
+        return {"object": "file_upload", "id": upload_id, "status": "pending"}
+
+    def complete_upload(self, upload_id: str, enforce_limits: bool) -> Dict[str, object]:
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise MockApiError(404, "object_not_found", f"file upload {upload_id} not found")
+        if upload["mode"] != "multi_part":
+            raise MockApiError(400, "validation_error", "only multi_part uploads can be completed")
+        parts: Dict[int, int] = upload["parts"]
+        number_of_parts = int(upload["number_of_parts"])
+        missing = [number for number in range(1, number_of_parts + 1) if number not in parts]
+        if missing:
+            raise MockApiError(400, "validation_error", f"parts {missing} have not been sent")
+        if enforce_limits and any(parts[number] < MIN_PART_BYTES for number in range(1, number_of_parts)):
+            raise MockApiError(400, "validation_error", "every part except the last should be at least 5 MB")
+        upload["status"] = "uploaded"
+        return {"object": "file_upload", "id": upload_id, "status": "uploaded"}
+
+    def get_upload(self, upload_id: str) -> Dict[str, object]:
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise MockApiError(404, "object_not_found", f"file upload {upload_id} not found")
+        return {"object": "file_upload", "id": upload_id, "status": upload["status"]}
+
+    def page_tree(self, parent_id: str) -> List[Dict[str, object]]:
+        """Blocks under a page or block, with nested children folded back in (as they were sent)."""
+        tree: List[Dict[str, object]] = []
+        for block_id in self.children.get(parent_id, []):
+            block = json.loads(json.dumps(self.blocks[block_id]))
+            nested = self.page_tree(block_id)
+            if nested:
+                block[str(block["type"])]["children"] = nested
+            tree.append(block)
+        return tree
+
+
+class NotionMockServer:
+    """Threaded HTTP server answering Notion API calls from a NotionMockState."""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockConfig()
+        self.state = NotionMockState()
+        self.lock = threading.Lock()
+        self.random = random.Random(self.config.seed)
+        self.counters: Counter = Counter()
+        self.tokens = self.config.rate_burst
+        self.tokens_updated = time.monotonic()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.api_base
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "NotionMockServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, object]:
+        with self.lock:
+            return {
+                **dict(self.counters),
+                "blocks_created": self.state.blocks_created,
+                "upload_bytes": self.state.upload_bytes,
+            }
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.state.blocks_created = 0
+            self.state.upload_bytes = 0
+
+    def page_tree(self, page_id: str) -> List[Dict[str, object]]:
+        with self.lock:
+            return self.state.page_tree(page_id)
+
+    def _take_token(self) -> bool:
+        if self.config.rate_limit <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.config.rate_burst, self.tokens + (now - self.tokens_updated) * self.config.rate_limit)
+        self.tokens_updated = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, object], Dict[str, str]]:
+        """Process one request; returns (status, JSON body, extra headers)."""
+        latency_s = (self.config.latency_ms + self.random.uniform(0.0, self.config.jitter_ms)) / 1000.0
+        if latency_s > 0:
+            time.sleep(latency_s)
+        route_path = path.split("?", 1)[0]
+        if route_path.startswith(API_PREFIX):
+            route_path = route_path[len(API_PREFIX):]
+
+        with self.lock:
+            self.counters["requests"] += 1
+            # Bytes received, including bodies of requests that end up rejected or failed on purpose.
+            self.counters["request_bytes"] += len(body)
+            if not headers.get("authorization", "").startswith("Bearer ") or len(headers["authorization"]) <= 7:
+                self.counters["unauthorized"] += 1
+                return 401, error_body(401, "unauthorized", "API token is invalid."), {}
+            if not self._take_token():
+                self.counters["rate_limited"] += 1
+                return (
+                    429,
+                    error_body(429, "rate_limited", "You have been rate limited. Please try again in a few seconds."),
+                    {"Retry-After": f"{self.config.retry_after_s:g}"},
+                )
+            if self.config.error_rate > 0 and self.random.random() < self.config.error_rate:
+                self.counters["injected_errors"] += 1
+                return self.config.error_status, error_body(self.config.error_status, "service_unavailable", "Injected error."), {}
+
+            for route_method, pattern, name in ROUTES:
+                match = pattern.match(route_path)
+                if route_method != method or not match:
+                    continue
+                self.counters[name] += 1
+                try:
+                    return 200, self._dispatch(name, match.groupdict().get("id", ""), headers, body), {}
+                except MockApiError as exc:
+                    self.counters["rejected"] += 1
+                    return exc.status, error_body(exc.status, exc.code, str(exc)), {}
+            self.counters["not_found"] += 1
+            return 404, error_body(404, "invalid_request_url", f"{method} {path} is not supported by the mock"), {}
+
+    def _dispatch(self, name: str, object_id: str, headers: Dict[str, str], body: bytes) -> Dict[str, object]:
+        state = self.state
+        if name == "send_upload":
+            fields = parse_form_body(headers.get("content-type", ""), body)
+            return state.send_upload(object_id, fields, self.config.enforce_limits)
+        payload = parse_json_body(body)
+        if name == "create_page":
+            return state.create_page(payload)
+        if name == "update_page":
+            return state.update_page(object_id, payload)
+        if name == "list_children":
+            return state.list_children(object_id)
+        if name == "append_children":
+            return state.append_children(object_id, payload, self.config.enforce_limits, len(body))
+        if name == "update_block":
+            return state.update_block(object_id, payload, self.config.enforce_limits)
+        if name == "delete_block":
+            return state.delete_block(object_id)
+        if name == "create_upload":
+            return state.create_upload(payload)
+        if name == "complete_upload":
+            return state.complete_upload(object_id, self.config.enforce_limits)
+        return state.get_upload(object_id)
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                headers = {key.lower(): value for key, value in self.headers.items()}
+                status, payload, extra_headers = server.handle(self.command, self.path, headers, body)
+                encoded = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for key, value in extra_headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _respond
+
+        return Handler
+
+
+def error_body(status: int, code: str, message: str) -> Dict[str, object]:
+    return {"object": "error", "status": status, "code": code, "message": message}
+
+
+def parse_json_body(body: bytes) -> Dict[str, object]:
+    if not body:
+        return {}
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise MockApiError(400, "invalid_json", f"body failed to parse: {exc}") from exc
+    if not isinstance(payload, dict):
+        raise MockApiError(400, "validation_error", "body should be an object")
+    return payload
+
+
+def parse_form_body(content_type: str, body: bytes) -> Dict[str, bytes]:
+    """Fields of a multipart/form-data body (the file upload `send` request)."""
+    if not content_type.startswith("multipart/form-data"):
+        raise MockApiError(400, "validation_error", "send expects multipart/form-data")
+    message = BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields: Dict[str, bytes] = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[str(name)] = part.get_payload(decode=True) or b""
+    return fields
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay added to every response.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay per response.")
+    parser.add_argument("--server-rate-limit", type=float, default=0.0, help="Requests/second before 429s (0 = off).")
+    parser.add_argument("--server-rate-burst", type=float, default=3.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed on purpose.")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-enforce-limits", action="store_true", help="Accept oversized append requests and upload parts.")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.server_rate_limit,
+        rate_burst=args.server_rate_burst,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        enforce_limits=not args.no_enforce_limits,
+        seed=args.seed,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a local Notion API stand-in for offline publishing.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_args(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    server = NotionMockServer(config_from_args(args), host=args.host, port=args.port)
+    print(json.dumps({"api_base": server.api_base}), flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps({"stats": server.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,82 @@
 from __future__ import annotations
 
 import argparse
+import difflib
+import hashlib
 import json
 import math
 import mimetypes
 import os
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from research_common import chunked, ensure_dir, repo_root_from_file, utc_now_iso
+from research_common import ensure_dir, json_dump, repo_root_from_file, sha256_file, utc_now_iso
 
 NOTION_API_BASE = "https://api.notion.com/v1"
 DEFAULT_NOTION_VERSION = "2025-09-03"
-
-HEADING_RE = re.compile(r"^(#{1,3})\s+(.*)$")
-BULLET_RE = re.compile(r"^-\s+(.*)$")
-NUMBERED_RE = re.compile(r"^\d+\.\s+(.*)$")
-IMAGE_MD_RE = re.compile(r"^!\[(.*?)\]\((.*?)\)$")
+DRY_RUN_DIR = "notion_dry_run"
+DRY_RUN_TOKEN_ENV = "NOTION_DRY_RUN_TOKEN"
+
+# One match per (stripped) line classifies it; lines matching no alternative are paragraph text.
+# [![alt](derivative)](original) is a downscaled figure linked to its original; the derivative is uploaded.
+LINE_TOKEN_RE = re.compile(
+    r"(?P<fence>```)(?P<info>.*)"
+    r"|(?P<math>\$\$)"
+    r"|(?P<hashes>#{1,6})\s+(?P<heading>.*)"
+    r"|\[!\[(?P<linked_alt>.*?)\]\((?P<linked_src>.*?)\)\]\((?P<linked_href>.*?)\)$"
+    r"|!\[(?P<alt>.*?)\]\((?P<src>.*?)\)$"
+    r"|-\s+(?P<bullet>.*)"
+    r"|\d+\.\s+(?P<numbered>.*)"
+    r"|(?P<table>\|.*\|)$"
+)
+TABLE_SEPARATOR_RE = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+TABLE_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+# Inline spans, scanned left to right: `code`, **bold**, [text](url) (not images).
+INLINE_RE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\*\*(?P<bold>[^*]+)\*\*"
+    r"|(?<!!)\[(?P<link_text>[^\]]+)\]\((?P<href>[^)\s]+)\)"
+)
+RICH_TEXT_CHUNK = 1800
+RICH_TEXT_MAX_ITEMS = 100
+PARAGRAPH_MAX_CHARS = RICH_TEXT_CHUNK * 8
+# Key on image placeholder blocks emitted by parse_markdown; resolved by UploadPipeline.
+LOCAL_IMAGE_KEY = "_local_image"
+DEFAULT_UPLOAD_CONCURRENCY = 4
+# Notion accepts single-part uploads up to 20 MB; larger files need multi-part with 5-20 MB parts
+# (only the last part may be smaller).
+NOTION_SINGLE_PART_MAX_BYTES = 20 * 1024 * 1024
+NOTION_MIN_PART_BYTES = 5 * 1024 * 1024
+NOTION_MAX_PART_BYTES = 20 * 1024 * 1024
+DEFAULT_MULTI_PART_THRESHOLD_BYTES = 10 * 1024 * 1024
+DEFAULT_PART_BYTES = 8 * 1024 * 1024
+DEFAULT_PART_CONCURRENCY = 3
+# Notion allows an average of three requests per second per integration.
+DEFAULT_RATE_LIMIT = 3.0
+DEFAULT_RATE_BURST = 3.0
+UPLOAD_CACHE_FILE = "notion_upload_cache.json"
+DEFAULT_UPLOAD_CACHE_TTL_HOURS = 24.0 * 30
+# Cached ids older than this are checked with GET /file_uploads/{id} before reuse.
+UPLOAD_CACHE_VALIDATE_AFTER_S = 3600.0
+BLOCK_MANIFEST_FILE = "notion_block_manifest.json"
+BLOCK_MANIFEST_VERSION = 1
+CHECKPOINT_FILE = "notion_publish_checkpoint.json"
+CHECKPOINT_VERSION = 2
+# Per-request limits of the block children endpoint.
+NOTION_MAX_ARRAY_LENGTH = 100
+NOTION_MAX_REQUEST_BLOCKS = 1000
+NOTION_MAX_NESTING = 2
+NOTION_MAX_PAYLOAD_BYTES = 500_000
+# Leave headroom under the 500 KB limit for headers and encoding differences.
+DEFAULT_PAYLOAD_BYTE_CAP = 450_000
 
 
 def notion_headers(token: str, notion_version: str) -> Dict[str, str]:
@@ -34,20 +90,87 @@ def notion_headers(token: str, notion_version: str) -> Dict[str, str]:
     }
 
 
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until the next request may be sent."""
+
+    def __init__(self, rate: float, capacity: float = DEFAULT_RATE_BURST) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.waited_s = 0.0
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait_s = max(self.paused_until - now, (1.0 - self.tokens) / self.rate)
+                self.waited_s += wait_s
+            time.sleep(wait_s)
+
+    def defer(self, seconds: float) -> None:
+        """Server asked us to back off (Retry-After): drain the bucket and pause all senders."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class RateLimitedSession(requests.Session):
+    """Session whose every request first takes a token from the shared bucket."""
+
+    def __init__(self, limiter: Optional[TokenBucket] = None, api_base: str = NOTION_API_BASE) -> None:
+        super().__init__()
+        self.limiter = limiter
+        self.api_base = api_base.rstrip("/")
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return super().request(*args, **kwargs)
+
+
+def make_session(
+    pool_size: int = DEFAULT_UPLOAD_CONCURRENCY,
+    rate_limit: float = DEFAULT_RATE_LIMIT,
+    api_base: str = NOTION_API_BASE,
+) -> RateLimitedSession:
+    """Keep-alive session sized for `pool_size` concurrent requests, throttled to `rate_limit` req/s (0 = off)."""
+    session = RateLimitedSession(TokenBucket(rate_limit) if rate_limit > 0 else None, api_base)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def api_url(session: Optional[requests.Session], path: str) -> str:
+    """`path` under the session's API base; the public Notion API when there is no session."""
+    return f"{getattr(session, 'api_base', NOTION_API_BASE)}{path}"
+
+
 def request_with_retry(
     method: str,
     url: str,
     headers: Dict[str, str],
     json_payload: Optional[Dict[str, object]] = None,
     files: Optional[Dict[str, object]] = None,
+    data: Optional[Dict[str, str]] = None,
     timeout: int = 90,
     max_attempts: int = 6,
+    session: Optional[requests.Session] = None,
 ) -> requests.Response:
+    sender = session if session is not None else requests
     last_error = None
     for attempt in range(1, max_attempts + 1):
         try:
             if files is None:
-                response = requests.request(
+                response = sender.request(
                     method,
                     url,
                     headers=headers,
@@ -57,11 +180,12 @@ def request_with_retry(
             else:
                 # Multipart requests must not force JSON content-type.
                 m_headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
-                response = requests.request(
+                response = sender.request(
                     method,
                     url,
                     headers=m_headers,
                     files=files,
+                    data=data,
                     timeout=timeout,
                 )
         except requests.RequestException as exc:
@@ -72,11 +196,16 @@ def request_with_retry(
 
         if response.status_code in {429, 500, 502, 503, 504} and attempt < max_attempts:
             retry_after = response.headers.get("Retry-After")
-            if retry_after and retry_after.isdigit():
+            if retry_after and retry_after.replace(".", "", 1).isdigit():
                 sleep_s = float(retry_after)
             else:
                 sleep_s = min(45.0, 1.8**attempt)
-            time.sleep(sleep_s)
+            limiter = getattr(session, "limiter", None)
+            if response.status_code == 429 and limiter is not None:
+                # Every thread backs off through the shared bucket, not just this one.
+                limiter.defer(sleep_s)
+            else:
+                time.sleep(sleep_s)
             continue
 
         return response
@@ -89,9 +218,8 @@ def rich_text(text: str) -> List[Dict[str, object]]:
     if not text:
         return []
     chunks = []
-    max_len = 1800
-    for idx in range(0, len(text), max_len):
-        part = text[idx : idx + max_len]
+    for idx in range(0, len(text), RICH_TEXT_CHUNK):
+        part = text[idx : idx + RICH_TEXT_CHUNK]
         chunks.append(
             {
                 "type": "text",
@@ -103,22 +231,127 @@ def rich_text(text: str) -> List[Dict[str, object]]:
     return chunks
 
 
-def paragraph_blocks(text: str) -> List[Dict[str, object]]:
-    blocks: List[Dict[str, object]] = []
+def add_text_items(
+    items: List[Dict[str, object]],
+    content: str,
+    annotations: Optional[Dict[str, bool]] = None,
+    href: Optional[str] = None,
+) -> None:
+    for idx in range(0, len(content), RICH_TEXT_CHUNK):
+        text: Dict[str, object] = {"content": content[idx : idx + RICH_TEXT_CHUNK]}
+        if href:
+            text["link"] = {"url": href}
+        item: Dict[str, object] = {"type": "text", "text": text}
+        if annotations:
+            item["annotations"] = annotations
+        items.append(item)
+
+
+def inline_rich_text(text: str) -> List[Dict[str, object]]:
+    """Rich text with bold, inline code and http(s) links; plain runs match rich_text() exactly."""
     text = text.strip()
-    if not text:
-        return blocks
-    max_para_len = 1800 * 8
-    for idx in range(0, len(text), max_para_len):
-        part = text[idx : idx + max_para_len]
-        blocks.append(
-            {
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {"rich_text": rich_text(part)},
-            }
-        )
-    return blocks
+    if "`" not in text and "*" not in text and "[" not in text:
+        return rich_text(text)
+    items: List[Dict[str, object]] = []
+    pos = 0
+    for match in INLINE_RE.finditer(text):
+        start, end = match.span()
+        if start > pos:
+            add_text_items(items, text[pos:start])
+        kind = match.lastgroup
+        if kind == "href":
+            href = match.group("href")
+            # Notion only accepts absolute URLs; anchors and repo-relative paths stay plain text.
+            add_text_items(items, match.group("link_text"), href=href if href.startswith(("http://", "https://")) else None)
+        else:
+            # The group names double as the Notion annotation names ("code", "bold").
+            add_text_items(items, match.group(kind), {kind: True})
+        pos = end
+    if pos < len(text):
+        add_text_items(items, text[pos:])
+    return items
+
+
+def rich_text_runs(items: Sequence[Dict[str, object]]) -> List[List[Dict[str, object]]]:
+    """Split rich text into runs that each fit one block's rich_text (item count and length limits)."""
+    runs: List[List[Dict[str, object]]] = []
+    current: List[Dict[str, object]] = []
+    current_chars = 0
+    for item in items:
+        size = len(item["text"]["content"])
+        if current and (len(current) == RICH_TEXT_MAX_ITEMS or current_chars + size > PARAGRAPH_MAX_CHARS):
+            runs.append(current)
+            current, current_chars = [], 0
+        current.append(item)
+        current_chars += size
+    if current:
+        runs.append(current)
+    return runs
+
+
+def paragraph_blocks(text: str) -> List[Dict[str, object]]:
+    """Paragraph blocks for one run of text, split to stay within Notion's rich text limits."""
+    return [
+        {"object": "block", "type": "paragraph", "paragraph": {"rich_text": run}}
+        for run in rich_text_runs(inline_rich_text(text))
+    ]
+
+
+def list_item_block(block_type: str, text: str) -> Dict[str, object]:
+    """One list item; text beyond a single rich_text array continues as nested paragraphs."""
+    runs = rich_text_runs(inline_rich_text(text)) or [[]]
+    content: Dict[str, object] = {"rich_text": runs[0]}
+    if len(runs) > 1:
+        content["children"] = [
+            {"object": "block", "type": "paragraph", "paragraph": {"rich_text": run}} for run in runs[1:]
+        ]
+    return {"object": "block", "type": block_type, block_type: content}
+
+
+def capped_rich_text(text: str) -> List[Dict[str, object]]:
+    """Inline rich text for a field that holds exactly one array (headings, table cells).
+
+    Past RICH_TEXT_MAX_ITEMS, the trailing spans are merged into plain text so the text is kept
+    and only their formatting is lost.
+    """
+    items = inline_rich_text(text)
+    if len(items) <= RICH_TEXT_MAX_ITEMS:
+        return items
+    for head in range(RICH_TEXT_MAX_ITEMS - 1, -1, -1):
+        tail: List[Dict[str, object]] = []
+        add_text_items(tail, "".join(str(item["text"]["content"]) for item in items[head:]))
+        if head + len(tail) <= RICH_TEXT_MAX_ITEMS:
+            return items[:head] + tail
+    return tail[:RICH_TEXT_MAX_ITEMS]
+
+
+def split_table_row(line: str) -> List[str]:
+    inner = line.strip()
+    inner = inner[1:] if inner.startswith("|") else inner
+    inner = inner[:-1] if inner.endswith("|") and not inner.endswith("\\|") else inner
+    return [cell.strip().replace("\\|", "|") for cell in TABLE_CELL_SPLIT_RE.split(inner)]
+
+
+def table_block(header: List[str], rows: List[List[str]]) -> Dict[str, object]:
+    width = max(len(row) for row in [header] + rows)
+    table_rows = [
+        {
+            "object": "block",
+            "type": "table_row",
+            "table_row": {"cells": [capped_rich_text(cell) for cell in row + [""] * (width - len(row))]},
+        }
+        for row in [header] + rows
+    ]
+    return {
+        "object": "block",
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": table_rows,
+        },
+    }
 
 
 def language_map(language: str) -> str:
@@ -205,215 +438,174 @@ def language_map(language: str) -> str:
     return "plain text"
 
 
-def parse_markdown(
-    markdown_text: str,
-    markdown_path: Path,
-    repo_root: Path,
-    notion_token: str,
-    notion_version: str,
-    publish_log: List[Dict[str, object]],
-) -> Tuple[List[Dict[str, object]], int, int]:
-    lines = markdown_text.splitlines()
-    blocks: List[Dict[str, object]] = []
-    i = 0
-    heading_count = 0
-    image_count = 0
+MarkdownToken = Tuple[str, Tuple[object, ...]]
 
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
 
-        if stripped == "":
-            i += 1
+def tokenize_markdown(lines: Sequence[str]) -> Iterable[MarkdownToken]:
+    """Single pass over the lines, classifying each with one LINE_TOKEN_RE match.
+
+    Yields ("code", (info, text)), ("equation", (expr,)), ("heading", (level, text)),
+    ("image", (alt, target)), ("bullet", (text,)), ("numbered", (text,)),
+    ("table", (header, rows)) and ("paragraph", (text,)) tokens.
+    """
+    paragraph: List[str] = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        stripped = lines[i].strip()
+        i += 1
+        match = LINE_TOKEN_RE.match(stripped) if stripped else None
+        # lastgroup is the last group closed in the matching alternative, so it names the line kind.
+        kind = match.lastgroup if match is not None else None
+        if kind is None or kind == "table":
+            if match is not None and i < n and TABLE_SEPARATOR_RE.match(lines[i].strip()):
+                if paragraph:
+                    yield "paragraph", (" ".join(paragraph),)
+                    paragraph = []
+                header = split_table_row(stripped)
+                rows: List[List[str]] = []
+                i += 1
+                while i < n and lines[i].strip().startswith("|"):
+                    rows.append(split_table_row(lines[i]))
+                    i += 1
+                yield "table", (header, rows)
+            elif stripped:
+                paragraph.append(stripped)
+            elif paragraph:
+                yield "paragraph", (" ".join(paragraph),)
+                paragraph = []
             continue
 
-        # Fenced code block.
-        if stripped.startswith("```"):
-            language = stripped[3:].strip() or "plain text"
+        if paragraph:
+            yield "paragraph", (" ".join(paragraph),)
+            paragraph = []
+
+        if kind == "info":
             code_lines: List[str] = []
-            i += 1
-            while i < len(lines) and not lines[i].strip().startswith("```"):
+            while i < n and not lines[i].strip().startswith("```"):
                 code_lines.append(lines[i])
                 i += 1
-            if i < len(lines) and lines[i].strip().startswith("```"):
-                i += 1
-            code_text = "\n".join(code_lines)
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "code",
-                    "code": {
-                        "rich_text": rich_text(code_text),
-                        "caption": rich_text("mermaid") if language.strip().lower() == "mermaid" else [],
-                        "language": language_map(language),
-                    },
-                }
-            )
-            continue
-
-        # Equation block $$ ... $$ or multiline between markers.
-        if stripped.startswith("$$"):
+            i += 1
+            yield "code", (match.group("info").strip() or "plain text", "\n".join(code_lines))
+        elif kind == "math":
             if stripped.endswith("$$") and len(stripped) > 4:
-                expr = stripped[2:-2].strip()
-                i += 1
+                expr = stripped[2:-2]
             else:
-                expr_lines: List[str] = []
-                i += 1
-                while i < len(lines) and lines[i].strip() != "$$":
+                expr_lines: List[str] = [stripped[2:]]
+                while i < n and lines[i].strip() != "$$":
                     expr_lines.append(lines[i])
                     i += 1
-                if i < len(lines) and lines[i].strip() == "$$":
-                    i += 1
-                expr = " ".join(clean for clean in expr_lines if clean.strip())
-            expr = expr.strip()
-            if expr:
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "equation",
-                        "equation": {
-                            "expression": expr[:1000],
-                        },
-                    }
-                )
-            continue
-
-        # Heading.
-        hm = HEADING_RE.match(stripped)
-        if hm:
-            level = len(hm.group(1))
-            text = hm.group(2).strip()
-            level = max(1, min(level, 3))
-            block_type = f"heading_{level}"
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": block_type,
-                    block_type: {
-                        "rich_text": rich_text(text),
-                    },
-                }
-            )
-            heading_count += 1
-            i += 1
-            continue
-
-        # Image markdown.
-        im = IMAGE_MD_RE.match(stripped)
-        if im:
-            alt = im.group(1).strip() or "figure"
-            raw_target = im.group(2).strip()
-            image_block = None
-
-            if raw_target.lower().startswith("http://") or raw_target.lower().startswith("https://"):
-                image_block = {
-                    "object": "block",
-                    "type": "image",
-                    "image": {
-                        "type": "external",
-                        "external": {"url": raw_target},
-                        "caption": rich_text(alt),
-                    },
-                }
-                publish_log.append({"event": "image_external", "target": raw_target})
-            else:
-                local_path = (markdown_path.parent / raw_target).resolve()
-                if not local_path.exists():
-                    local_path = (repo_root / raw_target).resolve()
-
-                if local_path.exists():
-                    upload_id = upload_file_to_notion(
-                        local_path,
-                        notion_token,
-                        notion_version,
-                        publish_log,
-                    )
-                    if upload_id:
-                        image_block = {
-                            "object": "block",
-                            "type": "image",
-                            "image": {
-                                "type": "file_upload",
-                                "file_upload": {"id": upload_id},
-                                "caption": rich_text(alt),
-                            },
-                        }
-                    else:
-                        image_block = {
-                            "object": "block",
-                            "type": "paragraph",
-                            "paragraph": {
-                                "rich_text": rich_text(
-                                    f"Image upload failed for local file: {raw_target}"
-                                )
-                            },
-                        }
-                else:
-                    image_block = {
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": rich_text(f"Image file not found: {raw_target}")
-                        },
-                    }
-
-            if image_block is not None:
-                blocks.append(image_block)
-                image_count += 1
+                i += 1
+                expr = " ".join(line for line in expr_lines if line.strip())
+            yield "equation", (expr.strip(),)
+        elif kind == "heading":
+            yield "heading", (min(len(match.group("hashes")), 3), match.group("heading").strip())
+        elif kind == "linked_href":
+            yield "image", (match.group("linked_alt").strip(), match.group("linked_src").strip())
+        elif kind == "src":
+            yield "image", (match.group("alt").strip(), match.group("src").strip())
+        elif kind == "bullet":
+            yield "bullet", (match.group("bullet").strip(),)
+        else:
+            yield "numbered", (match.group("numbered").strip(),)
+    if paragraph:
+        yield "paragraph", (" ".join(paragraph),)
+
+
+def image_block(
+    alt: str,
+    raw_target: str,
+    search_dirs: Sequence[str],
+    publish_log: List[Dict[str, object]],
+) -> Dict[str, object]:
+    """Image block for a markdown image; local targets are looked up in `search_dirs` (resolved, in order)."""
+    alt = alt or "figure"
+    if raw_target.lower().startswith(("http://", "https://")):
+        publish_log.append({"event": "image_external", "target": raw_target})
+        return {
+            "object": "block",
+            "type": "image",
+            "image": {
+                "type": "external",
+                "external": {"url": raw_target},
+                "caption": rich_text(alt),
+            },
+        }
+    # normpath on pre-resolved directories instead of Path.resolve() per image: one stat, not one per component.
+    local_path = next(
+        (
+            candidate
+            for candidate in (os.path.normpath(os.path.join(directory, raw_target)) for directory in search_dirs)
+            if os.path.exists(candidate)
+        ),
+        None,
+    )
+    if local_path is None:
+        return {
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {"rich_text": rich_text(f"Image file not found: {raw_target}")},
+        }
+    return {
+        "object": "block",
+        "type": "image",
+        "image": {
+            "type": "file_upload",
+            "file_upload": {"id": ""},
+            "caption": rich_text(alt),
+        },
+        LOCAL_IMAGE_KEY: {"path": local_path, "target": raw_target},
+    }
 
-            i += 1
-            continue
 
-        # Bullet list.
-        bm = BULLET_RE.match(stripped)
-        if bm:
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": rich_text(bm.group(1).strip()),
-                    },
-                }
-            )
-            i += 1
-            continue
+def parse_markdown(
+    markdown_text: str,
+    markdown_path: Path,
+    repo_root: Path,
+    publish_log: List[Dict[str, object]],
+) -> Tuple[List[Dict[str, object]], int, int]:
+    """Convert markdown to Notion blocks without any network I/O.
 
-        # Numbered list.
-        nm = NUMBERED_RE.match(stripped)
-        if nm:
+    Local images become placeholder blocks (see LOCAL_IMAGE_KEY) that UploadPipeline
+    resolves to uploaded files once every target is known.
+    """
+    blocks: List[Dict[str, object]] = []
+    heading_count = 0
+    image_count = 0
+    search_dirs = [str(markdown_path.parent.resolve()), str(repo_root.resolve())]
+
+    for kind, args in tokenize_markdown(markdown_text.splitlines()):
+        if kind == "paragraph":
+            blocks.extend(paragraph_blocks(str(args[0])))
+        elif kind == "bullet" or kind == "numbered":
+            block_type = "bulleted_list_item" if kind == "bullet" else "numbered_list_item"
+            blocks.append(list_item_block(block_type, str(args[0])))
+        elif kind == "heading":
+            level, text = args
+            block_type = f"heading_{level}"
+            blocks.append({"object": "block", "type": block_type, block_type: {"rich_text": capped_rich_text(str(text))}})
+            heading_count += 1
+        elif kind == "image":
+            blocks.append(image_block(str(args[0]), str(args[1]), search_dirs, publish_log))
+            image_count += 1
+        elif kind == "table":
+            blocks.append(table_block(list(args[0]), list(args[1])))
+        elif kind == "equation":
+            if args[0]:
+                blocks.append({"object": "block", "type": "equation", "equation": {"expression": str(args[0])[:1000]}})
+        else:
+            language, code_text = args
             blocks.append(
                 {
                     "object": "block",
-                    "type": "numbered_list_item",
-                    "numbered_list_item": {
-                        "rich_text": rich_text(nm.group(1).strip()),
+                    "type": "code",
+                    "code": {
+                        "rich_text": rich_text(str(code_text)),
+                        "caption": rich_text("mermaid") if str(language).strip().lower() == "mermaid" else [],
+                        "language": language_map(str(language)),
                     },
                 }
             )
-            i += 1
-            continue
-
-        # Paragraph/table fallback: collect contiguous plain lines.
-        para_lines = [stripped]
-        i += 1
-        while i < len(lines):
-            nxt = lines[i].strip()
-            if not nxt:
-                break
-            if nxt.startswith("```"):
-                break
-            if nxt.startswith("#"):
-                break
-            if BULLET_RE.match(nxt) or NUMBERED_RE.match(nxt) or IMAGE_MD_RE.match(nxt):
-                break
-            if nxt.startswith("$$"):
-                break
-            para_lines.append(nxt)
-            i += 1
-
-        paragraph_text = " ".join(para_lines)
-        blocks.extend(paragraph_blocks(paragraph_text))
 
     return blocks, heading_count, image_count
 
@@ -423,8 +615,9 @@ def create_child_page(
     title: str,
     token: str,
     notion_version: str,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, object]:
-    url = f"{NOTION_API_BASE}/pages"
+    url = api_url(session, "/pages")
     headers = notion_headers(token, notion_version)
     payload = {
         "parent": {"page_id": parent_page_id},
@@ -441,30 +634,195 @@ def create_child_page(
             }
         },
     }
-    response = request_with_retry("POST", url, headers, json_payload=payload)
+    response = request_with_retry("POST", url, headers, json_payload=payload, session=session)
     if response.status_code >= 300:
         raise RuntimeError(f"failed to create page: {response.status_code} {response.text[:400]}")
     return response.json()
 
 
+def block_children(block: Dict[str, object]) -> List[Dict[str, object]]:
+    content = block.get(str(block.get("type", "")))
+    children = content.get("children") if isinstance(content, dict) else None
+    return children if isinstance(children, list) else []
+
+
+def iter_blocks(blocks: Sequence[Dict[str, object]]) -> Iterable[Dict[str, object]]:
+    """Every block in document order, including nested children."""
+    for block in blocks:
+        yield block
+        yield from iter_blocks(block_children(block))
+
+
+def count_blocks(blocks: Sequence[Dict[str, object]]) -> int:
+    return sum(1 for _ in iter_blocks(blocks))
+
+
+def nest_sections(blocks: List[Dict[str, object]], level: int) -> List[Dict[str, object]]:
+    """Fold everything under each heading of `level` into that heading as a toggleable container.
+
+    A section runs until the next heading of the same or a higher level. Level 0 leaves the page flat.
+    """
+    if level not in (1, 2, 3):
+        return blocks
+    nested: List[Dict[str, object]] = []
+    section: Optional[List[Dict[str, object]]] = None
+    for block in blocks:
+        block_type = str(block.get("type", ""))
+        if block_type.startswith("heading_"):
+            block_level = int(block_type[-1])
+            if block_level <= level:
+                section = None
+            if block_level == level:
+                nested.append(block)
+                section = []
+                block[block_type]["is_toggleable"] = True
+                block[block_type]["children"] = section
+                continue
+        (section if section is not None else nested).append(block)
+    for block in nested:
+        if block_children(block) == [] and "children" in block.get(str(block.get("type")), {}):
+            del block[str(block["type"])]["children"]
+    return nested
+
+
+def payload_bytes(obj: object) -> int:
+    # requests serializes json= payloads with ASCII escapes, so measure the same way.
+    return len(json.dumps(obj))
+
+
+def split_inline_children(
+    block: Dict[str, object],
+    byte_cap: int,
+) -> Tuple[Dict[str, object], List[Dict[str, object]]]:
+    """Copy of `block` carrying as many children as one request may nest, plus the overflow.
+
+    Inline children must be leaves: only first-level ids come back from an append, so a nested
+    block that still needs its own follow-up request would have no id to append to.
+    """
+    children = block_children(block)
+    if not children:
+        return block, []
+    block_type = str(block["type"])
+    inline: List[Dict[str, object]] = []
+    size = payload_bytes({**block, block_type: {**block[block_type], "children": []}})
+    for child in children:
+        if block_children(child) or len(inline) == NOTION_MAX_ARRAY_LENGTH:
+            break
+        child_size = payload_bytes(child) + 1
+        if size + child_size > byte_cap:
+            break
+        inline.append(child)
+        size += child_size
+    trimmed = {**block, block_type: {**block[block_type], "children": inline}}
+    if not inline:
+        del trimmed[block_type]["children"]
+    return trimmed, children[len(inline):]
+
+
+AppendRequest = Tuple[Optional[Tuple[int, int]], List[Dict[str, object]]]
+
+
+def plan_append_requests(
+    blocks: Sequence[Dict[str, object]],
+    byte_cap: int = DEFAULT_PAYLOAD_BYTE_CAP,
+) -> List[AppendRequest]:
+    """Pack blocks into as few append requests as Notion's per-request limits allow.
+
+    Each request is (parent, children). A parent of None is the page itself; (request_index,
+    position) is a container created by an earlier request, whose remaining children did not fit
+    inline (more than 100, deeper than two levels, or over the block/byte budget). Requests are in
+    a valid execution order: every parent is created before its follow-ups.
+    """
+    requests_out: List[AppendRequest] = []
+
+    def emit(parent: Optional[Tuple[int, int]], items: Sequence[Dict[str, object]]) -> None:
+        batch: List[Dict[str, object]] = []
+        overflow: List[Tuple[int, List[Dict[str, object]]]] = []
+        nodes = 0
+        size = payload_bytes({"children": []})
+
+        def flush() -> None:
+            nonlocal batch, overflow, nodes, size
+            if not batch:
+                return
+            requests_out.append((parent, batch))
+            request_index = len(requests_out) - 1
+            pending, batch, overflow = overflow, [], []
+            nodes, size = 0, payload_bytes({"children": []})
+            for position, rest in pending:
+                emit((request_index, position), rest)
+
+        for item in items:
+            trimmed, rest = split_inline_children(item, byte_cap)
+            item_nodes = count_blocks([trimmed])
+            item_size = payload_bytes(trimmed) + 1
+            if batch and (
+                len(batch) == NOTION_MAX_ARRAY_LENGTH
+                or nodes + item_nodes > NOTION_MAX_REQUEST_BLOCKS
+                or size + item_size > byte_cap
+            ):
+                flush()
+            if rest:
+                overflow.append((len(batch), rest))
+            batch.append(trimmed)
+            nodes += item_nodes
+            size += item_size
+        flush()
+
+    emit(None, list(blocks))
+    return requests_out
+
+
 def append_blocks(
     block_id: str,
     blocks: Sequence[Dict[str, object]],
     token: str,
     notion_version: str,
     publish_log: List[Dict[str, object]],
-) -> None:
+    session: Optional[requests.Session] = None,
+    after: Optional[str] = None,
+    acked: Optional[List[List[str]]] = None,
+    on_chunk: Optional[Callable[[int, List[str]], None]] = None,
+    byte_cap: int = DEFAULT_PAYLOAD_BYTE_CAP,
+    before_send: Optional[Callable[[List[Dict[str, object]]], None]] = None,
+) -> List[str]:
+    """Append blocks (optionally after an existing child) and return the top-level block ids in order.
+
+    Requests come from plan_append_requests. `acked` holds the result ids of requests an earlier
+    run already completed; those are skipped. `on_chunk` is called with the request index and its
+    result ids after each request is accepted. `before_send` gets each batch just before it is sent
+    (UploadPipeline.resolve patches image upload ids in there).
+    """
     headers = notion_headers(token, notion_version)
-    url = f"{NOTION_API_BASE}/blocks/{block_id}/children"
+    plan = plan_append_requests(blocks, byte_cap)
+    results: List[List[str]] = list(acked or [])
+    top_level_ids: List[str] = [
+        block_id for (parent, _), ids in zip(plan, results) if parent is None for block_id in ids
+    ]
+    if after and top_level_ids:
+        after = top_level_ids[-1]
+    publish_log.append(
+        {"event": "append_plan", "requests": len(plan), "blocks": count_blocks(blocks), "top_level_blocks": len(blocks)}
+    )
 
-    for chunk_idx, chunk in enumerate(chunked(list(blocks), 100), start=1):
-        payload = {"children": list(chunk)}
-        response = request_with_retry("PATCH", url, headers, json_payload=payload)
+    for chunk_idx, (parent, chunk) in enumerate(plan, start=1):
+        if chunk_idx <= len(results):
+            continue
+        target_id = block_id if parent is None else results[parent[0]][parent[1]]
+        url = api_url(session, f"/blocks/{target_id}/children")
+        if before_send is not None:
+            before_send(chunk)
+        payload: Dict[str, object] = {"children": list(chunk)}
+        if after and parent is None:
+            payload["after"] = after
+        response = request_with_retry("PATCH", url, headers, json_payload=payload, session=session)
         publish_log.append(
             {
                 "event": "append_chunk",
                 "chunk_index": chunk_idx,
                 "chunk_size": len(chunk),
+                "chunk_blocks": count_blocks(chunk),
+                "nested": parent is not None,
                 "status_code": response.status_code,
             }
         )
@@ -472,6 +830,254 @@ def append_blocks(
             raise RuntimeError(
                 f"append blocks failed at chunk {chunk_idx}: {response.status_code} {response.text[:400]}"
             )
+        response_ids = [str(item.get("id", "")) for item in response.json().get("results", []) if isinstance(item, dict)]
+        chunk_ids = response_ids[-len(chunk):]
+        results.append(chunk_ids)
+        if parent is None:
+            top_level_ids.extend(chunk_ids)
+            if after and chunk_ids:
+                after = chunk_ids[-1]
+        if on_chunk is not None:
+            on_chunk(chunk_idx, chunk_ids)
+    return top_level_ids
+
+
+def digest_view(block: Dict[str, object]) -> Dict[str, object]:
+    """Block as hashed: local images (at any depth) stand in by file content, not by upload id."""
+    content = {key: value for key, value in block.items() if key != LOCAL_IMAGE_KEY}
+    local = block.get(LOCAL_IMAGE_KEY)
+    if isinstance(local, dict):
+        path = Path(str(local["path"]))
+        content["image"] = {"file_sha256": sha256_file(path) if path.exists() else "", "target": local["target"]}
+    children = block_children(block)
+    if children:
+        block_type = str(block["type"])
+        content[block_type] = {**block[block_type], "children": [digest_view(child) for child in children]}
+    return content
+
+
+def block_digest(block: Dict[str, object]) -> str:
+    encoded = json.dumps(digest_view(block), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def load_block_manifest(path: Path) -> Optional[Dict[str, object]]:
+    if not path.exists():
+        return None
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(manifest, dict) or not manifest.get("page_id") or not isinstance(manifest.get("blocks"), list):
+        return None
+    return manifest
+
+
+def block_is_updatable(old_entry: Dict[str, object], block: Dict[str, object]) -> bool:
+    """PATCH /blocks/{id} can change a block's content in place, but not its type or nested children.
+
+    A published block that has children (e.g. a toggle heading from nest_sections) would keep them
+    after a PATCH, so it is replaced instead. Manifests written before `has_children` was recorded
+    assume any heading or toggle may have children.
+    """
+    old_type = str(old_entry.get("type", ""))
+    old_has_children = old_entry.get("has_children", old_type.startswith("heading_") or old_type == "toggle")
+    content = block.get(str(block.get("type")))
+    return (
+        block.get("type") == old_type
+        and not old_has_children
+        and isinstance(content, dict)
+        and "children" not in content
+    )
+
+
+def trash_page(page_id: str, token: str, notion_version: str, session: Optional[requests.Session] = None) -> None:
+    url = api_url(session, f"/pages/{page_id}")
+    response = request_with_retry(
+        "PATCH", url, notion_headers(token, notion_version), json_payload={"in_trash": True}, session=session
+    )
+    if response.status_code >= 300 and response.status_code != 404:
+        raise RuntimeError(f"failed to trash page {page_id}: {response.status_code} {response.text[:400]}")
+
+
+def delete_block(block_id: str, token: str, notion_version: str, session: Optional[requests.Session] = None) -> None:
+    url = api_url(session, f"/blocks/{block_id}")
+    response = request_with_retry("DELETE", url, notion_headers(token, notion_version), session=session)
+    # Already gone (e.g. removed by hand in Notion) is as good as deleted.
+    if response.status_code >= 300 and response.status_code != 404:
+        raise RuntimeError(f"failed to delete block {block_id}: {response.status_code} {response.text[:400]}")
+
+
+def update_block(
+    block_id: str,
+    block: Dict[str, object],
+    token: str,
+    notion_version: str,
+    session: Optional[requests.Session] = None,
+) -> None:
+    block_type = str(block["type"])
+    url = api_url(session, f"/blocks/{block_id}")
+    payload = {block_type: block[block_type]}
+    response = request_with_retry("PATCH", url, notion_headers(token, notion_version), json_payload=payload, session=session)
+    if response.status_code >= 300:
+        raise RuntimeError(f"failed to update block {block_id}: {response.status_code} {response.text[:400]}")
+
+
+def plan_block_diff(
+    old_blocks: Sequence[Dict[str, object]],
+    new_hashes: Sequence[str],
+    new_blocks: Sequence[Dict[str, object]],
+) -> List[Tuple[str, object]]:
+    """Diff the previously published blocks against the new parse.
+
+    Returns ordered operations: ("keep", old_index), ("update", (old_index, new_index)),
+    ("delete", old_index) and ("insert", [new_index, ...]). Inserts go after the block placed
+    just before them, so the operations must be applied in order.
+    """
+    old_hashes = [str(entry.get("hash", "")) for entry in old_blocks]
+    # Failed image uploads are recorded with an empty hash so they never match and get retried.
+    matcher = difflib.SequenceMatcher(None, old_hashes, list(new_hashes), autojunk=False)
+    ops: List[Tuple[str, object]] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.extend(("keep", old_index) for old_index in range(i1, i2))
+            continue
+        inserts: List[int] = []
+        old_indices = list(range(i1, i2))
+        for new_index in range(j1, j2):
+            if old_indices and not inserts and block_is_updatable(old_blocks[old_indices[0]], new_blocks[new_index]):
+                ops.append(("update", (old_indices.pop(0), new_index)))
+            else:
+                inserts.append(new_index)
+        ops.extend(("delete", old_index) for old_index in old_indices)
+        if inserts:
+            ops.append(("insert", inserts))
+    return ops
+
+
+def diff_needs_rebuild(ops: Sequence[Tuple[str, object]]) -> bool:
+    """Blocks inserted before every surviving block have no `after` anchor; the page must be recreated."""
+    for kind, _ in ops:
+        if kind in ("keep", "update"):
+            return False
+        if kind == "insert":
+            return any(other in ("keep", "update") for other, _ in ops)
+    return False
+
+
+def apply_block_diff(
+    page_id: str,
+    old_blocks: Sequence[Dict[str, object]],
+    ops: Sequence[Tuple[str, object]],
+    blocks: Sequence[Dict[str, object]],
+    token: str,
+    notion_version: str,
+    publish_log: List[Dict[str, object]],
+    session: Optional[requests.Session] = None,
+    byte_cap: int = DEFAULT_PAYLOAD_BYTE_CAP,
+    before_send: Optional[Callable[[List[Dict[str, object]]], None]] = None,
+) -> Tuple[List[Optional[str]], Dict[str, int]]:
+    """Send the diff operations in order; returns the Notion id of every new block and op counts."""
+    block_ids: List[Optional[str]] = [None] * len(blocks)
+    stats = {"kept": 0, "updated": 0, "deleted": 0, "inserted": 0}
+    anchor: Optional[str] = None
+    keep_cursor = 0
+    for kind, arg in ops:
+        if kind == "delete":
+            delete_block(str(old_blocks[int(arg)]["id"]), token, notion_version, session=session)
+            stats["deleted"] += 1
+            continue
+        if kind == "insert":
+            new_indices = list(arg)
+            created = append_blocks(
+                page_id,
+                [blocks[index] for index in new_indices],
+                token,
+                notion_version,
+                publish_log,
+                session=session,
+                after=anchor,
+                byte_cap=byte_cap,
+                before_send=before_send,
+            )
+            if len(created) != len(new_indices):
+                raise RuntimeError("append response did not return an id for every inserted block")
+            for index, block_id in zip(new_indices, created):
+                block_ids[index] = block_id
+            anchor = created[-1]
+            keep_cursor = new_indices[-1] + 1
+            stats["inserted"] += len(new_indices)
+            continue
+        if kind == "update":
+            old_index, new_index = arg
+            if before_send is not None:
+                before_send([blocks[new_index]])
+            update_block(str(old_blocks[old_index]["id"]), blocks[new_index], token, notion_version, session=session)
+            stats["updated"] += 1
+        else:
+            old_index, new_index = int(arg), keep_cursor
+            stats["kept"] += 1
+        anchor = str(old_blocks[old_index]["id"])
+        block_ids[new_index] = anchor
+        keep_cursor = new_index + 1
+    publish_log.append({"event": "block_diff", **stats})
+    return block_ids, stats
+
+
+@dataclass(frozen=True)
+class MultiPartSettings:
+    """When and how files are split into a Notion multi-part upload."""
+
+    threshold_bytes: int = DEFAULT_MULTI_PART_THRESHOLD_BYTES
+    part_bytes: int = DEFAULT_PART_BYTES
+    concurrency: int = DEFAULT_PART_CONCURRENCY
+
+    def part_count(self, size: int) -> int:
+        """Number of parts for a file of `size` bytes; 0 means a single-part upload."""
+        if size <= self.threshold_bytes:
+            return 0
+        return math.ceil(size / self.part_bytes)
+
+
+def send_file_parts(
+    file_path: Path,
+    upload_id: str,
+    part_count: int,
+    mime_type: str,
+    headers: Dict[str, str],
+    settings: MultiPartSettings,
+    publish_log: List[Dict[str, object]],
+    session: Optional[requests.Session] = None,
+) -> bool:
+    """Send the parts of a multi-part upload in parallel; each part is retried on its own."""
+
+    def send_part(part_number: int) -> bool:
+        with file_path.open("rb") as handle:
+            handle.seek((part_number - 1) * settings.part_bytes)
+            content = handle.read(settings.part_bytes)
+        response = request_with_retry(
+            "POST",
+            api_url(session, f"/file_uploads/{upload_id}/send"),
+            headers,
+            files={"file": (file_path.name, content, mime_type)},
+            data={"part_number": str(part_number)},
+            timeout=180,
+            session=session,
+        )
+        publish_log.append(
+            {
+                "event": "file_upload_part",
+                "file": str(file_path),
+                "upload_id": upload_id,
+                "part_number": part_number,
+                "bytes": len(content),
+                "status_code": response.status_code,
+            }
+        )
+        return response.status_code < 300
+
+    with ThreadPoolExecutor(max_workers=max(1, min(settings.concurrency, part_count))) as pool:
+        return all(list(pool.map(send_part, range(1, part_count + 1))))
 
 
 def upload_file_to_notion(
@@ -479,20 +1085,37 @@ def upload_file_to_notion(
     token: str,
     notion_version: str,
     publish_log: List[Dict[str, object]],
+    session: Optional[requests.Session] = None,
+    multi_part: Optional[MultiPartSettings] = None,
 ) -> Optional[str]:
     headers = notion_headers(token, notion_version)
+    settings = multi_part or MultiPartSettings()
+    size = file_path.stat().st_size
+    part_count = settings.part_count(size)
+    mime_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
 
     # 1) Create upload object.
+    create_payload: Dict[str, object] = {}
+    if part_count:
+        create_payload = {
+            "mode": "multi_part",
+            "number_of_parts": part_count,
+            "filename": file_path.name,
+            "content_type": mime_type,
+        }
     create_resp = request_with_retry(
         "POST",
-        f"{NOTION_API_BASE}/file_uploads",
+        api_url(session, "/file_uploads"),
         headers,
-        json_payload={},
+        json_payload=create_payload,
+        session=session,
     )
     publish_log.append(
         {
             "event": "file_upload_create",
             "file": str(file_path),
+            "bytes": size,
+            "parts": part_count,
             "status_code": create_resp.status_code,
         }
     )
@@ -504,33 +1127,37 @@ def upload_file_to_notion(
     if not upload_id:
         return None
 
-    # 2) Send binary content.
-    mime_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
-    with file_path.open("rb") as handle:
+    if not part_count:
+        # 2) Single part: send the whole file. Bytes rather than a file handle, so a retry
+        # re-sends the content instead of an exhausted stream.
         send_resp = request_with_retry(
             "POST",
-            f"{NOTION_API_BASE}/file_uploads/{upload_id}/send",
+            api_url(session, f"/file_uploads/{upload_id}/send"),
             headers,
-            files={"file": (file_path.name, handle, mime_type)},
+            files={"file": (file_path.name, file_path.read_bytes(), mime_type)},
             timeout=180,
+            session=session,
         )
-    publish_log.append(
-        {
-            "event": "file_upload_send",
-            "file": str(file_path),
-            "upload_id": upload_id,
-            "status_code": send_resp.status_code,
-        }
-    )
-    if send_resp.status_code >= 300:
-        return None
+        publish_log.append(
+            {
+                "event": "file_upload_send",
+                "file": str(file_path),
+                "upload_id": upload_id,
+                "status_code": send_resp.status_code,
+            }
+        )
+        # Single-part uploads are complete once sent.
+        return str(upload_id) if send_resp.status_code < 300 else None
 
-    # 3) Complete upload (if endpoint is supported for the current account/version).
+    # 2) Multi-part: send every part, then 3) complete the upload.
+    if not send_file_parts(file_path, str(upload_id), part_count, mime_type, headers, settings, publish_log, session):
+        return None
     complete_resp = request_with_retry(
         "POST",
-        f"{NOTION_API_BASE}/file_uploads/{upload_id}/complete",
+        api_url(session, f"/file_uploads/{upload_id}/complete"),
         headers,
         json_payload={},
+        session=session,
     )
     publish_log.append(
         {
@@ -540,13 +1167,318 @@ def upload_file_to_notion(
             "status_code": complete_resp.status_code,
         }
     )
+    return str(upload_id) if complete_resp.status_code < 300 else None
+
+
+class UploadCache:
+    """Persistent map of file content hash -> Notion file_upload id, shared by upload threads."""
+
+    def __init__(self, path: Path, ttl_hours: float = DEFAULT_UPLOAD_CACHE_TTL_HOURS) -> None:
+        self.path = path
+        self.ttl_s = ttl_hours * 3600.0
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, object]] = {}
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.entries = data.get("entries", {}) if isinstance(data, dict) else {}
+        self.stats = {"lookups": 0, "hits": 0, "stale": 0, "validated": 0, "bytes_saved": 0, "bytes_sent": 0}
+
+    def lookup(self, digest: str) -> Optional[Dict[str, object]]:
+        """Cached entry for a content hash, unless it is past the TTL."""
+        with self.lock:
+            self.stats["lookups"] += 1
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            if time.time() - float(entry.get("uploaded_at", 0)) > self.ttl_s:
+                del self.entries[digest]
+                return None
+            return dict(entry)
+
+    def hit(self, digest: str, size: int, validated: bool) -> None:
+        with self.lock:
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += size
+            if validated and digest in self.entries:
+                self.stats["validated"] += 1
+                self.entries[digest]["validated_at"] = time.time()
+
+    def drop(self, digest: str) -> None:
+        with self.lock:
+            self.stats["stale"] += 1
+            self.entries.pop(digest, None)
+
+    def put(self, digest: str, upload_id: str, file_path: Path, size: int) -> None:
+        now = time.time()
+        with self.lock:
+            self.stats["bytes_sent"] += size
+            self.entries[digest] = {
+                "upload_id": upload_id,
+                "file": str(file_path),
+                "size_bytes": size,
+                "uploaded_at": now,
+                "validated_at": now,
+            }
+
+    def save(self) -> None:
+        ensure_dir(self.path.parent)
+        payload = {"generated_at_utc": utc_now_iso(), "entries": self.entries}
+        self.path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def summary_line(self) -> str:
+        lookups = self.stats["lookups"]
+        rate = 100.0 * self.stats["hits"] / lookups if lookups else 0.0
+        return (
+            f"[ok] upload cache | hits={self.stats['hits']}/{lookups} ({rate:.0f}%) "
+            f"| stale={self.stats['stale']} | validated={self.stats['validated']} "
+            f"| bytes_not_sent={self.stats['bytes_saved']} | bytes_sent={self.stats['bytes_sent']}"
+        )
+
+
+class PublishCheckpoint:
+    """Progress of a page being built: page id, acknowledged append chunks and image upload ids.
+
+    Saved after every accepted chunk so an interrupted publish can continue with --resume instead
+    of orphaning the half-built page. Removed once the publish completes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        markdown_sha256: str,
+        plan_settings: Dict[str, object],
+        state: Optional[Dict[str, object]] = None,
+    ) -> None:
+        self.path = path
+        self.state: Dict[str, object] = state or {
+            "version": CHECKPOINT_VERSION,
+            "markdown_sha256": markdown_sha256,
+            # The request plan is deterministic for the same markdown and settings.
+            "plan": plan_settings,
+            "page_id": "",
+            "page_url": "",
+            "acked_requests": [],
+            "upload_ids": {},
+        }
+
+    @classmethod
+    def load(cls, path: Path, markdown_sha256: str, plan_settings: Dict[str, object]) -> Optional["PublishCheckpoint"]:
+        if not path.exists():
+            return None
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("version") != CHECKPOINT_VERSION or state.get("plan") != plan_settings:
+            raise SystemExit(f"incompatible publish checkpoint: {path}; rerun without --resume")
+        if state.get("markdown_sha256") != markdown_sha256:
+            raise SystemExit(f"markdown changed since the checkpoint was written: {path}; rerun without --resume")
+        return cls(path, markdown_sha256, plan_settings, state)
+
+    @property
+    def page_id(self) -> str:
+        return str(self.state.get("page_id", ""))
+
+    @property
+    def acked_requests(self) -> List[List[str]]:
+        return [[str(block_id) for block_id in ids] for ids in self.state.get("acked_requests", [])]
+
+    @property
+    def upload_ids(self) -> Dict[str, str]:
+        return {str(path): str(upload_id) for path, upload_id in dict(self.state.get("upload_ids", {})).items()}
+
+    def set_page(self, page_id: str, page_url: str) -> None:
+        self.state.update({"page_id": page_id, "page_url": page_url, "acked_requests": []})
+        self.save()
+
+    def set_uploads(self, upload_ids: Dict[str, str]) -> None:
+        self.state["upload_ids"] = dict(sorted(upload_ids.items()))
+        self.save()
+
+    def ack_chunk(self, chunk_index: int, block_ids: List[str], upload_ids: Optional[Dict[str, str]] = None) -> None:
+        acked = self.acked_requests
+        if len(acked) != chunk_index - 1:
+            raise RuntimeError(f"checkpoint out of order: chunk {chunk_index} after {len(acked)}")
+        self.state["acked_requests"] = acked + [block_ids]
+        if upload_ids is not None:
+            self.state["upload_ids"] = dict(sorted(upload_ids.items()))
+        self.save()
+
+    def save(self) -> None:
+        # Write-then-rename so a crash mid-save never leaves a torn checkpoint behind.
+        ensure_dir(self.path.parent)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({**self.state, "updated_at_utc": utc_now_iso()}, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def file_upload_is_valid(
+    upload_id: str,
+    token: str,
+    notion_version: str,
+    session: Optional[requests.Session] = None,
+) -> bool:
+    """True when Notion still reports the upload as usable."""
+    response = request_with_retry(
+        "GET",
+        api_url(session, f"/file_uploads/{upload_id}"),
+        notion_headers(token, notion_version),
+        max_attempts=3,
+        session=session,
+    )
+    if response.status_code >= 300:
+        return False
+    return str(response.json().get("status", "")) == "uploaded"
+
+
+class UploadPipeline:
+    """Upload stage of a publish: images upload in the background while blocks are being sent.
+
+    Every distinct local image is queued on a thread pool in document order as soon as the
+    pipeline is created. The send stage calls resolve() on each batch just before sending it,
+    which waits only for the images inside that batch and patches in their upload ids, so the
+    first sections go out while later images are still uploading.
+    """
+
+    def __init__(
+        self,
+        blocks: Sequence[Dict[str, object]],
+        token: str,
+        notion_version: str,
+        publish_log: List[Dict[str, object]],
+        session: Optional[requests.Session] = None,
+        concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+        cache: Optional[UploadCache] = None,
+        known_uploads: Optional[Dict[str, str]] = None,
+        multi_part: Optional[MultiPartSettings] = None,
+    ) -> None:
+        self.token = token
+        self.notion_version = notion_version
+        self.publish_log = publish_log
+        self.session = session
+        self.cache = cache
+        self.multi_part = multi_part
+        self.lock = threading.Lock()
+        self.known: Dict[str, str] = dict(known_uploads or {})
+        self.pending = [block for block in iter_blocks(blocks) if LOCAL_IMAGE_KEY in block]
+        self.failed = 0
+        self.wait_s = 0.0
+        paths = list(dict.fromkeys(str(block[LOCAL_IMAGE_KEY]["path"]) for block in self.pending))
+        self.pool = ThreadPoolExecutor(max_workers=max(1, concurrency)) if paths else None
+        self.futures: Dict[str, Future] = {path: self.pool.submit(self._upload, path) for path in paths}
+
+    def _upload(self, path: str) -> Optional[str]:
+        with self.lock:
+            if path in self.known:
+                return self.known[path]
+        upload_id = self._upload_or_reuse(path)
+        if upload_id:
+            with self.lock:
+                self.known[path] = upload_id
+        return upload_id
+
+    def _upload_or_reuse(self, path: str) -> Optional[str]:
+        file_path = Path(path)
+        cache = self.cache
+        if cache is None:
+            return upload_file_to_notion(
+                file_path, self.token, self.notion_version, self.publish_log, self.session, self.multi_part
+            )
 
-    if complete_resp.status_code >= 300 and complete_resp.status_code != 404:
-        # Some Notion workspaces may auto-complete single-part upload;
-        # keep upload id if send succeeded.
-        pass
+        digest = sha256_file(file_path)
+        size = file_path.stat().st_size
+        entry = cache.lookup(digest)
+        if entry is not None:
+            upload_id = str(entry["upload_id"])
+            fresh = time.time() - float(entry.get("validated_at", 0)) < UPLOAD_CACHE_VALIDATE_AFTER_S
+            if fresh or file_upload_is_valid(upload_id, self.token, self.notion_version, session=self.session):
+                cache.hit(digest, size, validated=not fresh)
+                self.publish_log.append({"event": "file_upload_cached", "file": path, "upload_id": upload_id})
+                return upload_id
+            cache.drop(digest)
+            self.publish_log.append({"event": "file_upload_stale", "file": path, "upload_id": upload_id})
+
+        upload_id = upload_file_to_notion(
+            file_path, self.token, self.notion_version, self.publish_log, self.session, self.multi_part
+        )
+        if upload_id:
+            cache.put(digest, upload_id, file_path, size)
+        return upload_id
+
+    def resolve(self, blocks: Sequence[Dict[str, object]]) -> None:
+        """Wait for the images inside `blocks` and patch them in place.
+
+        Placeholders whose upload failed become the same error paragraph the inline uploader produced.
+        """
+        for block in list(iter_blocks(blocks)):
+            local = block.get(LOCAL_IMAGE_KEY)
+            if not isinstance(local, dict):
+                continue
+            future = self.futures[str(local["path"])]
+            if not future.done():
+                started = time.perf_counter()
+                future.result()
+                self.wait_s += time.perf_counter() - started
+            upload_id = future.result()
+            del block[LOCAL_IMAGE_KEY]
+            if upload_id:
+                block["image"]["file_upload"]["id"] = upload_id
+                continue
+            self.failed += 1
+            block.clear()
+            block.update(
+                {
+                    "object": "block",
+                    "type": "paragraph",
+                    "paragraph": {"rich_text": rich_text(f"Image upload failed for local file: {local['target']}")},
+                }
+            )
 
-    return str(upload_id)
+    def upload_ids(self) -> Dict[str, str]:
+        with self.lock:
+            return dict(self.known)
+
+    def finish(self) -> Dict[str, object]:
+        """Resolve every remaining placeholder and return upload counts."""
+        self.resolve(self.pending)
+        self.close()
+        return {
+            "image_blocks": len(self.pending),
+            "uploads": len(self.futures),
+            "failed": self.failed,
+            "send_wait_s": round(self.wait_s, 3),
+        }
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+
+def upload_pending_images(
+    blocks: List[Dict[str, object]],
+    token: str,
+    notion_version: str,
+    publish_log: List[Dict[str, object]],
+    session: Optional[requests.Session] = None,
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    cache: Optional[UploadCache] = None,
+    known_uploads: Optional[Dict[str, str]] = None,
+    multi_part: Optional[MultiPartSettings] = None,
+) -> Dict[str, object]:
+    """Upload every local image in `blocks` and patch the upload ids in before returning."""
+    pipeline = UploadPipeline(
+        blocks, token, notion_version, publish_log, session, concurrency, cache, known_uploads, multi_part
+    )
+    try:
+        return pipeline.finish()
+    finally:
+        pipeline.close()
+        if known_uploads is not None:
+            known_uploads.update(pipeline.upload_ids())
 
 
 def publish_markdown(
@@ -556,6 +1488,15 @@ def publish_markdown(
     notion_version: str,
     title: str,
     artifacts_dir: Path,
+    upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    upload_cache_ttl_hours: Optional[float] = DEFAULT_UPLOAD_CACHE_TTL_HOURS,
+    rate_limit: float = DEFAULT_RATE_LIMIT,
+    update: bool = False,
+    resume: bool = False,
+    toggle_level: int = 0,
+    payload_byte_cap: int = DEFAULT_PAYLOAD_BYTE_CAP,
+    multi_part: Optional[MultiPartSettings] = None,
+    api_base: str = NOTION_API_BASE,
 ) -> None:
     token = os.getenv(token_env, "").strip()
     if not token:
@@ -566,36 +1507,195 @@ def publish_markdown(
 
     publish_log: List[Dict[str, object]] = []
 
-    blocks, heading_count, image_count = parse_markdown(
-        markdown_text,
-        markdown_path,
-        repo_root,
-        token,
-        notion_version,
-        publish_log,
+    blocks, heading_count, image_count = parse_markdown(markdown_text, markdown_path, repo_root, publish_log)
+    flat_block_count = len(blocks)
+    blocks = nest_sections(blocks, toggle_level)
+    payload_byte_cap = min(payload_byte_cap, NOTION_MAX_PAYLOAD_BYTES)
+    append_round_trips = {
+        "flat_chunks": math.ceil(flat_block_count / NOTION_MAX_ARRAY_LENGTH),
+        "planned": len(plan_append_requests(blocks, payload_byte_cap)),
+    }
+    print(
+        f"[ok] append plan | blocks={flat_block_count} | top_level={len(blocks)} "
+        f"| requests={append_round_trips['planned']} (flat 100-block chunks: {append_round_trips['flat_chunks']})"
     )
+    block_hashes = [block_digest(block) for block in blocks]
+
+    checkpoint_path = artifacts_dir / CHECKPOINT_FILE
+    markdown_sha256 = sha256_file(markdown_path)
+    plan_settings = {"toggle_level": toggle_level, "payload_byte_cap": payload_byte_cap}
+    checkpoint = PublishCheckpoint.load(checkpoint_path, markdown_sha256, plan_settings) if resume else None
+    if resume and checkpoint is None:
+        print(f"[warn] no publish checkpoint at {checkpoint_path}; publishing from scratch")
+    resumed = checkpoint is not None
+    if checkpoint is None:
+        checkpoint = PublishCheckpoint(checkpoint_path, markdown_sha256, plan_settings)
+
+    manifest_path = artifacts_dir / BLOCK_MANIFEST_FILE
+    # An interrupted page build takes precedence over diffing against the last completed publish.
+    previous = load_block_manifest(manifest_path) if update and not resumed else None
+    ops: List[Tuple[str, object]] = []
+    replaced_page_id = str(checkpoint.state.get("replaced_page_id", "")) or None
+    if previous is not None:
+        ops = plan_block_diff(previous["blocks"], block_hashes, blocks)
+        if diff_needs_rebuild(ops):
+            # Cheaper to publish a fresh page than to delete every block one request at a time.
+            publish_log.append({"event": "block_diff_rebuild", "reason": "insert before first kept block"})
+            replaced_page_id = str(previous["page_id"])
+            previous = None
+    if previous is None:
+        outgoing = list(range(len(blocks)))
+    else:
+        outgoing = sorted(
+            [new_index for kind, arg in ops if kind == "insert" for new_index in arg]
+            + [arg[1] for kind, arg in ops if kind == "update"]
+        )
+    placeholders = {
+        index: [block for block in iter_blocks([blocks[index]]) if LOCAL_IMAGE_KEY in block] for index in outgoing
+    }
+    image_indices = [index for index in outgoing if placeholders[index]]
 
-    page = create_child_page(parent_page_id, title, token, notion_version)
-    page_id = str(page.get("id"))
-    if not page_id:
-        raise RuntimeError("page creation response did not contain id")
+    # A TTL of None disables the upload cache.
+    cache = (
+        UploadCache(artifacts_dir / UPLOAD_CACHE_FILE, upload_cache_ttl_hours)
+        if upload_cache_ttl_hours is not None
+        else None
+    )
+    multi_part = multi_part or MultiPartSettings()
+    # Every upload worker may send up to `multi_part.concurrency` parts at once, plus one
+    # connection for the send stage.
+    session = make_session(max(1, upload_concurrency) * max(1, multi_part.concurrency) + 1, rate_limit, api_base)
+    pipeline: Optional[UploadPipeline] = None
+    try:
+        known_uploads: Dict[str, str] = {}
+        if resumed:
+            # Upload ids from the interrupted run are reused if Notion still has them.
+            known_uploads = {
+                path: upload_id
+                for path, upload_id in checkpoint.upload_ids.items()
+                if file_upload_is_valid(upload_id, token, notion_version, session=session)
+            }
+        # Upload stage starts now; the send stage below resolves images batch by batch.
+        pipeline = UploadPipeline(
+            [blocks[index] for index in image_indices],
+            token,
+            notion_version,
+            publish_log,
+            session=session,
+            concurrency=upload_concurrency,
+            cache=cache,
+            known_uploads=known_uploads,
+            multi_part=multi_part,
+        )
 
-    append_blocks(page_id, blocks, token, notion_version, publish_log)
+        if previous is not None:
+            page_id = str(previous["page_id"])
+            page_url = str(previous.get("page_url", ""))
+            block_ids, diff_stats = apply_block_diff(
+                page_id,
+                previous["blocks"],
+                ops,
+                blocks,
+                token,
+                notion_version,
+                publish_log,
+                session=session,
+                byte_cap=payload_byte_cap,
+                before_send=pipeline.resolve,
+            )
+        else:
+            checkpoint.state["replaced_page_id"] = replaced_page_id or ""
+            checkpoint.set_uploads(known_uploads)
+            if checkpoint.page_id:
+                page_id = checkpoint.page_id
+                page_url = str(checkpoint.state.get("page_url", ""))
+                acked_chunks = len(checkpoint.acked_requests)
+                print(f"[ok] resuming page {page_id} after chunk {acked_chunks}")
+                publish_log.append({"event": "resume", "page_id": page_id, "acked_chunks": acked_chunks})
+            else:
+                page = create_child_page(parent_page_id, title, token, notion_version, session=session)
+                page_id = str(page.get("id"))
+                page_url = str(page.get("url", ""))
+                if not page_id:
+                    raise RuntimeError("page creation response did not contain id")
+                checkpoint.set_page(page_id, page_url)
+            block_ids = append_blocks(
+                page_id,
+                blocks,
+                token,
+                notion_version,
+                publish_log,
+                session=session,
+                acked=checkpoint.acked_requests,
+                on_chunk=lambda chunk_index, ids: checkpoint.ack_chunk(chunk_index, ids, pipeline.upload_ids()),
+                byte_cap=payload_byte_cap,
+                before_send=pipeline.resolve,
+            )
+            diff_stats = {"kept": 0, "updated": 0, "deleted": 0, "inserted": len(blocks)}
+            if replaced_page_id:
+                trash_page(replaced_page_id, token, notion_version, session=session)
+                publish_log.append({"event": "page_replaced", "old_page_id": replaced_page_id, "page_id": page_id})
+            checkpoint.clear()
+        upload_stats = pipeline.finish()
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        if cache is not None:
+            cache.save()
+        session.close()
+
+    if cache is not None:
+        upload_stats["cache"] = dict(cache.stats)
+        print(cache.summary_line())
+    for index in image_indices:
+        if any(block.get("type") != "image" for block in placeholders[index]):
+            block_hashes[index] = ""
+
+    ensure_dir(artifacts_dir)
+    if len(block_ids) == len(blocks) and all(block_ids):
+        json_dump(
+            manifest_path,
+            {
+                "version": BLOCK_MANIFEST_VERSION,
+                "updated_at_utc": utc_now_iso(),
+                "page_id": page_id,
+                "page_url": page_url,
+                "markdown_path": str(markdown_path.resolve()),
+                "blocks": [
+                    {
+                        "hash": digest,
+                        "id": block_id,
+                        "type": block.get("type", ""),
+                        "has_children": bool(block_children(block)),
+                    }
+                    for digest, block_id, block in zip(block_hashes, block_ids, blocks)
+                ],
+            },
+        )
+    else:
+        # Without an id for every block the page cannot be diffed later; the next --update creates a new page.
+        manifest_path.unlink(missing_ok=True)
 
     notion_meta = {
         "published_at_utc": utc_now_iso(),
         "page_id": page_id,
-        "page_url": page.get("url", ""),
+        "page_url": page_url,
         "parent_page_id": parent_page_id,
         "title": title,
         "notion_version": notion_version,
         "markdown_path": str(markdown_path.resolve()),
-        "block_count": len(blocks),
+        "block_count": flat_block_count,
+        "top_level_block_count": len(blocks),
+        "toggle_level": toggle_level,
+        "append_round_trips": append_round_trips,
         "heading_count_from_markdown": heading_count,
         "image_count_from_markdown": image_count,
+        "image_uploads": upload_stats,
+        "rate_limit_wait_s": round(session.limiter.waited_s, 3) if session.limiter else 0.0,
+        "mode": "update" if previous is not None else ("resume" if resumed else "create"),
+        "block_diff": diff_stats,
     }
 
-    ensure_dir(artifacts_dir)
     (artifacts_dir / "notion_page_meta.json").write_text(
         json.dumps(notion_meta, indent=2, ensure_ascii=False),
         encoding="utf-8",
@@ -617,7 +1717,9 @@ def publish_markdown(
             {
                 "page_id": page_id,
                 "page_url": notion_meta["page_url"],
-                "block_count": len(blocks),
+                "block_count": flat_block_count,
+                "mode": notion_meta["mode"],
+                "block_diff": diff_stats,
                 "notion_page_meta": str((artifacts_dir / "notion_page_meta.json").resolve()),
                 "notion_publish_log": str((artifacts_dir / "notion_publish_log.json").resolve()),
             },
@@ -642,6 +1744,20 @@ def parse_args() -> argparse.Namespace:
         default="304abae6d98781c9b114c8a8834defd1",
     )
     parser.add_argument("--token-env", type=str, default="NOTION_API_KEY")
+    parser.add_argument(
+        "--api-base",
+        type=str,
+        default=NOTION_API_BASE,
+        help="Notion API base URL, e.g. a local notion_mock.py server.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help=(
+            f"Publish to an in-process notion_mock server (no token needed); artifacts go to <artifacts-dir>/{DRY_RUN_DIR}. "
+            "Uploads every image; cannot be combined with --update or --resume."
+        ),
+    )
     parser.add_argument("--notion-version", type=str, default=DEFAULT_NOTION_VERSION)
     parser.add_argument(
         "--title",
@@ -653,19 +1769,125 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         default=default_artifacts,
     )
+    parser.add_argument(
+        "--upload-concurrency",
+        type=int,
+        default=DEFAULT_UPLOAD_CONCURRENCY,
+        help="Parallel image uploads (also the size of the keep-alive connection pool).",
+    )
+    parser.add_argument(
+        "--multi-part-threshold-mb",
+        type=float,
+        default=DEFAULT_MULTI_PART_THRESHOLD_BYTES / (1024 * 1024),
+        help=f"Upload files larger than this in parts (Notion requires it above "
+        f"{NOTION_SINGLE_PART_MAX_BYTES // (1024 * 1024)} MB).",
+    )
+    parser.add_argument(
+        "--part-size-mb",
+        type=float,
+        default=DEFAULT_PART_BYTES / (1024 * 1024),
+        help=f"Multi-part upload part size ({NOTION_MIN_PART_BYTES // (1024 * 1024)}-"
+        f"{NOTION_MAX_PART_BYTES // (1024 * 1024)} MB).",
+    )
+    parser.add_argument(
+        "--part-concurrency",
+        type=int,
+        default=DEFAULT_PART_CONCURRENCY,
+        help="Parts of one multi-part upload sent in parallel.",
+    )
+    parser.add_argument(
+        "--upload-cache-ttl-hours",
+        type=float,
+        default=DEFAULT_UPLOAD_CACHE_TTL_HOURS,
+        help=f"Reuse Notion uploads of unchanged files (by content hash) for this long; see {UPLOAD_CACHE_FILE}.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help="Client-side request rate limit in requests/second shared by all API calls (0 disables).",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help=f"Update the page recorded in {BLOCK_MANIFEST_FILE} in place, sending only changed blocks.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue an interrupted publish from {CHECKPOINT_FILE} instead of starting a new page.",
+    )
+    parser.add_argument(
+        "--toggle-level",
+        type=int,
+        choices=(0, 1, 2, 3),
+        default=0,
+        help="Fold each section under headings of this level into a toggleable heading, so sections are "
+        "sent as nested children in far fewer requests (0 keeps the page flat).",
+    )
+    parser.add_argument(
+        "--payload-byte-cap",
+        type=int,
+        default=DEFAULT_PAYLOAD_BYTE_CAP,
+        help=f"Maximum JSON bytes per append request (Notion rejects more than {NOTION_MAX_PAYLOAD_BYTES}).",
+    )
+    parser.add_argument(
+        "--no-upload-cache",
+        action="store_true",
+        help="Upload every image even if an identical file was uploaded before.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    publish_markdown(
-        markdown_path=args.markdown_path.resolve(),
-        parent_page_id=args.parent_page_id,
-        token_env=args.token_env,
-        notion_version=args.notion_version,
-        title=args.title,
-        artifacts_dir=args.artifacts_dir.resolve(),
-    )
+    api_base = args.api_base
+    token_env = args.token_env
+    artifacts_dir = args.artifacts_dir.resolve()
+    part_bytes = int(args.part_size_mb * 1024 * 1024)
+    if not NOTION_MIN_PART_BYTES <= part_bytes <= NOTION_MAX_PART_BYTES:
+        raise SystemExit(f"--part-size-mb must be between 5 and 20, got {args.part_size_mb:g}")
+    threshold_bytes = int(args.multi_part_threshold_mb * 1024 * 1024)
+    if threshold_bytes > NOTION_SINGLE_PART_MAX_BYTES:
+        raise SystemExit(f"--multi-part-threshold-mb must be at most 20, got {args.multi_part_threshold_mb:g}")
+    multi_part = MultiPartSettings(threshold_bytes, part_bytes, args.part_concurrency)
+    upload_cache_ttl_hours = None if args.no_upload_cache else args.upload_cache_ttl_hours
+    mock_server = None
+    if args.dry_run:
+        # Every dry run starts an empty mock, so pages, blocks and uploads from earlier runs are gone.
+        if args.update or args.resume:
+            raise SystemExit("--dry-run cannot be combined with --update or --resume (the mock starts empty every run)")
+        upload_cache_ttl_hours = None
+        # The mock is only needed for dry runs; real publishes never import it.
+        from notion_mock import MockConfig, NotionMockServer
+
+        mock_server = NotionMockServer(MockConfig())
+        api_base = mock_server.start()
+        os.environ[DRY_RUN_TOKEN_ENV] = "dry-run"
+        token_env = DRY_RUN_TOKEN_ENV
+        artifacts_dir = artifacts_dir / DRY_RUN_DIR
+    try:
+        publish_markdown(
+            markdown_path=args.markdown_path.resolve(),
+            parent_page_id=args.parent_page_id,
+            token_env=token_env,
+            notion_version=args.notion_version,
+            title=args.title,
+            artifacts_dir=artifacts_dir,
+            upload_concurrency=args.upload_concurrency,
+            upload_cache_ttl_hours=upload_cache_ttl_hours,
+            rate_limit=args.rate_limit,
+            update=args.update,
+            resume=args.resume,
+            toggle_level=args.toggle_level,
+            payload_byte_cap=args.payload_byte_cap,
+            multi_part=multi_part,
+            api_base=api_base,
+        )
+    finally:
+        if mock_server is not None:
+            print(json.dumps({"dry_run_api_stats": mock_server.stats()}, indent=2))
+            mock_server.stop()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,33 @@ from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 DOI_REGEX = re.compile(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", re.IGNORECASE)
 YEAR_REGEX = re.compile(r"\b(19|20)\d{2}\b")
+TERM_REGEX = re.compile(r"[a-z0-9]+")
+# Keyword families scanned once per paper at extraction time (see keyword_signals).
+# OBSERVATION_FAMILIES drive summarize_papers repo observations; METHOD_TAG_FAMILIES drive
+# the compose_report method distribution table.
+OBSERVATION_FAMILIES: Dict[str, Tuple[str, ...]] = {
+    "fd": ("arakawa", "finite difference", "rk4", "jacobian"),
+    "spectral": ("spectral", "fft", "fourier"),
+    "fv": ("finite volume", "fvm", "flux"),
+    "validation": ("validation", "benchmark", "convergence", "error"),
+    "physics": ("bathymetry", "topography", "shallow water", "boundary layer", "tsunami"),
+    "energy": ("energy", "sustainability", "power", "computational cost", "gpu"),
+    "ml": ("machine learning", "data-driven", "surrogate", "ai"),
+}
+METHOD_TAG_FAMILIES: Dict[str, Tuple[str, ...]] = {
+    "fd": ("finite difference", "arakawa", "rk4"),
+    "spectral": ("spectral", "fft"),
+    "fv": ("finite volume", "fvm", "flux"),
+    "lbm": ("lattice boltzmann", "lbm", "mrt"),
+    "shallow_water": ("shallow water", "tsunami"),
+}
+KEYWORD_SIGNAL_TERMS: Tuple[str, ...] = tuple(
+    sorted({term for families in (OBSERVATION_FAMILIES, METHOD_TAG_FAMILIES) for terms in families.values() for term in terms})
+)
+KEYWORD_SIGNAL_PAGES = 8
+# Summary record fields whose text is tagged for the method distribution table.
+METHOD_TAG_FIELDS = ("methods", "objective", "findings", "title")
+TERM_SUFFIXES = ("ions", "ion", "ing", "ies", "ied", "es", "ed", "ly", "s", "e")
 
 
 @dataclass
@@ -141,6 +168,53 @@ def sentence_tokenize(text: str) -> List[str]:
     return [p.strip() for p in parts if p.strip()]
 
 
+def stem_term(term: str) -> str:
+    # Light suffix stripping so "demonstrated"/"demonstrates"/"demonstration" share one term.
+    for suffix in TERM_SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            return term[: -len(suffix)]
+    return term
+
+
+def tokenize_terms(text: str) -> List[str]:
+    return [stem_term(token) for token in TERM_REGEX.findall(text.lower())]
+
+
+def keyword_signals(text: str) -> Dict[str, object]:
+    """Per-term hit counts plus a hit bitset (bit i <-> KEYWORD_SIGNAL_TERMS[i]) for one text."""
+    lower = text.lower()
+    counts = [lower.count(term) for term in KEYWORD_SIGNAL_TERMS]
+    bitset = 0
+    for bit, count in enumerate(counts):
+        if count:
+            bitset |= 1 << bit
+    return {"terms": list(KEYWORD_SIGNAL_TERMS), "counts": counts, "bitset": bitset}
+
+
+def signal_families(signals: Dict[str, object], families: Dict[str, Sequence[str]]) -> Optional[List[str]]:
+    """Families with at least one hit, in family order; None if `signals` lacks a needed term."""
+    terms = signals.get("terms")
+    if not isinstance(terms, list):
+        return None
+    bit_of = {str(term): bit for bit, term in enumerate(terms)}
+    bitset = int(signals.get("bitset", 0) or 0)
+    hits: List[str] = []
+    for family, family_terms in families.items():
+        if any(term not in bit_of for term in family_terms):
+            return None
+        if any(bitset >> bit_of[term] & 1 for term in family_terms):
+            hits.append(family)
+    return hits
+
+
+def method_tags(text: str) -> List[str]:
+    return signal_families(keyword_signals(text), METHOD_TAG_FAMILIES) or []
+
+
+def summary_method_tags(record: Dict[str, object]) -> List[str]:
+    return method_tags(" ".join(str(record.get(field, "")) for field in METHOD_TAG_FIELDS))
+
+
 def parse_ris_file(path: Path) -> List[Dict[str, object]]:
     if not path.exists():
         return []
@@ -0,0 +1,426 @@
+﻿#!/usr/bin/env python3
+"""Local full-text search over extracted paper text (positional inverted index + optional embeddings)."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from artifact_store import ArtifactStore
+from research_common import (
+    TERM_REGEX,
+    clean_whitespace,
+    ensure_dir,
+    repo_root_from_file,
+    split_pages_from_pdftotext,
+    tokenize_terms,
+    utc_now_iso,
+)
+from sentence_ranking import BM25_B, BM25_K1
+
+PHRASE_REGEX = re.compile(r'"([^"]+)"')
+SNIPPET_CHARS = 240
+EMBED_TEXT_CHARS = 2000
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def page_positions(page_text: str) -> Dict[str, List[int]]:
+    positions: Dict[str, List[int]] = defaultdict(list)
+    for pos, term in enumerate(tokenize_terms(page_text)):
+        positions[term].append(pos)
+    return positions
+
+
+def contains_phrase(term_positions: Sequence[Sequence[int]]) -> bool:
+    """True when the terms occur at consecutive positions somewhere on the page."""
+    if not term_positions:
+        return False
+    following = [set(positions) for positions in term_positions[1:]]
+    for start in term_positions[0]:
+        if all(start + offset + 1 in positions for offset, positions in enumerate(following)):
+            return True
+    return False
+
+
+def make_snippet(page_text: str, query_words: Sequence[str]) -> str:
+    flat = clean_whitespace(page_text)
+    lower = flat.lower()
+    hit = -1
+    for word in query_words:
+        idx = lower.find(word)
+        if idx != -1 and (hit == -1 or idx < hit):
+            hit = idx
+    start = max(0, hit - SNIPPET_CHARS // 3) if hit != -1 else 0
+    snippet = flat[start : start + SNIPPET_CHARS]
+    return ("..." if start > 0 else "") + snippet
+
+
+class SearchIndex:
+    """Page-level positional inverted index stored in SQLite, updated incrementally per paper."""
+
+    def __init__(self, path: Path) -> None:
+        ensure_dir(path.parent)
+        self.path = path
+        self.embeddings_path = path.with_name(path.stem + "_embeddings.npz")
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                paper_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                indexed_at_utc TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                page_key INTEGER PRIMARY KEY AUTOINCREMENT,
+                paper_id TEXT NOT NULL,
+                page_no INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_by_paper ON pages (paper_id);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                page_key INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                positions BLOB NOT NULL,
+                PRIMARY KEY (term, page_key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_by_page ON postings (page_key);
+            """
+        )
+        self.conn.commit()
+        self._page_lengths: Optional[Dict[int, int]] = None
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------------------------------------------------------ updates
+
+    def indexed_hash(self, paper_id: str) -> Optional[str]:
+        row = self.conn.execute("SELECT text_hash FROM papers WHERE paper_id = ?", (paper_id,)).fetchone()
+        return row[0] if row else None
+
+    def remove_paper(self, paper_id: str) -> None:
+        with self.conn:
+            self._delete_paper_rows(paper_id)
+        self._page_lengths = None
+
+    def _delete_paper_rows(self, paper_id: str) -> None:
+        self.conn.execute(
+            "DELETE FROM postings WHERE page_key IN (SELECT page_key FROM pages WHERE paper_id = ?)",
+            (paper_id,),
+        )
+        self.conn.execute("DELETE FROM pages WHERE paper_id = ?", (paper_id,))
+        self.conn.execute("DELETE FROM papers WHERE paper_id = ?", (paper_id,))
+
+    def update_paper(self, paper_id: str, title: str, pages: Sequence[str], force: bool = False) -> bool:
+        """(Re-)index one paper; returns False when its text is unchanged since the last update."""
+        text_hash = text_sha256("\f".join(pages))
+        if not force and self.indexed_hash(paper_id) == text_hash:
+            return False
+
+        with self.conn:
+            self._delete_paper_rows(paper_id)
+            for page_no, page_text in enumerate(pages, start=1):
+                positions = page_positions(page_text)
+                length = sum(len(pos) for pos in positions.values())
+                if length == 0:
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT INTO pages (paper_id, page_no, length, text) VALUES (?, ?, ?, ?)",
+                    (paper_id, page_no, length, page_text),
+                )
+                page_key = cursor.lastrowid
+                self.conn.executemany(
+                    "INSERT INTO postings (term, page_key, tf, positions) VALUES (?, ?, ?, ?)",
+                    (
+                        (term, page_key, len(pos), array("I", pos).tobytes())
+                        for term, pos in positions.items()
+                    ),
+                )
+            self.conn.execute(
+                "INSERT INTO papers (paper_id, title, text_hash, indexed_at_utc) VALUES (?, ?, ?, ?)",
+                (paper_id, title, text_hash, utc_now_iso()),
+            )
+        self._page_lengths = None
+        return True
+
+    def update_from_assets(
+        self,
+        assets_dir: Path,
+        prune: bool = False,
+        force: bool = False,
+        store: Optional[ArtifactStore] = None,
+    ) -> Dict[str, int]:
+        """Index every papers/<paper_id>/text.txt whose content changed since the last update."""
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+        papers_root = assets_dir / "papers"
+        for paper_dir in sorted(p for p in papers_root.glob("*") if p.is_dir()):
+            text_path = paper_dir / "text.txt"
+            if not text_path.exists():
+                continue
+            paper_id = paper_dir.name
+            seen.add(paper_id)
+            pages = split_pages_from_pdftotext(text_path.read_text(encoding="utf-8", errors="ignore"))
+            metadata_path = paper_dir / "metadata.json"
+            if store:
+                metadata = store.get("metadata", paper_id)
+            elif metadata_path.exists():
+                metadata = json.loads(metadata_path.read_text(encoding="utf-8", errors="ignore"))
+            else:
+                metadata = None
+            title = str(metadata.get("title") or paper_id) if isinstance(metadata, dict) else paper_id
+            if self.update_paper(paper_id, title, pages, force=force):
+                counts["indexed"] += 1
+            else:
+                counts["unchanged"] += 1
+
+        if prune:
+            for (paper_id,) in self.conn.execute("SELECT paper_id FROM papers").fetchall():
+                if paper_id not in seen:
+                    self.remove_paper(paper_id)
+                    counts["removed"] += 1
+        return counts
+
+    # ------------------------------------------------------------------ queries
+
+    def _lengths(self) -> Dict[int, int]:
+        # Page lengths are small and needed for every query; cache them until the next update.
+        if self._page_lengths is None:
+            self._page_lengths = dict(self.conn.execute("SELECT page_key, length FROM pages"))
+        return self._page_lengths
+
+    def _postings(self, term: str) -> Dict[int, Tuple[int, bytes]]:
+        rows = self.conn.execute("SELECT page_key, tf, positions FROM postings WHERE term = ?", (term,))
+        return {page_key: (tf, positions) for page_key, tf, positions in rows}
+
+    def lexical_scores(self, query: str) -> Dict[int, float]:
+        """BM25 page scores; quoted phrases must match at consecutive positions."""
+        phrases = [tokenize_terms(phrase) for phrase in PHRASE_REGEX.findall(query)]
+        terms = list(dict.fromkeys(tokenize_terms(query)))
+        if not terms:
+            return {}
+
+        lengths = self._lengths()
+        page_count = len(lengths)
+        avg_len = sum(lengths.values()) / page_count if page_count else 0.0
+        postings = {term: self._postings(term) for term in terms}
+
+        scores: Dict[int, float] = {}
+        for term, term_postings in postings.items():
+            df = len(term_postings)
+            if df == 0:
+                continue
+            idf = math.log(1.0 + (page_count - df + 0.5) / (df + 0.5))
+            for page_key, (tf, _) in term_postings.items():
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths.get(page_key, 0) / (avg_len or 1.0))
+                scores[page_key] = scores.get(page_key, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+
+        for phrase in phrases:
+            if len(phrase) < 2:
+                continue
+            keep = {}
+            for page_key, score in scores.items():
+                term_positions = []
+                for term in phrase:
+                    entry = postings.get(term, {}).get(page_key)
+                    if entry is None:
+                        break
+                    term_positions.append(array("I", entry[1]).tolist())
+                else:
+                    if contains_phrase(term_positions):
+                        keep[page_key] = score
+            scores = keep
+        return scores
+
+    def search(self, query: str, limit: int = 10, mode: str = "lexical", embed_model: str = "") -> List[Dict[str, object]]:
+        """Top page-level hits for `query` (mode: lexical, dense or hybrid)."""
+        if mode == "lexical":
+            ranked = _top(self.lexical_scores(query), limit)
+        else:
+            dense = self.dense_scores(query, embed_model)
+            if mode == "dense":
+                ranked = _top(dense, limit)
+            else:
+                ranked = _reciprocal_rank_fusion([self.lexical_scores(query), dense], limit)
+
+        if not ranked:
+            return []
+        keys = [page_key for page_key, _ in ranked]
+        marks = ",".join("?" * len(keys))
+        rows = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT pages.page_key, pages.paper_id, pages.page_no, pages.text, papers.title "
+                f"FROM pages JOIN papers ON papers.paper_id = pages.paper_id WHERE pages.page_key IN ({marks})",
+                tuple(keys),
+            )
+        }
+        query_words = [w for w in TERM_REGEX.findall(query.lower()) if len(w) > 2] or TERM_REGEX.findall(query.lower())
+        hits: List[Dict[str, object]] = []
+        for page_key, score in ranked:
+            if page_key not in rows:
+                continue
+            paper_id, page_no, text, title = rows[page_key]
+            hits.append(
+                {
+                    "paper_id": paper_id,
+                    "title": title,
+                    "page": page_no,
+                    "score": round(score, 4),
+                    "snippet": make_snippet(text, query_words),
+                }
+            )
+        return hits
+
+    # ------------------------------------------------------------------ dense embeddings (optional)
+
+    def update_embeddings(self, embed_model: str, batch_size: int = 32) -> Dict[str, int]:
+        """Embed pages that are not yet in the on-disk embedding matrix; drop rows for removed pages."""
+        np = _require_numpy()
+        keys, matrix = self._load_embeddings(np)
+        live = {row[0]: row[1] for row in self.conn.execute("SELECT page_key, text FROM pages")}
+        keep = [i for i, key in enumerate(keys) if key in live]
+        keys = [keys[i] for i in keep]
+        matrix = matrix[keep] if matrix is not None and len(keep) else None
+        have = set(keys)
+        missing = [key for key in sorted(live) if key not in have]
+
+        if missing:
+            model = _load_embedding_model(embed_model)
+            texts = [clean_whitespace(live[key])[:EMBED_TEXT_CHARS] for key in missing]
+            new_rows = model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+            new_rows = np.asarray(new_rows, dtype=np.float32)
+            matrix = new_rows if matrix is None else np.vstack([matrix, new_rows])
+            keys.extend(missing)
+
+        if matrix is not None:
+            np.savez(self.embeddings_path, keys=np.asarray(keys, dtype=np.int64), matrix=matrix, model=embed_model)
+        return {"embedded": len(missing), "total": len(keys)}
+
+    def _load_embeddings(self, np: object) -> Tuple[List[int], Optional[object]]:
+        if not self.embeddings_path.exists():
+            return [], None
+        data = np.load(self.embeddings_path)
+        return [int(k) for k in data["keys"]], data["matrix"]
+
+    def dense_scores(self, query: str, embed_model: str = "") -> Dict[int, float]:
+        np = _require_numpy()
+        keys, matrix = self._load_embeddings(np)
+        if matrix is None:
+            raise SystemExit(f"no embeddings found at {self.embeddings_path}; run `build --embed-model ...` first")
+        if not embed_model:
+            embed_model = str(np.load(self.embeddings_path)["model"])
+        model = _load_embedding_model(embed_model)
+        vector = np.asarray(model.encode([query], normalize_embeddings=True), dtype=np.float32)[0]
+        sims = matrix @ vector
+        return {key: float(sim) for key, sim in zip(keys, sims)}
+
+
+def _top(scores: Dict[int, float], limit: int) -> List[Tuple[int, float]]:
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def _reciprocal_rank_fusion(score_sets: Iterable[Dict[int, float]], limit: int, k: int = 60) -> List[Tuple[int, float]]:
+    fused: Dict[int, float] = {}
+    for scores in score_sets:
+        for rank, (key, _) in enumerate(_top(scores, len(scores)), start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return _top(fused, limit)
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise SystemExit("dense search requires numpy (pip install numpy)") from exc
+    return np
+
+
+_MODEL_CACHE: Dict[str, object] = {}
+
+
+def _load_embedding_model(name: str):
+    if not name:
+        raise SystemExit("an --embed-model is required for dense search")
+    if name not in _MODEL_CACHE:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise SystemExit("dense search requires sentence-transformers and a local model") from exc
+        _MODEL_CACHE[name] = SentenceTransformer(name)
+    return _MODEL_CACHE[name]
+
+
+def parse_args() -> argparse.Namespace:
+    repo_root = repo_root_from_file(Path(__file__))
+    default_out = repo_root / "Artifacts" / "research_report_2026-02-11"
+
+    parser = argparse.ArgumentParser(description="Build or query the local research corpus search index.")
+    parser.add_argument("--index", type=Path, default=default_out / "search_index.sqlite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Index new or changed papers under --assets-dir.")
+    build.add_argument("--assets-dir", type=Path, default=default_out)
+    build.add_argument("--prune", action="store_true", help="Drop papers that no longer have text.txt.")
+    build.add_argument("--force", action="store_true", help="Re-index every paper.")
+    build.add_argument("--store", type=Path, default=None, help="Read paper titles from this SQLite artifact store.")
+    build.add_argument("--embed-model", type=str, default="", help="Local sentence-transformers model for dense vectors.")
+
+    query = sub.add_parser("query", help="Search the index.")
+    query.add_argument("text", type=str, help='Query terms; wrap phrases in double quotes, e.g. "\\"arakawa jacobian\\"".')
+    query.add_argument("--limit", type=int, default=10)
+    query.add_argument("--mode", choices=("lexical", "dense", "hybrid"), default="lexical")
+    query.add_argument("--embed-model", type=str, default="")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    index_path = args.index.resolve()
+
+    with SearchIndex(index_path) as index:
+        if args.command == "build":
+            store = ArtifactStore(args.store.resolve()) if args.store else None
+            try:
+                counts: Dict[str, object] = dict(
+                    index.update_from_assets(args.assets_dir.resolve(), args.prune, args.force, store=store)
+                )
+            finally:
+                if store:
+                    store.close()
+            if args.embed_model:
+                counts["embeddings"] = index.update_embeddings(args.embed_model)
+            print(json.dumps({"index": str(index_path), **counts}, indent=2))
+            return
+
+        started = time.perf_counter()
+        hits = index.search(args.text, limit=args.limit, mode=args.mode, embed_model=args.embed_model)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        print(json.dumps({"query": args.text, "elapsed_ms": round(elapsed_ms, 2), "hits": hits}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+﻿#!/usr/bin/env python3
+"""BM25 sentence ranking with corpus-level term statistics."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from research_common import tokenize_terms
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class CorpusTermStats:
+    """Sentence-level document frequencies over the whole corpus; IDF is computed once."""
+
+    def __init__(self) -> None:
+        self.doc_freq: Counter = Counter()
+        self.sentence_count = 0
+        self.total_terms = 0
+        self.idf: Dict[str, float] = {}
+        self.avg_len = 0.0
+
+    def add_counts(self, doc_freq: Counter, sentence_count: int, total_terms: int) -> None:
+        self.doc_freq.update(doc_freq)
+        self.sentence_count += sentence_count
+        self.total_terms += total_terms
+
+    def finalize(self) -> "CorpusTermStats":
+        n = self.sentence_count
+        self.idf = {term: math.log(1.0 + (n - df + 0.5) / (df + 0.5)) for term, df in self.doc_freq.items()}
+        self.avg_len = self.total_terms / n if n else 0.0
+        return self
+
+    def digest(self) -> str:
+        """Stable fingerprint of the statistics, for invalidating BM25-ranked outputs."""
+        digest = hashlib.sha256(f"{self.sentence_count}:{self.total_terms}".encode("utf-8"))
+        for term, df in sorted(self.doc_freq.items()):
+            digest.update(f"\0{term}:{df}".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def paper_term_counts(sentence_terms: Iterable[Sequence[str]]) -> Tuple[Counter, int, int]:
+    """Per-paper contribution to CorpusTermStats: (doc_freq, sentence_count, total_terms)."""
+    doc_freq: Counter = Counter()
+    sentence_count = 0
+    total_terms = 0
+    for terms in sentence_terms:
+        doc_freq.update(set(terms))
+        sentence_count += 1
+        total_terms += len(terms)
+    return doc_freq, sentence_count, total_terms
+
+
+class SentenceIndex:
+    """Inverted index (term -> sentence postings) over one paper's sentences."""
+
+    def __init__(self, sentence_terms: Sequence[Sequence[str]]) -> None:
+        self.lengths = [len(terms) for terms in sentence_terms]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for idx, terms in enumerate(sentence_terms):
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((idx, tf))
+
+    def scores(self, query_terms: Iterable[str], stats: CorpusTermStats) -> Dict[int, float]:
+        avg_len = stats.avg_len or 1.0
+        scores: Dict[int, float] = {}
+        for term in set(query_terms):
+            idf = stats.idf.get(term)
+            if idf is None:
+                continue
+            for idx, tf in self.postings.get(term, ()):
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.lengths[idx] / avg_len)
+                scores[idx] = scores.get(idx, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return scores
+
+    def rank(self, query_terms: Iterable[str], stats: CorpusTermStats) -> List[int]:
+        """Sentence indices with a positive score, best first; ties keep page order."""
+        scores = self.scores(query_terms, stats)
+        return sorted(scores, key=lambda idx: (-scores[idx], idx))
+
+
+def category_queries(categories: Dict[str, Sequence[str]]) -> Dict[str, List[str]]:
+    return {category: tokenize_terms(" ".join(keywords)) for category, keywords in categories.items()}
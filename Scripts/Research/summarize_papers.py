@@ -3,21 +3,44 @@
 
 from __future__ import annotations
 
+import abc
 import argparse
+import hashlib
 import json
 import re
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
 
+from artifact_store import ArtifactStore
 from research_common import (
+    KEYWORD_SIGNAL_PAGES,
+    OBSERVATION_FAMILIES,
     clean_whitespace,
     ensure_dir,
     json_dump,
+    keyword_signals,
     repo_root_from_file,
     sentence_tokenize,
+    signal_families,
+    summary_method_tags,
     split_pages_from_pdftotext,
+    tokenize_terms,
     utc_now_iso,
 )
+from sentence_ranking import CorpusTermStats, SentenceIndex, category_queries, paper_term_counts
+from summary_source import SummaryLinesWriter, is_jsonl_path
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Bump whenever summarize_paper output changes so --incremental discards cached records.
+SUMMARIZER_VERSION = "1"
+SUMMARY_RECORD_FILE = "summary_record.json"
+PAPER_INPUT_FILES = ("text.txt", "metadata.json", "equation_candidates.json", "figures_index.json", "keyword_signals.json")
 
 ABSTRACT_REGEX = re.compile(
     r"(?is)\babstract\b[:\s\-]*(.+?)(?:\n\s*(?:keywords?|1\.?\s+introduction|introduction)\b|$)"
@@ -48,9 +71,10 @@ def extract_abstract_snippet(pages: List[str]) -> Tuple[str, int]:
     return fallback[:2000], 1
 
 
-def collect_sentences_with_pages(pages: List[str], page_limit: int = 8) -> List[Dict[str, object]]:
+def collect_sentences_with_pages(pages: List[str], page_limit: Optional[int] = 8) -> List[Dict[str, object]]:
+    """Sentences (with page numbers) from the first `page_limit` pages; all pages when falsy."""
     collected: List[Dict[str, object]] = []
-    for page_no, page_text in enumerate(pages[:page_limit], start=1):
+    for page_no, page_text in enumerate(pages[:page_limit] if page_limit else pages, start=1):
         raw_lines = [clean_whitespace(line) for line in page_text.splitlines()]
         raw_lines = [line for line in raw_lines if len(line) >= 20]
         for line in raw_lines:
@@ -104,92 +128,231 @@ def format_paragraph_from_sentences(items: List[Dict[str, object]], fallback: st
     return " ".join(str(item["text"]) for item in items)
 
 
-def build_repo_observations(full_text: str) -> List[str]:
-    lower = full_text.lower()
-    observations: List[str] = []
+REPO_OBSERVATIONS: Dict[str, str] = {
+    "fd": "Its numerical treatment can be mapped to the active FD path in `Scripts/Methods/FiniteDifference/FiniteDifferenceMethod.m` and runtime dispatch in `Scripts/Drivers/Tsunami_Vorticity_Emulator.m`.",
+    "spectral": "It informs the experimental spectral branch under `Scripts/Methods/Spectral/README.md`, which is currently not fully wired in dispatcher modes.",
+    "fv": "It provides method-level rationale for the finite-volume roadmap in `Scripts/Methods/FiniteVolume/README.md`.",
+    "validation": "Its benchmarking ideas are directly relevant to convergence workflows in `Scripts/Modes/Convergence/mode_convergence.m` and `Scripts/Modes/Convergence/run_adaptive_convergence.m`.",
+    "physics": "Its physical assumptions should be cross-checked against variable-bathymetry handling in `Scripts/Modes/Variable_Bathymetry_Analysis.m` and planned mode/method unification.",
+    "energy": "Its compute-performance implications connect to sustainability instrumentation in `Scripts/Sustainability/SustainabilityLedger.m` and `Scripts/Sustainability/EnergySustainabilityAnalyzer.m`.",
+    "ml": "Its modeling direction can be compared with the ML roadmap in `Markdowns/MACHINE_LEARNING_VORTICITY_ABSORPTION.md`.",
+}
+
 
-    observations.append(
+def build_repo_observations(full_text: str, signals: Optional[Dict[str, object]] = None) -> List[str]:
+    """Module-linked observations; reads precomputed keyword signals when available."""
+    families = signal_families(signals, OBSERVATION_FAMILIES) if isinstance(signals, dict) else None
+    if families is None:
+        families = signal_families(keyword_signals(full_text), OBSERVATION_FAMILIES) or []
+
+    observations: List[str] = [
         "This paper links to the vorticity-streamfunction implementation documented in `Markdowns/MATHEMATICAL_FRAMEWORK.md` and `Scripts/Methods/FiniteDifference/README.md`."
-    )
+    ]
+    observations.extend(REPO_OBSERVATIONS[family] for family in families)
+    return observations[:6]
 
-    if any(token in lower for token in ["arakawa", "finite difference", "rk4", "jacobian"]):
-        observations.append(
-            "Its numerical treatment can be mapped to the active FD path in `Scripts/Methods/FiniteDifference/FiniteDifferenceMethod.m` and runtime dispatch in `Scripts/Drivers/Tsunami_Vorticity_Emulator.m`."
-        )
 
-    if any(token in lower for token in ["spectral", "fft", "fourier"]):
-        observations.append(
-            "It informs the experimental spectral branch under `Scripts/Methods/Spectral/README.md`, which is currently not fully wired in dispatcher modes."
-        )
+SUMMARY_CATEGORY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "objective": ("this paper", "this study", "we present", "we investigate", "we propose", "aim", "objective"),
+    "methods": (
+        "method",
+        "numerical",
+        "simulation",
+        "finite",
+        "spectral",
+        "lattice",
+        "solver",
+        "scheme",
+        "equation",
+    ),
+    "findings": ("result", "show", "found", "demonstrat", "agree", "accuracy", "performance"),
+    "limitations": ("limitation", "future", "however", "assume", "restricted", "challenge", "uncertain"),
+}
 
-    if any(token in lower for token in ["finite volume", "fvm", "flux"]):
-        observations.append(
-            "It provides method-level rationale for the finite-volume roadmap in `Scripts/Methods/FiniteVolume/README.md`."
-        )
 
-    if any(token in lower for token in ["validation", "benchmark", "convergence", "error"]):
-        observations.append(
-            "Its benchmarking ideas are directly relevant to convergence workflows in `Scripts/Modes/Convergence/mode_convergence.m` and `Scripts/Modes/Convergence/run_adaptive_convergence.m`."
-        )
+def extract_findings(sentences: Sequence[Dict[str, object]], limit: int = 3) -> List[Dict[str, object]]:
+    return pick_sentences(sentences, keywords=SUMMARY_CATEGORY_KEYWORDS["findings"], limit=limit)
 
-    if any(token in lower for token in ["bathymetry", "topography", "shallow water", "boundary layer", "tsunami"]):
-        observations.append(
-            "Its physical assumptions should be cross-checked against variable-bathymetry handling in `Scripts/Modes/Variable_Bathymetry_Analysis.m` and planned mode/method unification."
-        )
 
-    if any(token in lower for token in ["energy", "sustainability", "power", "computational cost", "gpu"]):
-        observations.append(
-            "Its compute-performance implications connect to sustainability instrumentation in `Scripts/Sustainability/SustainabilityLedger.m` and `Scripts/Sustainability/EnergySustainabilityAnalyzer.m`."
-        )
+def extract_methods(sentences: Sequence[Dict[str, object]], limit: int = 3) -> List[Dict[str, object]]:
+    return pick_sentences(sentences, keywords=SUMMARY_CATEGORY_KEYWORDS["methods"], limit=limit)
 
-    if any(token in lower for token in ["machine learning", "data-driven", "surrogate", "ai"]):
-        observations.append(
-            "Its modeling direction can be compared with the ML roadmap in `Markdowns/MACHINE_LEARNING_VORTICITY_ABSORPTION.md`."
-        )
 
-    return observations[:6]
+def extract_objective(sentences: Sequence[Dict[str, object]], limit: int = 2) -> List[Dict[str, object]]:
+    return pick_sentences(sentences, keywords=SUMMARY_CATEGORY_KEYWORDS["objective"], limit=limit)
 
 
-def extract_findings(sentences: Sequence[Dict[str, object]], limit: int = 3) -> List[Dict[str, object]]:
-    return pick_sentences(
-        sentences,
-        keywords=["result", "show", "found", "demonstrat", "agree", "accuracy", "performance"],
-        limit=limit,
-    )
+def extract_limitations(sentences: Sequence[Dict[str, object]], limit: int = 2) -> List[Dict[str, object]]:
+    return pick_sentences(sentences, keywords=SUMMARY_CATEGORY_KEYWORDS["limitations"], limit=limit)
 
 
-def extract_methods(sentences: Sequence[Dict[str, object]], limit: int = 3) -> List[Dict[str, object]]:
-    return pick_sentences(
-        sentences,
-        keywords=[
-            "method",
-            "numerical",
-            "simulation",
-            "finite",
-            "spectral",
-            "lattice",
-            "solver",
-            "scheme",
-            "equation",
-        ],
-        limit=limit,
-    )
+class SentenceSelection(abc.ABC):
+    """Category-ordered sentence candidates with pick_sentences()-style selection."""
 
+    def __init__(self, sentences: Sequence[Dict[str, object]]) -> None:
+        self.sentences = sentences
+        self._norms: List[Optional[str]] = [None] * len(sentences)
 
-def extract_objective(sentences: Sequence[Dict[str, object]], limit: int = 2) -> List[Dict[str, object]]:
-    return pick_sentences(
-        sentences,
-        keywords=["this paper", "this study", "we present", "we investigate", "we propose", "aim", "objective"],
-        limit=limit,
-    )
+    def lowered(self, idx: int) -> str:
+        return str(self.sentences[idx]["text"]).lower()
 
+    @abc.abstractmethod
+    def iter_hits(self, category: str) -> Iterator[int]:
+        """Indices of the sentences matching `category`, best first."""
 
-def extract_limitations(sentences: Sequence[Dict[str, object]], limit: int = 2) -> List[Dict[str, object]]:
-    return pick_sentences(
-        sentences,
-        keywords=["limitation", "future", "however", "assume", "restricted", "challenge", "uncertain"],
-        limit=limit,
-    )
+    def _norm(self, idx: int) -> str:
+        norm = self._norms[idx]
+        if norm is None:
+            norm = re.sub(r"\s+", " ", self.lowered(idx))
+            self._norms[idx] = norm
+        return norm
+
+    def pick(self, category: str, limit: int) -> List[Dict[str, object]]:
+        """Category hits first (in iter_hits order), then page-order fallback, without duplicates."""
+        chosen: List[Dict[str, object]] = []
+        seen = set()
+        for idx in chain(self.iter_hits(category), range(len(self.sentences))):
+            norm = self._norm(idx)
+            if norm in seen:
+                continue
+            chosen.append(self.sentences[idx])
+            seen.add(norm)
+            if len(chosen) >= limit:
+                break
+        return chosen
+
+
+class ClassifiedSentences(SentenceSelection):
+    """Sentence pool tagged with summary categories by SentenceClassifier.
+
+    Per-category hit lists (page order) are shared by every pick() call. They are filled
+    window by window as picks consume them, so a category that finds its sentences on the
+    first pages never pays for scanning the rest of the paper. pick() then matches
+    pick_sentences() exactly.
+    """
+
+    FIRST_WINDOW = 64
+
+    def __init__(self, classifier: "SentenceClassifier", sentences: Sequence[Dict[str, object]]) -> None:
+        super().__init__(sentences)
+        self.classifier = classifier
+        self.buffer, self.starts = classifier.lowered_buffer([str(item["text"]) for item in sentences])
+        self.ranked: Dict[str, List[int]] = {category: [] for category in classifier.categories}
+        self._classified = 0
+        self._window = self.FIRST_WINDOW
+
+    def lowered(self, idx: int) -> str:
+        end = self.starts[idx + 1] - 1 if idx + 1 < len(self.starts) else len(self.buffer)
+        return self.buffer[self.starts[idx] : end]
+
+    def _classify_next_window(self) -> bool:
+        total = len(self.sentences)
+        if self._classified >= total:
+            return False
+        lo = self._classified
+        hi = min(total, lo + self._window)
+        self._window *= 2
+        masks = self.classifier.window_masks(self.buffer, self.starts, lo, hi)
+        hit_lists = [self.ranked[category] for category in self.classifier.categories]
+        for offset, mask in enumerate(masks):
+            bit = 0
+            while mask:
+                if mask & 1:
+                    hit_lists[bit].append(lo + offset)
+                mask >>= 1
+                bit += 1
+        self._classified = hi
+        return True
+
+    def iter_hits(self, category: str) -> Iterator[int]:
+        hits = self.ranked[category]
+        pos = 0
+        while True:
+            while pos < len(hits):
+                yield hits[pos]
+                pos += 1
+            if not self._classify_next_window():
+                return
+
+
+class SentenceClassifier:
+    """Tag sentences with every summary category in one pass per window.
+
+    All keyword lists are merged into one keyword -> category-bitmask table. The sentence
+    pool is joined into one newline-separated buffer and lowercased once; each distinct
+    keyword is located with a C-level substring scan over the buffer and its hits are
+    mapped back to sentence indices, instead of lowercasing and re-scanning every
+    sentence once per category.
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]] = SUMMARY_CATEGORY_KEYWORDS) -> None:
+        self.categories = list(categories)
+        masks: Dict[str, int] = {}
+        for bit, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                lowered = keyword.lower()
+                masks[lowered] = masks.get(lowered, 0) | (1 << bit)
+        self.keyword_masks: List[Tuple[str, int]] = [(kw, bits) for kw, bits in masks.items() if "\n" not in kw]
+
+    @staticmethod
+    def lowered_buffer(texts: List[str]) -> Tuple[str, List[int]]:
+        buffer = "\n".join(texts).lower()
+        lengths = [len(text) for text in texts]
+        if len(buffer) != max(0, sum(lengths) + len(texts) - 1):
+            # A few code points change length when lowercased; fall back to per-sentence lowering.
+            lowered = [text.lower() for text in texts]
+            buffer = "\n".join(lowered)
+            lengths = [len(text) for text in lowered]
+        starts: List[int] = []
+        offset = 0
+        for length in lengths:
+            starts.append(offset)
+            offset += length + 1
+        return buffer, starts
+
+    def window_masks(self, buffer: str, starts: List[int], lo: int, hi: int) -> List[int]:
+        """Category bitmask for each sentence in starts[lo:hi]."""
+        masks = [0] * (hi - lo)
+        end = starts[hi] - 1 if hi < len(starts) else len(buffer)
+        for keyword, bits in self.keyword_masks:
+            pos = buffer.find(keyword, starts[lo], end)
+            while pos != -1:
+                idx = bisect_right(starts, pos, lo, hi) - 1
+                masks[idx - lo] |= bits
+                if idx + 1 >= hi:
+                    break
+                pos = buffer.find(keyword, starts[idx + 1], end)
+        return masks
+
+    def classify(self, sentences: Sequence[Dict[str, object]]) -> ClassifiedSentences:
+        return ClassifiedSentences(self, sentences)
+
+
+SENTENCE_CLASSIFIER = SentenceClassifier()
+CATEGORY_QUERIES = category_queries(SUMMARY_CATEGORY_KEYWORDS)
+RANK_MODES = ("keyword", "bm25")
+DEFAULT_PAGE_LIMITS = {"keyword": 10, "bm25": 0}
+
+
+class Bm25RankedSentences(SentenceSelection):
+    """Sentence pool ranked per category by BM25 against the category keyword query."""
+
+    def __init__(self, sentences: Sequence[Dict[str, object]], stats: CorpusTermStats) -> None:
+        super().__init__(sentences)
+        index = SentenceIndex([tokenize_terms(str(item["text"])) for item in sentences])
+        self.ranked = {category: index.rank(query, stats) for category, query in CATEGORY_QUERIES.items()}
+
+    def iter_hits(self, category: str) -> Iterator[int]:
+        return iter(self.ranked[category])
+
+
+# Corpus statistics for BM25 mode; set in each worker process by init_ranking_worker().
+_CORPUS_STATS: Optional[CorpusTermStats] = None
+
+
+def init_ranking_worker(stats: Optional[CorpusTermStats]) -> None:
+    global _CORPUS_STATS
+    _CORPUS_STATS = stats
 
 
 def build_evidence_anchors(
@@ -231,157 +394,434 @@ def build_evidence_anchors(
     return unique[:14]
 
 
-def summarize_papers(manifest_path: Path, assets_dir: Path, out_json: Path) -> None:
-    manifest = load_json(manifest_path)
-    papers = manifest.get("papers", [])
-    if not isinstance(papers, list):
-        raise SystemExit("invalid manifest format")
-
-    summaries: List[Dict[str, object]] = []
-    bibliography: List[Dict[str, object]] = []
-
-    for citation_number, paper in enumerate(papers, start=1):
-        if not isinstance(paper, dict):
-            continue
-
-        paper_id = str(paper["paper_id"])
-        paper_dir = assets_dir / "papers" / paper_id
-        metadata_path = paper_dir / "metadata.json"
-        text_path = paper_dir / "text.txt"
-        eq_path = paper_dir / "equation_candidates.json"
-        fig_path = paper_dir / "figures_index.json"
-
-        if not metadata_path.exists():
-            print(f"[warn] missing metadata for {paper_id}; skipping")
-            continue
-
-        metadata = load_json(metadata_path)
-        pages = load_pages(text_path)
-        equations = load_json(eq_path) if eq_path.exists() else []
-        figures_index = load_json(fig_path) if fig_path.exists() else {"figures": []}
-
-        abstract_text, abstract_page = extract_abstract_snippet(pages)
-        sentence_pool = collect_sentences_with_pages(pages, page_limit=10)
+def prefetch_store_artifacts(store: ArtifactStore, papers: Sequence[object]) -> Dict[str, Dict[str, object]]:
+    """Bulk-load the artifacts the summarizer needs: one query per artifact type."""
+    paper_ids = [str(p["paper_id"]) for p in papers if isinstance(p, dict)]
+    return {
+        kind: store.load_all(kind, paper_ids)
+        for kind in ("metadata", "equation_candidates", "figures_index", "keyword_signals")
+    }
 
-        objective_sentences = extract_objective(sentence_pool, limit=2)
-        methods_sentences = extract_methods(sentence_pool, limit=3)
-        findings_sentences = extract_findings(sentence_pool, limit=3)
-        limitation_sentences = extract_limitations(sentence_pool, limit=2)
 
-        objective_text = format_paragraph_from_sentences(
-            objective_sentences,
-            fallback="Automated extraction could not isolate a clear objective sentence; see evidence anchors for source excerpts.",
-        )
-        methods_text = format_paragraph_from_sentences(
-            methods_sentences,
-            fallback="Method-specific language was sparse in extracted text; this summary relies on metadata and equation snippets.",
-        )
-        findings_text = format_paragraph_from_sentences(
-            findings_sentences,
-            fallback="Clear result statements were not confidently extracted from text; conclusions should be read directly in the source PDF.",
-        )
-        limitations_text = format_paragraph_from_sentences(
-            limitation_sentences,
-            fallback="Explicit limitations were not clearly stated in extracted text; treat this as an extraction-confidence caveat.",
-        )
+PaperInputs = Tuple[Optional[object], object, object, Optional[object]]
+
+
+def load_paper_inputs(paper_dir: Path) -> PaperInputs:
+    metadata_path = paper_dir / "metadata.json"
+    eq_path = paper_dir / "equation_candidates.json"
+    fig_path = paper_dir / "figures_index.json"
+    signals_path = paper_dir / "keyword_signals.json"
+    metadata = load_json(metadata_path) if metadata_path.exists() else None
+    equations = load_json(eq_path) if eq_path.exists() else []
+    figures_index = load_json(fig_path) if fig_path.exists() else {"figures": []}
+    signals = load_json(signals_path) if signals_path.exists() else None
+    return metadata, equations, figures_index, signals
+
+
+SummaryResult = Tuple[str, Optional[Dict[str, object]], Optional[Dict[str, object]]]
+
+
+class SummaryTask(NamedTuple):
+    citation_number: int
+    paper: Dict[str, object]
+    assets_dir: str
+    inputs: Optional[PaperInputs]
+    rank_mode: str
+    page_limit: int
+    cached: Optional[SummaryResult] = None
+
+
+def paper_input_hash(task: SummaryTask, corpus_digest: str = "") -> str:
+    """Hash of everything summarize_paper reads for one paper, plus the settings that shape its output."""
+    paper_dir = Path(task.assets_dir) / "papers" / str(task.paper["paper_id"])
+    digest = hashlib.sha256()
+    for part in (
+        SUMMARIZER_VERSION,
+        task.rank_mode,
+        str(task.page_limit),
+        corpus_digest,
+        json.dumps(task.paper, sort_keys=True, ensure_ascii=False),
+    ):
+        digest.update(part.encode("utf-8") + b"\0")
+    file_names = PAPER_INPUT_FILES[:1] if task.inputs is not None else PAPER_INPUT_FILES
+    for name in file_names:
+        path = paper_dir / name
+        digest.update(path.read_bytes() if path.exists() else b"")
+        digest.update(b"\0")
+    if task.inputs is not None:
+        for value in task.inputs:
+            digest.update(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def cached_summary(entry: object, input_hash: str, citation_number: int) -> Optional[SummaryResult]:
+    """Reuse a stored summary record if its input hash still matches; renumber it for this run."""
+    if not isinstance(entry, dict) or entry.get("input_hash") != input_hash:
+        return None
+    record = entry.get("summary")
+    bibliography_entry = entry.get("bibliography")
+    if not isinstance(record, dict) or not isinstance(bibliography_entry, dict):
+        return None
+    record["citation_number"] = citation_number
+    bibliography_entry["id"] = citation_number
+    return str(record["paper_id"]), record, bibliography_entry
+
+
+def paper_term_counts_task(task: Tuple[str, int]) -> Tuple[Counter, int, int]:
+    """BM25 pre-pass for one paper: sentence-level term counts of its text."""
+    paper_dir, page_limit = task
+    pages = load_pages(Path(paper_dir) / "text.txt")
+    sentences = collect_sentences_with_pages(pages, page_limit=page_limit)
+    return paper_term_counts(tokenize_terms(str(item["text"])) for item in sentences)
+
+
+def summarize_paper(task: SummaryTask) -> SummaryResult:
+    """Summarize one paper into (paper_id, summary_record, bibliography_entry).
+
+    Kept at module level and free of shared state (BM25 corpus statistics are installed
+    per process by init_ranking_worker) so it can run in a process pool.
+    Record and entry are None when the paper has no metadata.
+    """
+    if task.cached is not None:
+        return task.cached
+    paper = task.paper
+    paper_id = str(paper["paper_id"])
+    citation_number = task.citation_number
+    paper_dir = Path(task.assets_dir) / "papers" / paper_id
+
+    metadata, equations, figures_index, signals = task.inputs if task.inputs is not None else load_paper_inputs(paper_dir)
+    if not isinstance(metadata, dict):
+        return paper_id, None, None
+
+    pages = load_pages(paper_dir / "text.txt")
+
+    abstract_text, abstract_page = extract_abstract_snippet(pages)
+    sentence_pool = collect_sentences_with_pages(pages, page_limit=task.page_limit)
+
+    if task.rank_mode == "bm25":
+        if _CORPUS_STATS is None:
+            raise RuntimeError("bm25 ranking requires corpus statistics (init_ranking_worker)")
+        selection: SentenceSelection = Bm25RankedSentences(sentence_pool, _CORPUS_STATS)
+    else:
+        selection = SENTENCE_CLASSIFIER.classify(sentence_pool)
+    objective_sentences = selection.pick("objective", limit=2)
+    methods_sentences = selection.pick("methods", limit=3)
+    findings_sentences = selection.pick("findings", limit=3)
+    limitation_sentences = selection.pick("limitations", limit=2)
+
+    objective_text = format_paragraph_from_sentences(
+        objective_sentences,
+        fallback="Automated extraction could not isolate a clear objective sentence; see evidence anchors for source excerpts.",
+    )
+    methods_text = format_paragraph_from_sentences(
+        methods_sentences,
+        fallback="Method-specific language was sparse in extracted text; this summary relies on metadata and equation snippets.",
+    )
+    findings_text = format_paragraph_from_sentences(
+        findings_sentences,
+        fallback="Clear result statements were not confidently extracted from text; conclusions should be read directly in the source PDF.",
+    )
+    limitations_text = format_paragraph_from_sentences(
+        limitation_sentences,
+        fallback="Explicit limitations were not clearly stated in extracted text; treat this as an extraction-confidence caveat.",
+    )
 
-        key_equations = equations[:5] if isinstance(equations, list) else []
-        if not key_equations:
-            key_equations = [
-                {
-                    "equation": "No extractable governing equation found in machine-readable text.",
-                    "page": 1,
-                    "score": 0,
-                }
-            ]
+    key_equations = equations[:5] if isinstance(equations, list) else []
+    if not key_equations:
+        key_equations = [
+            {
+                "equation": "No extractable governing equation found in machine-readable text.",
+                "page": 1,
+                "score": 0,
+            }
+        ]
 
-        figures = figures_index.get("figures", []) if isinstance(figures_index, dict) else []
+    figures = figures_index.get("figures", []) if isinstance(figures_index, dict) else []
 
-        evidence = build_evidence_anchors(
-            objective_sentences,
-            methods_sentences,
-            findings_sentences,
-            limitation_sentences,
-            key_equations,
-        )
-        if not evidence:
-            evidence = [
-                {
-                    "tag": "fallback",
-                    "page": abstract_page,
-                    "quote": abstract_text[:280] if abstract_text else "No evidence text extracted.",
-                }
-            ]
-
-        full_text_for_obs = "\n".join(pages[:8])
-        repo_observations = build_repo_observations(full_text_for_obs)
-
-        title = str(metadata.get("title") or paper.get("canonical_file_name") or paper_id)
-        citation = str(metadata.get("vancouver_citation") or title)
-        doi = str(metadata.get("doi") or "")
-        url = str(metadata.get("url") or "")
-
-        summary_record = {
-            "paper_id": paper_id,
-            "citation_number": citation_number,
-            "title": title,
-            "canonical_file_name": paper.get("canonical_file_name"),
-            "alias_file_names": paper.get("alias_file_names", []),
-            "objective": objective_text,
-            "methods": methods_text,
-            "findings": findings_text,
-            "limitations": limitations_text,
-            "abstract_excerpt": abstract_text,
-            "key_equations": key_equations,
-            "repo_observations": repo_observations,
-            "evidence_anchors": evidence,
-            "figures": figures,
-            "citation": citation,
-            "doi": doi,
-            "url": url,
-            "year": metadata.get("year", ""),
-            "journal": metadata.get("journal", ""),
-            "authors": metadata.get("authors", []),
-            "text_quality": metadata.get("extraction", {}).get("text_quality", {}).get("quality", "unknown"),
-            "figure_count": len(figures),
-            "equation_count": len(key_equations),
-        }
-
-        summaries.append(summary_record)
-        bibliography.append(
+    evidence = build_evidence_anchors(
+        objective_sentences,
+        methods_sentences,
+        findings_sentences,
+        limitation_sentences,
+        key_equations,
+    )
+    if not evidence:
+        evidence = [
             {
-                "id": citation_number,
-                "paper_id": paper_id,
-                "title": title,
-                "citation": citation,
-                "doi": doi,
-                "url": url,
+                "tag": "fallback",
+                "page": abstract_page,
+                "quote": abstract_text[:280] if abstract_text else "No evidence text extracted.",
             }
+        ]
+
+    full_text_for_obs = "\n".join(pages[:KEYWORD_SIGNAL_PAGES])
+    repo_observations = build_repo_observations(full_text_for_obs, signals)
+
+    title = str(metadata.get("title") or paper.get("canonical_file_name") or paper_id)
+    citation = str(metadata.get("vancouver_citation") or title)
+    doi = str(metadata.get("doi") or "")
+    url = str(metadata.get("url") or "")
+
+    summary_record = {
+        "paper_id": paper_id,
+        "citation_number": citation_number,
+        "title": title,
+        "canonical_file_name": paper.get("canonical_file_name"),
+        "alias_file_names": paper.get("alias_file_names", []),
+        "objective": objective_text,
+        "methods": methods_text,
+        "findings": findings_text,
+        "limitations": limitations_text,
+        "abstract_excerpt": abstract_text,
+        "key_equations": key_equations,
+        "repo_observations": repo_observations,
+        "evidence_anchors": evidence,
+        "figures": figures,
+        "citation": citation,
+        "doi": doi,
+        "url": url,
+        "year": metadata.get("year", ""),
+        "journal": metadata.get("journal", ""),
+        "authors": metadata.get("authors", []),
+        "text_quality": metadata.get("extraction", {}).get("text_quality", {}).get("quality", "unknown"),
+        "figure_count": len(figures),
+        "equation_count": len(key_equations),
+    }
+    summary_record["method_tags"] = summary_method_tags(summary_record)
+
+    bibliography_entry = {
+        "id": citation_number,
+        "paper_id": paper_id,
+        "title": title,
+        "citation": citation,
+        "doi": doi,
+        "url": url,
+    }
+    return paper_id, summary_record, bibliography_entry
+
+
+def iter_ordered_results(
+    func: Callable[[T], R],
+    tasks: Iterable[T],
+    jobs: int,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[object, ...] = (),
+) -> Iterator[R]:
+    """Yield func(task) in task order, running up to `jobs` tasks in worker processes.
+
+    At most a small window of tasks is in flight, so results never pile up in memory.
+    `initializer(*initargs)` runs once per worker (or once in-process when jobs <= 1).
+    """
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield func(task)
+        return
+
+    window = jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+        pending: Deque[Future] = deque()
+        for task in tasks:
+            pending.append(executor.submit(func, task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _json_block(value: object, level: int) -> str:
+    # Matches json_dump(indent=2) output for a value nested `level` containers deep.
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + "  " * level)
+
+
+def write_summary_document(
+    out_json: Path,
+    header: Dict[str, object],
+    records_path: Path,
+    trailer: Dict[str, object],
+) -> None:
+    """Assemble the summary JSON by streaming spooled paper records from disk.
+
+    Output is byte-identical to json_dump() of the equivalent in-memory document.
+    """
+    ensure_dir(out_json.parent)
+    with out_json.open("w", encoding="utf-8") as out, records_path.open("r", encoding="utf-8") as records:
+        out.write("{")
+        for key, value in header.items():
+            out.write(f"\n  {json.dumps(key)}: {_json_block(value, 1)},")
+        out.write('\n  "papers": [')
+        first = True
+        for line in records:
+            out.write("\n    " if first else ",\n    ")
+            out.write(_json_block(json.loads(line), 2))
+            first = False
+        out.write("]" if first else "\n  ]")
+        for key, value in trailer.items():
+            out.write(f",\n  {json.dumps(key)}: {_json_block(value, 1)}")
+        out.write("\n}")
+
+
+def summarize_papers(
+    manifest_path: Path,
+    assets_dir: Path,
+    out_json: Path,
+    store: Optional[ArtifactStore] = None,
+    jobs: int = 1,
+    rank_mode: str = "keyword",
+    page_limit: Optional[int] = None,
+    incremental: bool = False,
+) -> None:
+    manifest = load_json(manifest_path)
+    papers = manifest.get("papers", [])
+    if not isinstance(papers, list):
+        raise SystemExit("invalid manifest format")
+    if rank_mode not in RANK_MODES:
+        raise SystemExit(f"unknown rank mode: {rank_mode}")
+    if page_limit is None:
+        page_limit = DEFAULT_PAGE_LIMITS[rank_mode]
+
+    prefetched = prefetch_store_artifacts(store, papers) if store else None
+    cached_records = store.load_all("summary_record") if store and incremental else {}
+
+    corpus_stats: Optional[CorpusTermStats] = None
+    if rank_mode == "bm25":
+        # Corpus-wide IDF is computed once, before any paper is ranked.
+        corpus_stats = CorpusTermStats()
+        stat_tasks = (
+            (str(assets_dir / "papers" / str(paper["paper_id"])), page_limit)
+            for paper in papers
+            if isinstance(paper, dict)
+        )
+        for counts in iter_ordered_results(paper_term_counts_task, stat_tasks, jobs):
+            corpus_stats.add_counts(*counts)
+        corpus_stats.finalize()
+        print(
+            f"[ok] bm25 corpus index | sentences={corpus_stats.sentence_count} "
+            f"| terms={len(corpus_stats.idf)}"
         )
 
-        print(f"[ok] summarized {paper_id} | figs={len(figures)} | eq={len(key_equations)}")
+    corpus_digest = corpus_stats.digest() if corpus_stats is not None else ""
+    input_hashes: Dict[str, str] = {}
+    reused_ids = set()
+
+    def build_tasks() -> Iterator[SummaryTask]:
+        for citation_number, paper in enumerate(papers, start=1):
+            if not isinstance(paper, dict):
+                continue
+            paper_id = str(paper["paper_id"])
+            inputs = None
+            if prefetched is not None:
+                inputs = (
+                    prefetched["metadata"].get(paper_id),
+                    prefetched["equation_candidates"].get(paper_id, []),
+                    prefetched["figures_index"].get(paper_id, {"figures": []}),
+                    prefetched["keyword_signals"].get(paper_id),
+                )
+            task = SummaryTask(citation_number, paper, str(assets_dir), inputs, rank_mode, page_limit)
+            if incremental:
+                input_hash = paper_input_hash(task, corpus_digest)
+                input_hashes[paper_id] = input_hash
+                if store:
+                    entry = cached_records.pop(paper_id, None)
+                else:
+                    record_path = assets_dir / "papers" / paper_id / SUMMARY_RECORD_FILE
+                    entry = load_json(record_path) if record_path.exists() else None
+                cached = cached_summary(entry, input_hash, citation_number)
+                if cached is not None:
+                    reused_ids.add(paper_id)
+                    task = task._replace(cached=cached)
+            yield task
 
-    output = {
+    bibliography: List[Dict[str, object]] = []
+    validation = {
+        "all_have_citations": True,
+        "all_have_evidence": True,
+        "all_have_equation_or_fallback": True,
+    }
+    summarized_records = 0
+    reused_records = 0
+    header: Dict[str, object] = {
         "generated_at_utc": utc_now_iso(),
         "manifest_path": str(manifest_path.resolve()),
         "assets_dir": str(assets_dir.resolve()),
-        "corpus_summary": {
-            "source_total_files": manifest.get("source_total_files"),
-            "source_unique_files": manifest.get("source_unique_files"),
-            "summarized_records": len(summaries),
-            "duplicate_groups": sum(1 for p in papers if isinstance(p, dict) and int(p.get("duplicate_count", 0)) > 0),
-        },
-        "papers": summaries,
-        "bibliography": bibliography,
-        "validation": {
-            "all_have_citations": all(bool(item.get("citation")) for item in summaries),
-            "all_have_evidence": all(len(item.get("evidence_anchors", [])) > 0 for item in summaries),
-            "all_have_equation_or_fallback": all(len(item.get("key_equations", [])) > 0 for item in summaries),
-        },
     }
 
-    json_dump(out_json, output)
-    print(json.dumps({"summary_json": str(out_json.resolve()), "papers": len(summaries)}, indent=2))
+    # JSON Lines output is written paper by paper. Classic JSON output spools completed records to
+    # disk in citation order, then streams them into the final document.
+    jsonl = is_jsonl_path(out_json)
+    records_path = out_json.with_name(out_json.name + ".records.jsonl")
+    ensure_dir(out_json.parent)
+    lines_writer = SummaryLinesWriter(out_json, header) if jsonl else None
+    spool = None if jsonl else records_path.open("w", encoding="utf-8")
+    try:
+        for paper_id, summary_record, bibliography_entry in iter_ordered_results(
+            summarize_paper, build_tasks(), jobs, initializer=init_ranking_worker, initargs=(corpus_stats,)
+        ):
+            if summary_record is None or bibliography_entry is None:
+                print(f"[warn] missing metadata for {paper_id}; skipping")
+                continue
+
+            if lines_writer is not None:
+                lines_writer.write_paper(summary_record, bibliography_entry)
+            else:
+                spool.write(json.dumps(summary_record, ensure_ascii=False) + "\n")
+                bibliography.append(bibliography_entry)
+            summarized_records += 1
+            validation["all_have_citations"] &= bool(summary_record.get("citation"))
+            validation["all_have_evidence"] &= len(summary_record.get("evidence_anchors", [])) > 0
+            validation["all_have_equation_or_fallback"] &= len(summary_record.get("key_equations", [])) > 0
+
+            if paper_id in reused_ids:
+                reused_records += 1
+                continue
+            if incremental:
+                entry = {
+                    "input_hash": input_hashes[paper_id],
+                    "summary": summary_record,
+                    "bibliography": bibliography_entry,
+                }
+                if store:
+                    store.put("summary_record", paper_id, entry)
+                else:
+                    json_dump(assets_dir / "papers" / paper_id / SUMMARY_RECORD_FILE, entry)
+            print(
+                f"[ok] summarized {paper_id} | figs={summary_record['figure_count']} "
+                f"| eq={summary_record['equation_count']}"
+            )
+    except BaseException:
+        if lines_writer is not None:
+            lines_writer.abort()
+        raise
+    finally:
+        if spool is not None:
+            spool.close()
+
+    corpus_summary = {
+        "source_total_files": manifest.get("source_total_files"),
+        "source_unique_files": manifest.get("source_unique_files"),
+        "summarized_records": summarized_records,
+        "duplicate_groups": sum(1 for p in papers if isinstance(p, dict) and int(p.get("duplicate_count", 0)) > 0),
+    }
+    if lines_writer is not None:
+        lines_writer.close({"corpus_summary": corpus_summary, "validation": validation})
+    else:
+        write_summary_document(
+            out_json,
+            {**header, "corpus_summary": corpus_summary},
+            records_path,
+            {"bibliography": bibliography, "validation": validation},
+        )
+        records_path.unlink(missing_ok=True)
+
+    if store:
+        with out_json.open("r", encoding="utf-8") as handle:
+            store.put_document_lines("paper_summaries", handle)
+    result: Dict[str, object] = {"summary_json": str(out_json.resolve()), "papers": summarized_records}
+    if incremental:
+        result["reused"] = reused_records
+        result["resummarized"] = summarized_records - reused_records
+    print(json.dumps(result, indent=2))
 
 
 def parse_args() -> argparse.Namespace:
@@ -391,17 +831,61 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Summarize extracted paper assets into structured JSON.")
     parser.add_argument("--manifest", type=Path, default=default_out_dir / "manifest_unique.json")
     parser.add_argument("--assets-dir", type=Path, default=default_out_dir)
-    parser.add_argument("--out-json", type=Path, default=default_out_dir / "paper_summaries.json")
+    parser.add_argument(
+        "--out-json",
+        type=Path,
+        default=default_out_dir / "paper_summaries.json",
+        help="Summary output; a .jsonl suffix writes streaming JSON Lines (header, one line per paper, footer).",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Optional SQLite artifact store written by extract_assets.py --store.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for per-paper summarization (output order is unchanged).",
+    )
+    parser.add_argument(
+        "--rank-mode",
+        choices=RANK_MODES,
+        default="keyword",
+        help="Sentence selection: first keyword hit in page order, or BM25 against a corpus-level index.",
+    )
+    parser.add_argument(
+        "--page-limit",
+        type=int,
+        default=None,
+        help="Pages scanned for summary sentences; 0 means all (default: 10 for keyword, all for bm25).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse per-paper summary records whose inputs are unchanged; re-summarize only new or changed papers.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    summarize_papers(
-        manifest_path=args.manifest.resolve(),
-        assets_dir=args.assets_dir.resolve(),
-        out_json=args.out_json.resolve(),
-    )
+    store = ArtifactStore(args.store.resolve()) if args.store else None
+    try:
+        summarize_papers(
+            manifest_path=args.manifest.resolve(),
+            assets_dir=args.assets_dir.resolve(),
+            out_json=args.out_json.resolve(),
+            store=store,
+            jobs=args.jobs,
+            rank_mode=args.rank_mode,
+            page_limit=args.page_limit,
+            incremental=args.incremental,
+        )
+    finally:
+        if store:
+            store.close()
 
 
 if __name__ == "__main__":
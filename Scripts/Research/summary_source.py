@@ -0,0 +1,194 @@
+﻿#!/usr/bin/env python3
+"""Readers and writers for the paper_summaries document (one JSON document or JSON Lines)."""
+
+from __future__ import annotations
+
+import json
+import os
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from research_common import ensure_dir
+
+JSONL_SUFFIX = ".jsonl"
+JSONL_FORMAT = "paper_summaries.jsonl"
+JSONL_VERSION = 1
+
+
+def is_jsonl_path(path: Path) -> bool:
+    return path.suffix.lower() == JSONL_SUFFIX
+
+
+def is_jsonl_text(text: str) -> bool:
+    first_line = text.lstrip("﻿").split("\n", 1)[0]
+    try:
+        record = json.loads(first_line)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(record, dict) and record.get("format") == JSONL_FORMAT
+
+
+class SummaryLinesWriter:
+    """Writes paper_summaries as JSON Lines: a header line, one line per paper, then a footer line.
+
+    Papers are written as soon as they are summarized, so nothing accumulates in memory.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, object]) -> None:
+        ensure_dir(path.parent)
+        self.path = path
+        self.handle: TextIO = path.open("w", encoding="utf-8")
+        self._write_line({"kind": "header", "format": JSONL_FORMAT, "version": JSONL_VERSION, **header})
+
+    def _write_line(self, record: Dict[str, object]) -> None:
+        self.handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_paper(self, summary_record: Dict[str, object], bibliography_entry: Dict[str, object]) -> None:
+        self._write_line({"kind": "paper", "paper": summary_record, "bibliography": bibliography_entry})
+
+    def close(self, footer: Dict[str, object]) -> None:
+        self._write_line({"kind": "footer", **footer})
+        self.handle.close()
+
+    def abort(self) -> None:
+        """Close without a footer; readers reject the document as truncated."""
+        if not self.handle.closed:
+            self.handle.close()
+
+
+def _read_last_line(path: Path, chunk_size: int = 64 * 1024) -> str:
+    """Last non-empty line of a file, read backwards from the end."""
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        end = handle.tell()
+        buffer = b""
+        while end > 0:
+            start = max(0, end - chunk_size)
+            handle.seek(start)
+            buffer = handle.read(end - start) + buffer
+            end = start
+            stripped = buffer.rstrip(b"\r\n")
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1].decode("utf-8", errors="ignore")
+        return buffer.rstrip(b"\r\n").decode("utf-8", errors="ignore")
+
+
+class SummarySource:
+    """Lazy view over a paper_summaries document.
+
+    JSON Lines sources are re-read on every `papers()` pass, so memory stays flat; only the
+    header and footer lines are held. Classic JSON documents are parsed once and wrapped.
+    """
+
+    def __init__(
+        self,
+        header: Dict[str, object],
+        footer: Dict[str, object],
+        open_lines: Optional[Callable[[], ContextManager[Iterable[str]]]] = None,
+        data: Optional[Dict[str, object]] = None,
+    ) -> None:
+        self.header = header
+        self.footer = footer
+        self._open_lines = open_lines
+        self._data = data
+
+    @classmethod
+    def from_data(cls, data: object) -> "SummarySource":
+        if not isinstance(data, dict):
+            raise SystemExit("summary document not found")
+        if not isinstance(data.get("papers", []), list):
+            raise SystemExit("invalid summary: papers is not a list")
+        return cls(header=data, footer=data, data=data)
+
+    @classmethod
+    def from_lines(
+        cls, open_lines: Callable[[], ContextManager[Iterable[str]]], last_line: Optional[str] = None
+    ) -> "SummarySource":
+        with open_lines() as handle:
+            handle = iter(handle)
+            header = json.loads(next(handle, "{}").lstrip("﻿"))
+            if last_line is None:
+                for line in handle:
+                    if line.strip():
+                        last_line = line
+        footer = json.loads(last_line) if last_line else {}
+        if header.get("kind") != "header" or footer.get("kind") != "footer":
+            raise SystemExit("invalid summary: truncated JSON Lines document")
+        return cls(header=header, footer=footer, open_lines=open_lines)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "SummarySource":
+        if not path.exists():
+            raise SystemExit(f"summary document not found: {path}")
+        with path.open("r", encoding="utf-8-sig", errors="ignore") as handle:
+            first_line = handle.readline()
+        if is_jsonl_text(first_line):
+            return cls.from_lines(
+                lambda: path.open("r", encoding="utf-8-sig", errors="ignore"),
+                last_line=_read_last_line(path),
+            )
+        return cls.from_data(json.loads(path.read_text(encoding="utf-8", errors="ignore")))
+
+    @classmethod
+    def from_line_reader(
+        cls, read_lines: Callable[[], Iterator[str]], last_line: Optional[str] = None
+    ) -> "SummarySource":
+        """Source over a document supplied line by line, e.g. ArtifactStore.iter_document_lines."""
+        with closing(read_lines()) as lines:
+            first_line = next(lines, None)
+        if first_line is None:
+            raise SystemExit("summary document not found")
+        if is_jsonl_text(first_line):
+            return cls.from_lines(lambda: closing(read_lines()), last_line=last_line)
+        return cls.from_data(json.loads("".join(read_lines())))
+
+    def _paper_lines(self) -> Iterator[Dict[str, object]]:
+        assert self._open_lines is not None
+        with self._open_lines() as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("kind") == "paper":
+                    yield record
+
+    def papers(self) -> Iterator[Dict[str, object]]:
+        if self._data is not None:
+            yield from (paper for paper in self._data.get("papers", []) if isinstance(paper, dict))
+            return
+        for record in self._paper_lines():
+            paper = record.get("paper")
+            if isinstance(paper, dict):
+                yield paper
+
+    def bibliography(self) -> Iterator[Dict[str, object]]:
+        if self._data is not None:
+            yield from (item for item in self._data.get("bibliography", []) if isinstance(item, dict))
+            return
+        for record in self._paper_lines():
+            item = record.get("bibliography")
+            if isinstance(item, dict):
+                yield item
+
+    @property
+    def corpus_summary(self) -> Dict[str, object]:
+        corpus = self.footer.get("corpus_summary", self.header.get("corpus_summary", {}))
+        return corpus if isinstance(corpus, dict) else {}
+
+    @property
+    def validation(self) -> Dict[str, object]:
+        validation = self.footer.get("validation", {})
+        return validation if isinstance(validation, dict) else {}
+
+    def to_document(self) -> Dict[str, object]:
+        """Materialize the classic single-document layout (loads every paper)."""
+        if self._data is not None:
+            return self._data
+        document = {key: value for key, value in self.header.items() if key not in ("kind", "format", "version")}
+        papers: List[Dict[str, object]] = list(self.papers())
+        document["corpus_summary"] = self.corpus_summary
+        document["papers"] = papers
+        document["bibliography"] = list(self.bibliography())
+        document["validation"] = self.validation
+        return document
@@ -75,8 +75,10 @@ classdef HardwareMonitorBridge < handle
             % Create Python logger instance.
             % Raw sensor logs are stored outside run folders so a single
             % sensor stream can be reused for comparative studies.
+            % CSV format: get_statistics/compare_runs read the log with readtable.
             obj.py_logger = py.hardware_monitor.SensorDataLogger(...
-                pyargs('output_dir', '../../sensor_logs', 'interval', 0.5));  % Relative to Scripts/Sustainability/
+                pyargs('output_dir', '../../sensor_logs', 'interval', 0.5, ...  % Relative to Scripts/Sustainability/
+                'log_format', 'csv'));
             
             fprintf('[MONITOR] Initialized. Python script: %s\n', obj.python_script_path);
         end
@@ -199,6 +201,29 @@ classdef HardwareMonitorBridge < handle
             end
         end
         
+        function stats = get_live_statistics(obj)
+            % Whole-run statistics from the Python logger's running aggregates
+            %
+            % Constant time and usable while logging (e.g. from update_live_monitor);
+            % missing values are NaN.
+            %
+            % Returns:
+            %   stats (struct): num_samples, duration_seconds, <field>_mean/_max/_std, energy_*
+            
+            py_stats = obj.py_logger.get_statistics();
+            stats = struct();
+            keys = cell(py.list(py_stats.keys()));
+            for i = 1:numel(keys)
+                value = py_stats.get(keys{i});
+                if isa(value, 'py.NoneType')
+                    value = NaN;
+                elseif ~isnumeric(value)
+                    value = double(value);
+                end
+                stats.(char(keys{i})) = value;
+            end
+        end
+        
         function report = generate_report(obj, output_file)
             % Generate sustainability analysis report
             %
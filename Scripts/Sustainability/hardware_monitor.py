@@ -19,6 +19,7 @@ Date: January 27, 2026
 """
 
 import psutil
+import os
 import time
 import json
 import csv
@@ -28,10 +29,10 @@ import platform
 import logging
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields
+from operator import attrgetter
 from typing import Optional, List, Dict, Tuple
 import threading
-import queue
 
 # Configure logging
 logging.basicConfig(
@@ -73,6 +74,353 @@ class HardwareSensors:
         return list(self.to_dict().values())
 
 
+# Fixed on-disk dtype per HardwareSensors field for columnar logs (None is stored as NaN)
+SENSOR_DTYPES: Dict[str, type] = {
+    f.name: (np.bool_ if f.type is bool else np.float64) for f in fields(HardwareSensors)
+}
+# Fields that are None when a sensor is unavailable
+OPTIONAL_SENSOR_FIELDS = frozenset(f.name for f in fields(HardwareSensors) if f.default is None)
+LOG_FORMATS = ('npz', 'csv')
+# 'none': flush batches to the OS only (survives a crashed or killed process)
+# 'batch': fsync every batch (also survives power loss); 'close': fsync once at the end
+FSYNC_POLICIES = ('none', 'batch', 'close')
+# Streamed binary log of an 'npz' run: one JSON header line, then fixed-size records
+RECORD_STREAM_SUFFIX = '.rec'
+RECORD_STREAM_MAGIC = b'SENSOR-RECORDS 1 '
+RECORD_DTYPE = np.dtype([
+    (name, '|b1' if dtype is np.bool_ else '<f8') for name, dtype in SENSOR_DTYPES.items()
+])
+
+
+def readings_to_columns(readings: List[HardwareSensors]) -> Dict[str, np.ndarray]:
+    """
+    Convert readings to one fixed-dtype array per sensor field
+    
+    Args:
+        readings: Sensor readings in time order
+    
+    Returns:
+        Dictionary of field name -> array (NaN where a reading was None)
+    """
+    names = list(SENSOR_DTYPES)
+    rows = list(map(attrgetter(*names), readings))
+    values = zip(*rows) if rows else [()] * len(names)
+    # float64 arrays turn None into NaN on construction
+    return {
+        name: np.array(column, dtype=SENSOR_DTYPES[name])
+        for name, column in zip(names, values)
+    }
+
+
+def columns_to_readings(columns: Dict[str, np.ndarray]) -> List[HardwareSensors]:
+    """Rebuild HardwareSensors objects from columnar arrays (NaN -> None for optional fields)"""
+    values = []
+    for name in SENSOR_DTYPES:
+        column = columns[name]
+        if name in OPTIONAL_SENSOR_FIELDS:
+            values.append(np.where(np.isnan(column), None, column).tolist())
+        else:
+            values.append(column.tolist())
+    return [HardwareSensors(*row) for row in zip(*values)]
+
+
+def columns_to_records(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Pack columns into a RECORD_DTYPE structured array (one fixed-size record per sample)"""
+    records = np.empty(len(columns['timestamp']), dtype=RECORD_DTYPE)
+    for name in RECORD_DTYPE.names:
+        records[name] = columns[name]
+    return records
+
+
+def read_record_stream(path: Path) -> Dict[str, np.ndarray]:
+    """
+    Read a streamed .rec log, ignoring a record that was cut off mid-write
+    
+    Args:
+        path: Path to the record stream
+    
+    Returns:
+        Dictionary of field name -> array
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not header.endswith(b'\n'):
+        # Killed before the header was complete: no samples yet
+        return {name: np.empty(0, dtype=RECORD_DTYPE[name]) for name in RECORD_DTYPE.names}
+    if not header.startswith(RECORD_STREAM_MAGIC):
+        raise ValueError(f"Not a sensor record stream: {path}")
+    dtype = np.dtype([tuple(item) for item in json.loads(header[len(RECORD_STREAM_MAGIC):])])
+    records = np.frombuffer(body, dtype=dtype, count=len(body) // dtype.itemsize)
+    return {name: np.ascontiguousarray(records[name]) for name in dtype.names}
+
+
+def save_columns_npz(path: Path, columns: Dict[str, np.ndarray]) -> None:
+    """Write columnar sensor data as a compressed .npz (one array per field)"""
+    np.savez_compressed(path, **columns)
+
+
+def csv_rows(columns: Dict[str, np.ndarray]) -> List[tuple]:
+    """Format columnar sensor data as CSV rows (NaN -> empty cell)"""
+    formatted = []
+    for name in SENSOR_DTYPES:
+        column = columns[name]
+        if column.dtype == np.bool_:
+            formatted.append(['True' if value else 'False' for value in column.tolist()])
+        else:
+            formatted.append(['' if value != value else repr(value) for value in column.tolist()])
+    return list(zip(*formatted))
+
+
+def write_columns_csv(path: Path, columns: Dict[str, np.ndarray]) -> None:
+    """Write columnar sensor data as CSV (same layout the MATLAB bridge reads with readtable)"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(SENSOR_DTYPES))
+        writer.writerows(csv_rows(columns))
+
+
+def load_sensor_columns(log_file: Path) -> Dict[str, np.ndarray]:
+    """
+    Load a sensor log (.npz, .csv or a streamed .rec) as fixed-dtype columns
+    
+    Fields missing from older logs are filled with NaN (False for flags). A row or
+    record cut off mid-write, e.g. by a run that was killed, is skipped.
+    
+    Args:
+        log_file: Path to the log file
+    
+    Returns:
+        Dictionary of field name -> array
+    """
+    log_file = Path(log_file)
+    if log_file.suffix == '.npz':
+        with np.load(log_file) as data:
+            raw = {name: data[name] for name in data.files}
+    elif log_file.suffix == RECORD_STREAM_SUFFIX:
+        raw = read_record_stream(log_file)
+    else:
+        with open(log_file, 'r', newline='') as f:
+            text = f.read()
+        # Drop a last line that was cut off mid-write
+        lines = text.splitlines()
+        if text and not text.endswith('\n'):
+            lines = lines[:-1]
+        reader = csv.reader(lines)
+        header = next(reader, [])
+        rows = [row for row in reader if len(row) == len(header)]
+        raw = {}
+        for name, column in zip(header, zip(*rows) if rows else [()] * len(header)):
+            if SENSOR_DTYPES.get(name) is np.bool_:
+                raw[name] = np.array([value == 'True' for value in column], dtype=np.bool_)
+            else:
+                raw[name] = np.array([float(value) if value and value != 'None' else np.nan for value in column])
+    
+    num_samples = len(next(iter(raw.values()))) if raw else 0
+    columns = {}
+    for name, dtype in SENSOR_DTYPES.items():
+        if name in raw:
+            columns[name] = np.asarray(raw[name], dtype=dtype)
+        else:
+            columns[name] = np.zeros(num_samples, dtype=dtype) if dtype is np.bool_ else np.full(num_samples, np.nan)
+    return columns
+
+
+def export_log_csv(log_file: Path, csv_file: Optional[Path] = None) -> Path:
+    """
+    Export a sensor log to CSV, e.g. for MATLAB readtable or spreadsheets
+    
+    Args:
+        log_file: Source log (.npz or .csv)
+        csv_file: Destination (default: log_file with a .csv suffix)
+    
+    Returns:
+        Path to the written CSV file
+    """
+    log_file = Path(log_file)
+    csv_file = Path(csv_file) if csv_file else log_file.with_suffix('.csv')
+    write_columns_csv(csv_file, load_sensor_columns(log_file))
+    return csv_file
+
+
+class SensorLogWriter:
+    """
+    Append-only sensor log that stays readable during a run
+    Writes batches as CSV rows or fixed-size binary records; readers skip a
+    trailing row/record cut off by a crash, so the log is usable at any moment
+    """
+    
+    def __init__(self, path: Path, stream_format: str = 'rec', fsync: str = 'batch'):
+        """
+        Create the log file and write its header
+        
+        Args:
+            path: Log file to create
+            stream_format: 'rec' (binary records, see RECORD_DTYPE) or 'csv'
+            fsync: One of FSYNC_POLICIES
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.path = Path(path)
+        self.stream_format = stream_format
+        self.fsync = fsync
+        self.samples_written = 0
+        
+        if stream_format == 'csv':
+            self.file = open(self.path, 'w', newline='')
+            self.csv_writer = csv.writer(self.file)
+            self.csv_writer.writerow(list(SENSOR_DTYPES))
+        elif stream_format == 'rec':
+            self.file = open(self.path, 'wb')
+            descr = [[name, RECORD_DTYPE[name].str] for name in RECORD_DTYPE.names]
+            self.file.write(RECORD_STREAM_MAGIC + json.dumps(descr).encode('ascii') + b'\n')
+        else:
+            raise ValueError(f"stream_format must be 'rec' or 'csv', got {stream_format!r}")
+        self._sync(self.fsync == 'batch')
+    
+    def _sync(self, to_disk: bool):
+        self.file.flush()
+        if to_disk:
+            os.fsync(self.file.fileno())
+    
+    def append(self, readings: List[HardwareSensors]):
+        """Append a batch of readings and flush it (fsync under the 'batch' policy)"""
+        if not readings:
+            return
+        columns = readings_to_columns(readings)
+        if self.stream_format == 'csv':
+            self.csv_writer.writerows(csv_rows(columns))
+        else:
+            self.file.write(columns_to_records(columns).tobytes())
+        self._sync(self.fsync == 'batch')
+        self.samples_written += len(readings)
+    
+    def close(self):
+        """Flush and close the log (fsync unless the policy is 'none')"""
+        if self.file.closed:
+            return
+        self._sync(self.fsync != 'none')
+        self.file.close()
+
+
+class SensorRingBuffer:
+    """
+    Preallocated NumPy ring buffer of recent readings with whole-run running aggregates
+    Holds the last `capacity` samples (one float64 column per HardwareSensors field) and
+    updates count, Welford mean/variance, min/max and the energy integral per sample, so
+    statistics cost the same after one minute or ten hours of logging
+    """
+    
+    def __init__(self, capacity: int = 3600):
+        """
+        Args:
+            capacity: Number of most recent samples kept (default 3600 = 30 min at 2 Hz)
+        """
+        self.capacity = max(1, capacity)
+        self.names = list(SENSOR_DTYPES)
+        self._getter = attrgetter(*self.names)
+        self._power_index = self.names.index('power_consumption')
+        self.lock = threading.Lock()
+        
+        self.data = np.empty((self.capacity, len(self.names)), dtype=np.float64)
+        self.size = 0
+        self.next_index = 0
+        self.total = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        
+        # Per-field aggregates over every sample (NaN readings are skipped)
+        self.count = np.zeros(len(self.names), dtype=np.int64)
+        self.mean = np.zeros(len(self.names))
+        self.m2 = np.zeros(len(self.names))
+        self.min = np.full(len(self.names), np.nan)
+        self.max = np.full(len(self.names), np.nan)
+        # E = ∫P dt, left Riemann sum over actual timestamps
+        self.energy_joules = 0.0
+        self._last_power = np.nan
+    
+    def append(self, reading: HardwareSensors):
+        """Store one reading and update the running aggregates (O(number of fields))"""
+        row = np.array(self._getter(reading), dtype=np.float64)
+        valid = ~np.isnan(row)
+        timestamp = float(row[0])
+        with self.lock:
+            self.data[self.next_index] = row
+            self.next_index = (self.next_index + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            self.total += 1
+            
+            # Welford update, only where this reading has a value
+            self.count += valid
+            delta = np.where(valid, row - self.mean, 0.0)
+            self.mean += delta / np.maximum(self.count, 1)
+            self.m2 += np.where(valid, delta * (row - self.mean), 0.0)
+            self.min = np.fmin(self.min, row)
+            self.max = np.fmax(self.max, row)
+            
+            if self.last_timestamp is not None and not np.isnan(self._last_power):
+                self.energy_joules += self._last_power * (timestamp - self.last_timestamp)
+            self._last_power = float(row[self._power_index])
+            if self.first_timestamp is None:
+                self.first_timestamp = timestamp
+            self.last_timestamp = timestamp
+    
+    def _field_stats(self, index: int) -> Dict[str, Optional[float]]:
+        """Aggregates of one field; the caller holds the lock"""
+        count = int(self.count[index])
+        if not count:
+            return {'count': 0, 'mean': None, 'std': None, 'min': None, 'max': None}
+        return {
+            'count': count,
+            'mean': float(self.mean[index]),
+            'std': float(np.sqrt(self.m2[index] / count)),
+            'min': float(self.min[index]),
+            'max': float(self.max[index]),
+        }
+    
+    def field_stats(self, name: str) -> Dict[str, Optional[float]]:
+        """Whole-run count, mean, std (population), min and max of one field"""
+        index = self.names.index(name)
+        with self.lock:
+            return self._field_stats(index)
+    
+    def snapshot(self, names: Optional[List[str]] = None) -> Dict[str, object]:
+        """
+        Consistent view of the run aggregates, taken under one lock acquisition
+        
+        Args:
+            names: Fields to include in 'fields' (default: all)
+        
+        Returns:
+            Dictionary with total, first_timestamp, last_timestamp, energy_joules and
+            fields (field name -> field_stats dictionary)
+        """
+        indices = [self.names.index(name) for name in (names or self.names)]
+        with self.lock:
+            return {
+                'total': self.total,
+                'first_timestamp': self.first_timestamp,
+                'last_timestamp': self.last_timestamp,
+                'energy_joules': self.energy_joules,
+                'fields': {self.names[index]: self._field_stats(index) for index in indices},
+            }
+    
+    def window(self, num_samples: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Most recent samples in time order
+        
+        Args:
+            num_samples: How many (default: everything still in the buffer)
+        
+        Returns:
+            Dictionary of field name -> array (copies)
+        """
+        with self.lock:
+            size = self.size if num_samples is None else max(0, min(num_samples, self.size))
+            block = self.data[(self.next_index - size + np.arange(size)) % self.capacity]
+        return {name: block[:, j].astype(SENSOR_DTYPES[name]) for j, name in enumerate(self.names)}
+
+
 class HardwareMonitor:
     """
     Real-time hardware monitoring system
@@ -343,7 +691,8 @@ class HardwareMonitor:
         power, power_limit = self.get_power_metrics()
         
         # Get iCUE data if available
-        icue_data = self.get_icue_data() if self.use_icue else {'available': False}
+        # get_icue_data returns None when iCUE is not installed
+        icue_data = (self.get_icue_data() if self.use_icue else None) or {'available': False}
         icue_liquid_temp = None
         icue_pump_speed = None
         icue_fan_speed = None
@@ -381,39 +730,73 @@ class SensorDataLogger:
     Supports continuous background logging via threading
     """
     
-    def __init__(self, output_dir: str = "sensor_logs", interval: float = 0.5):
+    def __init__(self, output_dir: str = "sensor_logs", interval: float = 0.5,
+                 log_format: str = "npz", export_csv: bool = False,
+                 flush_samples: int = 20, flush_seconds: float = 10.0, fsync: str = "batch",
+                 buffer_size: int = 3600):
         """
         Initialize sensor logger
         
         Args:
             output_dir: Directory to save logs
             interval: Sampling interval in seconds (default: 0.5s = 2Hz)
+            log_format: 'npz' (compressed columnar arrays, default) or 'csv'
+            export_csv: With 'npz', also write a CSV copy next to the log
+            flush_samples: Append buffered readings to disk after this many samples
+            flush_seconds: ... or after this many seconds, whichever comes first
+            fsync: One of FSYNC_POLICIES ('none', 'batch', 'close')
+            buffer_size: Recent samples kept in memory (statistics still cover the whole run)
         """
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"log_format must be one of {LOG_FORMATS}, got {log_format!r}")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.interval = interval
+        self.log_format = log_format
+        self.export_csv = export_csv
+        self.flush_samples = max(1, flush_samples)
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.writer: Optional[SensorLogWriter] = None
+        self.buffer_size = buffer_size
+        self.buffer = SensorRingBuffer(buffer_size)
         
         self.monitor = HardwareMonitor()
-        self.data_queue = queue.Queue()
         self.is_logging = False
         self.log_thread = None
-        self.readings: List[HardwareSensors] = []
+    
+    @property
+    def readings(self) -> List[HardwareSensors]:
+        """Readings still held in the ring buffer (the last `buffer_size` samples)"""
+        return columns_to_readings(self.buffer.window())
     
     def start_logging(self, experiment_name: str = "experiment") -> str:
         """
         Start background logging thread
         
+        Readings are appended to self.stream_file in batches while logging: the CSV
+        log itself, or for 'npz' a .rec record stream converted on stop_logging.
+        Either can be read with load_sensor_columns at any time.
+        
         Args:
             experiment_name: Name for this logging session
         
         Returns:
-            Path to log file being written
+            Path to the final log file
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = self.output_dir / f"{experiment_name}_{timestamp}_sensors.csv"
+        self.log_file = self.output_dir / f"{experiment_name}_{timestamp}_sensors.{self.log_format}"
+        if self.log_format == 'csv':
+            self.stream_file = self.log_file
+            self.writer = SensorLogWriter(self.stream_file, 'csv', self.fsync)
+        else:
+            self.stream_file = self.log_file.with_suffix(RECORD_STREAM_SUFFIX)
+            self.writer = SensorLogWriter(self.stream_file, 'rec', self.fsync)
         
         self.is_logging = True
-        self.readings = []
+        self.buffer = SensorRingBuffer(self.buffer_size)
         
         # Start background thread
         self.log_thread = threading.Thread(target=self._logging_loop, daemon=True)
@@ -423,113 +806,119 @@ class SensorDataLogger:
         return str(self.log_file)
     
     def _logging_loop(self):
-        """Background thread that continuously reads sensors"""
-        while self.is_logging:
+        """Background thread that continuously reads sensors and appends them to disk in batches"""
+        batch = []
+        last_flush = time.monotonic()
+        try:
+            while self.is_logging:
+                try:
+                    sensors = self.monitor.read_sensors()
+                    self.buffer.append(sensors)
+                    batch.append(sensors)
+                    if (len(batch) >= self.flush_samples
+                            or time.monotonic() - last_flush >= self.flush_seconds):
+                        self.writer.append(batch)
+                        batch = []
+                        last_flush = time.monotonic()
+                    time.sleep(self.interval)
+                except Exception as e:
+                    logger.error(f"Logging error: {e}")
+                    time.sleep(self.interval)
+        finally:
             try:
-                sensors = self.monitor.read_sensors()
-                self.readings.append(sensors)
-                self.data_queue.put(sensors)
-                time.sleep(self.interval)
+                self.writer.append(batch)
             except Exception as e:
-                logger.error(f"Logging error: {e}")
-                time.sleep(self.interval)
+                logger.error(f"Final log flush error: {e}")
+            self.writer.close()
     
     def stop_logging(self) -> Path:
         """
-        Stop logging and save data to CSV
+        Stop logging and save data in the configured log format
         
         Returns:
-            Path to saved log file
+            Path to saved log file (the stream file if the logging thread did not finish)
         """
         self.is_logging = False
         
         if self.log_thread:
-            self.log_thread.join(timeout=5)
+            # The thread writes the last batch before it exits
+            timeout = self.interval + 5
+            self.log_thread.join(timeout=timeout)
+            if self.log_thread.is_alive():
+                # Still reading or syncing: converting now would drop its final batch
+                logger.warning(f"Logging thread still running after {timeout:.1f}s; "
+                               f"log not finalized, stream kept at {self.stream_file}")
+                return self.stream_file
         
-        # Save to CSV
-        self._save_to_csv()
+        self._finalize_log()
         logger.info(f"Logging stopped. Data saved: {self.log_file}")
         
         return self.log_file
     
-    def _save_to_csv(self):
-        """Save collected data to CSV file"""
-        if not self.readings:
+    def _finalize_log(self):
+        """Turn the streamed log into the final log (.npz plus optional CSV copy, or the CSV itself)"""
+        if not self.writer.samples_written:
             logger.warning("No readings to save")
+            self.stream_file.unlink(missing_ok=True)
             return
         
         try:
-            with open(self.log_file, 'w', newline='') as f:
-                fieldnames = self.readings[0].to_dict().keys()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for reading in self.readings:
-                    writer.writerow(reading.to_dict())
+            if self.log_format == 'npz':
+                columns = load_sensor_columns(self.stream_file)
+                save_columns_npz(self.log_file, columns)
+                if self.export_csv:
+                    write_columns_csv(self.log_file.with_suffix('.csv'), columns)
+                self.stream_file.unlink()
             
-            logger.info(f"Saved {len(self.readings)} readings to {self.log_file}")
+            logger.info(f"Saved {self.writer.samples_written} readings to {self.log_file}")
         except Exception as e:
-            logger.error(f"CSV save error: {e}")
+            # The streamed log is kept and can still be loaded or exported
+            logger.error(f"Log save error: {e} (stream kept at {self.stream_file})")
     
     def get_statistics(self) -> Dict:
         """
-        Compute statistics from logged data
+        Statistics of the whole run from running aggregates
+        
+        Constant time and safe to call while logging (e.g. from a live dashboard).
         
         Returns:
             Dictionary of statistics
         """
-        if not self.readings:
+        stat_fields = (('cpu_temp', 'cpu_temp'), ('cpu_load', 'cpu_load'),
+                  ('ram_usage', 'ram_usage'), ('power', 'power_consumption'))
+        # One snapshot, so a concurrent append cannot be seen half-applied
+        snapshot = self.buffer.snapshot([name for _, name in stat_fields])
+        if not snapshot['total']:
             return {}
         
         stats = {
-            'num_samples': len(self.readings),
-            'duration_seconds': self.readings[-1].timestamp - self.readings[0].timestamp,
-            'cpu_temp_mean': None,
-            'cpu_temp_max': None,
-            'cpu_load_mean': None,
-            'cpu_load_max': None,
-            'ram_usage_mean': None,
-            'ram_usage_max': None,
-            'power_mean': None,
-            'power_max': None,
-            'energy_joules': None,
+            'num_samples': snapshot['total'],
+            'duration_seconds': snapshot['last_timestamp'] - snapshot['first_timestamp'],
         }
+        for prefix, name in stat_fields:
+            field_stats = snapshot['fields'][name]
+            stats[f'{prefix}_mean'] = field_stats['mean']
+            stats[f'{prefix}_max'] = field_stats['max']
+            stats[f'{prefix}_std'] = field_stats['std']
         
-        try:
-            # Temperature stats (°C)
-            temps = [r.cpu_temp for r in self.readings if r.cpu_temp is not None]
-            if temps:
-                stats['cpu_temp_mean'] = np.mean(temps)
-                stats['cpu_temp_max'] = np.max(temps)
-            
-            # CPU load stats (%)
-            loads = [r.cpu_load for r in self.readings if r.cpu_load is not None]
-            if loads:
-                stats['cpu_load_mean'] = np.mean(loads)
-                stats['cpu_load_max'] = np.max(loads)
-            
-            # RAM stats (MB)
-            ram_usages = [r.ram_usage for r in self.readings if r.ram_usage > 0]
-            if ram_usages:
-                stats['ram_usage_mean'] = np.mean(ram_usages)
-                stats['ram_usage_max'] = np.max(ram_usages)
-            
-            # Power stats (Watts)
-            powers = [r.power_consumption for r in self.readings if r.power_consumption is not None]
-            if powers:
-                stats['power_mean'] = np.mean(powers)
-                stats['power_max'] = np.max(powers)
-                
-                # Energy integral (Wh)
-                # E = ∫P dt ≈ Σ(P_i * Δt)
-                power_joules = sum(powers[i] * self.interval for i in range(len(powers)))
-                stats['energy_joules'] = power_joules
-                stats['energy_wh'] = power_joules / 3600  # Convert to Wh
-        
-        except Exception as e:
-            logger.error(f"Statistics error: {e}")
+        stats['energy_joules'] = None
+        if stats['power_mean'] is not None:
+            stats['energy_joules'] = snapshot['energy_joules']
+            stats['energy_wh'] = snapshot['energy_joules'] / 3600  # Convert to Wh
         
         return stats
+    
+    def get_recent(self, num_samples: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Most recent readings as columns, for live plots
+        
+        Args:
+            num_samples: How many (default: the whole ring buffer)
+        
+        Returns:
+            Dictionary of field name -> array in time order
+        """
+        return self.buffer.window(num_samples)
 
 
 class SustainabilityAnalyzer:
@@ -549,50 +938,12 @@ class SustainabilityAnalyzer:
         self.sensor_logs_dir.mkdir(exist_ok=True)
     
     def load_log(self, log_file: Path) -> List[HardwareSensors]:
-        """Load sensor data from CSV file"""
-        readings = []
+        """Load sensor data from a .npz or CSV log file"""
         try:
-            import pandas as pd
-            df = pd.read_csv(log_file)
-            
-            for _, row in df.iterrows():
-                reading = HardwareSensors(
-                    timestamp=row['timestamp'],
-                    cpu_temp=row['cpu_temp'] if pd.notna(row['cpu_temp']) else None,
-                    cpu_frequency=row['cpu_frequency'] if pd.notna(row['cpu_frequency']) else None,
-                    cpu_load=row['cpu_load'],
-                    ram_usage=row['ram_usage'],
-                    ram_percent=row['ram_percent'],
-                    power_consumption=row['power_consumption'] if pd.notna(row['power_consumption']) else None,
-                    power_limit=row['power_limit'] if pd.notna(row['power_limit']) else None,
-                )
-                readings.append(reading)
-        
-        except ImportError:
-            logger.warning("pandas not available, using manual CSV parsing")
-            readings = self._load_csv_manual(log_file)
-        
-        return readings
-    
-    def _load_csv_manual(self, log_file: Path) -> List[HardwareSensors]:
-        """Manual CSV parsing without pandas"""
-        readings = []
-        try:
-            with open(log_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    reading = HardwareSensors(
-                        timestamp=float(row['timestamp']),
-                        cpu_temp=float(row['cpu_temp']) if row['cpu_temp'] and row['cpu_temp'] != 'None' else None,
-                        cpu_load=float(row['cpu_load']),
-                        ram_usage=float(row['ram_usage']),
-                        ram_percent=float(row['ram_percent']),
-                    )
-                    readings.append(reading)
+            return columns_to_readings(load_sensor_columns(log_file))
         except Exception as e:
-            logger.error(f"CSV parsing error: {e}")
-        
-        return readings
+            logger.error(f"Log loading error ({log_file}): {e}")
+            return []
     
     def compute_energy_scaling(self, logs: List[Path], complexities: List[float]) -> Dict:
         """
@@ -728,14 +1079,15 @@ if __name__ == "__main__":
     print(f"\n[SAVE] Data saved to: {log_file_final}")
     
     # Analyze results
-    stats = logger_instance.monitor._compute_stats(logger_instance.readings) if hasattr(logger_instance.monitor, '_compute_stats') else {}
+    stats = logger_instance.get_statistics()
+    fmt = lambda value, unit: f"{value:.1f}{unit}" if value is not None else "N/A"
     
     print("\n" + "=" * 70)
     print("SENSOR STATISTICS")
     print("=" * 70)
-    print(f"Total Samples:     {len(logger_instance.readings)}")
-    print(f"Duration:          {logger_instance.readings[-1].timestamp - logger_instance.readings[0].timestamp:.1f} seconds")
-    print(f"Avg CPU Temp:      {np.mean([r.cpu_temp for r in logger_instance.readings if r.cpu_temp]) if any(r.cpu_temp for r in logger_instance.readings) else 'N/A':.1f}°C")
-    print(f"Avg CPU Load:      {np.mean([r.cpu_load for r in logger_instance.readings]):.1f}%")
-    print(f"Avg Power:         {np.mean([r.power_consumption for r in logger_instance.readings if r.power_consumption]):.1f}W")
+    print(f"Total Samples:     {stats.get('num_samples', 0)}")
+    print(f"Duration:          {stats.get('duration_seconds', 0.0):.1f} seconds")
+    print(f"Avg CPU Temp:      {fmt(stats.get('cpu_temp_mean'), '°C')}")
+    print(f"Avg CPU Load:      {fmt(stats.get('cpu_load_mean'), '%')}")
+    print(f"Avg Power:         {fmt(stats.get('power_mean'), 'W')}")
     print("=" * 70)